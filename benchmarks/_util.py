@@ -0,0 +1,55 @@
+import asyncio
+import resource
+import socket
+import sys
+import time
+
+# ============================================
+# SHARED BENCHMARK HELPERS
+# ============================================
+# Kept free of heavy imports: subprocess benchmarks import this before
+# measuring their own peak RSS.
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of samples (pct 0-100)"""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB"""
+    # ru_maxrss survives exec on Linux, so a child would report the parent's
+    # peak (e.g. after a SQLite import); VmHWM starts afresh with the new image
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_for_server(http, base_url, timeout=30):
+    """Poll base_url/ with an aiohttp session until it answers 200"""
+    import aiohttp
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with http.get(f"{base_url}/") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError("backend did not start")
+        await asyncio.sleep(0.2)
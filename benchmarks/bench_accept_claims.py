@@ -0,0 +1,131 @@
+"""
+Concurrent accept stress test: exactly one winner per transfer.
+
+Fires thousands of simultaneous accepts at the same transfers and checks
+that each transfer is claimed by exactly one agent:
+
+    asgi      --contenders concurrent POST /api/accept-transfer per transfer,
+              in-process over ASGI (no network), all transfers at once
+    threads   TransferStore.accept called from a thread pool, the way a sync
+              endpoint or worker thread would reach it
+    unlocked  the previous check-then-set accept under the same thread load,
+              for comparison (it is expected to hand out duplicate claims)
+
+Accept throughput is reported for each.
+
+Usage:
+    python -m benchmarks.bench_accept_claims [--transfers 500] [--contenders 20] [--threads 16]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Token minting needs credentials; nothing is sent to LiveKit
+os.environ.setdefault("LIVEKIT_API_KEY", "benchmark")
+os.environ.setdefault("LIVEKIT_API_SECRET", "benchmark-secret-benchmark-secret")
+
+
+def _unlocked_accept(store, transfer_id, agent_name):
+    """The previous accept: status check and update with nothing making them atomic"""
+    transfer = store.get(transfer_id)
+    if transfer is None:
+        return None, "Transfer not found"
+    if transfer["status"] != "pending":
+        return transfer, "Transfer already handled"
+    time.sleep(0)  # any suspension point between check and set
+    transfer["status"] = "accepted"
+    transfer["agent_name"] = agent_name
+    transfer["accepted_at"] = datetime.now().isoformat()
+    return transfer, None
+
+
+def _report(name, wins, transfers, attempts, elapsed):
+    duplicates = sum(1 for count in wins.values() if count > 1)
+    unclaimed = sum(1 for transfer_id in transfers if wins.get(transfer_id, 0) == 0)
+    print(f"{name:>9} {attempts:>9} {attempts / elapsed:>12,.0f} {duplicates:>11} {unclaimed:>10}", flush=True)
+    return duplicates == 0 and unclaimed == 0
+
+
+async def _asgi(backend, transfers, contenders):
+    import httpx
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def accept(transfer_id, agent):
+            response = await client.post("/api/accept-transfer",
+                                         json={"transfer_id": transfer_id, "agent_name": f"agent-{agent}"})
+            return transfer_id, response.json()
+
+        requests = [accept(t, a) for t in transfers for a in range(contenders)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*requests)
+        elapsed = time.perf_counter() - start
+
+    wins = {}
+    for transfer_id, result in results:
+        if result.get("success"):
+            wins[transfer_id] = wins.get(transfer_id, 0) + 1
+        else:
+            assert result["error"] == "Transfer already handled", result
+    return wins, len(results), elapsed
+
+
+def _threaded(accept, store, transfers, contenders, threads):
+    wins = {}
+    # Contenders for one transfer are adjacent so different threads race for it
+    jobs = [(t, f"agent-{a}") for t in transfers for a in range(contenders)]
+
+    def run(job):
+        transfer, error = accept(store, *job)
+        return job[0], error is None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(run, jobs))
+    elapsed = time.perf_counter() - start
+    for transfer_id, won in results:
+        if won:
+            wins[transfer_id] = wins.get(transfer_id, 0) + 1
+    return wins, len(results), elapsed
+
+
+def main(transfer_count, contenders, threads):
+    from src.utils.logger import logger
+    from src.api import app as backend
+    from src.api.transfer_store import TransferStore
+    logger.disabled = True
+    # Small switch interval so threads interleave as much as they would under real load
+    sys.setswitchinterval(1e-6)
+
+    print(f"{transfer_count} transfers x {contenders} contenders, {threads} threads\n")
+    print(f"{'':>9} {'accepts':>9} {'accepts/s':>12} {'duplicates':>11} {'unclaimed':>10}")
+
+    ok = True
+    transfers = [backend.transfers.create(f"room-{i}", "stress")["id"] for i in range(transfer_count)]
+    wins, attempts, elapsed = asyncio.run(_asgi(backend, transfers, contenders))
+    ok &= _report("asgi", wins, transfers, attempts, elapsed)
+
+    store = TransferStore()
+    transfers = [store.create(f"room-{i}", "stress")["id"] for i in range(transfer_count)]
+    wins, attempts, elapsed = _threaded(type(store).accept, store, transfers, contenders, threads)
+    ok &= _report("threads", wins, transfers, attempts, elapsed)
+
+    store = TransferStore()
+    transfers = [store.create(f"room-{i}", "stress")["id"] for i in range(transfer_count)]
+    wins, attempts, elapsed = _threaded(_unlocked_accept, store, transfers, contenders, threads)
+    _report("unlocked", wins, transfers, attempts, elapsed)
+
+    assert ok, "a transfer was claimed more than once or not at all"
+    print("\nOK: every transfer had exactly one winner (asgi, threads)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transfers", type=int, default=500, help="Transfers to claim")
+    parser.add_argument("--contenders", type=int, default=20, help="Simultaneous accepts per transfer")
+    parser.add_argument("--threads", type=int, default=16, help="Threads for the thread-pool runs")
+    args = parser.parse_args()
+    main(args.transfers, args.contenders, args.threads)
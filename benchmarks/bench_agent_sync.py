@@ -0,0 +1,126 @@
+"""
+Dashboard reconnect cost: sequence resume versus re-downloading the list.
+
+Starts the backend with uvicorn in a subprocess, fills it with --pending
+waiting transfers, connects --agents dashboards that remember the last
+transfer sequence they saw, disconnects them all, makes --missed transfer
+changes, and reconnects every dashboard at once in three ways:
+
+    resume     /ws/agent?since=<last seq>: only the transfers that changed
+    behind     a sequence older than the change log: pending snapshot
+    refetch    the previous dashboard: /ws/agent plus GET /api/transfers
+
+Reported per mode: bytes each dashboard downloads to be back in sync, and
+the time for all of them to get there.
+
+Usage:
+    python -m benchmarks.bench_agent_sync [--agents 200] [--pending 500] [--missed 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import aiohttp
+from websockets.asyncio.client import connect
+
+from benchmarks._util import free_port, wait_for_server
+
+
+async def _sync_bytes(ws_url, since=None):
+    """Connect and return the bytes received up to and including the sync message, and its seq"""
+    url = ws_url if since is None else f"{ws_url}?since={since}"
+    received = 0
+    async with connect(url, max_size=None, open_timeout=60) as ws:
+        while True:
+            message = await ws.recv()
+            received += len(message)
+            event = json.loads(message)
+            if event["type"] == "sync":
+                return received, event["seq"]
+
+
+async def _resume_bytes(ws_url, since):
+    received, _ = await _sync_bytes(ws_url, since)
+    return received
+
+
+async def _refetch_bytes(ws_url, base_url, http):
+    """The previous reconnect: socket plus a full GET of pending transfers"""
+    received = 0
+    async with connect(ws_url, max_size=None, open_timeout=60) as ws:
+        received += len(await ws.recv())  # "connected"
+        async with http.get(f"{base_url}/api/transfers") as response:
+            received += len(await response.read())
+    return received
+
+
+async def _change(http, base_url, i):
+    async with http.post(f"{base_url}/api/create-transfer", params={"room_name": f"missed-{i}"}) as response:
+        transfer_id = (await response.json())["transfer"]["id"]
+    async with http.post(f"{base_url}/api/accept-transfer",
+                         json={"transfer_id": transfer_id, "agent_name": "bench"}):
+        pass
+
+
+async def run(agents, pending, missed, log_size):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}/ws/agent"
+    env = dict(os.environ, AGENT_SYNC_LOG_SIZE=str(log_size), DISPATCH_MODE="broadcast",
+               LIVEKIT_API_KEY=os.environ.get("LIVEKIT_API_KEY", "benchmark"),
+               LIVEKIT_API_SECRET=os.environ.get("LIVEKIT_API_SECRET", "benchmark-secret-benchmark-secret"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.app:app", "--port", str(port), "--log-level", "error"],
+        env=env, stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as http:
+            await wait_for_server(http, base_url)
+            for i in range(pending):
+                async with http.post(f"{base_url}/api/create-transfer",
+                                     params={"room_name": f"waiting-{i}", "reason": "Waiting for an agent"}):
+                    pass
+
+            print(f"{agents} dashboards, {pending} pending transfers, {missed} changes missed while away\n")
+            print(f"{'':>9} {'bytes / dashboard':>18} {'all in sync (ms)':>17}")
+
+            async def reconnect_all(name, connect_one):
+                start = time.perf_counter()
+                sizes = await asyncio.gather(*(connect_one() for _ in range(agents)))
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"{name:>9} {sum(sizes) / agents:>18,.0f} {elapsed:>17.0f}", flush=True)
+
+            # Dashboards see the current state, then drop off while changes happen
+            _, seq = await _sync_bytes(ws_url)
+            for i in range(missed):
+                await _change(http, base_url, i)
+
+            await reconnect_all("resume", lambda: _resume_bytes(ws_url, seq))
+
+            # Push the last-seen sequence out of the change log
+            for i in range(log_size):
+                await _change(http, base_url, missed + i)
+            await reconnect_all("behind", lambda: _resume_bytes(ws_url, seq))
+
+            await reconnect_all("refetch", lambda: _refetch_bytes(ws_url, base_url, http))
+
+            async with http.get(f"{base_url}/") as response:
+                root = await response.json()
+            print(f"\nserver syncs: {root['transfers']['syncs']}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=200, help="Reconnecting dashboards")
+    parser.add_argument("--pending", type=int, default=500, help="Transfers waiting for an agent")
+    parser.add_argument("--missed", type=int, default=20, help="Transfers created and accepted while away")
+    parser.add_argument("--log-size", type=int, default=200, help="AGENT_SYNC_LOG_SIZE for the run")
+    args = parser.parse_args()
+    asyncio.run(run(args.agents, args.pending, args.missed, args.log_size))
@@ -0,0 +1,148 @@
+"""
+Backend throughput with one versus several uvicorn workers.
+
+For each configuration, starts uvicorn in a subprocess (fresh SQLite
+database for the shared store), connects --dashboards agent dashboards to
+/ws/agent (spread over the workers by the kernel), then runs --clients
+concurrent loops of create -> accept -> end transfer for --seconds and
+reports:
+
+    transfers/s   completed create/accept/end cycles per second
+    req/s         HTTP requests per second (three per cycle)
+    p99 (ms)      99th percentile request latency
+    fan-out       whether every dashboard received every transfer change,
+                  in sequence, whichever worker made it
+
+Throughput should scale with workers up to the number of cores (this
+machine: reported at the top); on a single core extra workers only add
+contention.
+
+Usage:
+    python -m benchmarks.bench_backend_workers [--configs memory:1,sqlite:1,sqlite:2,sqlite:4] [--seconds 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+from websockets.asyncio.client import connect
+
+from benchmarks._util import free_port, percentile, wait_for_server
+
+
+async def _dashboard(ws_url, seqs, ready):
+    async with connect(ws_url, max_size=None, open_timeout=60) as ws:
+        ready.release()
+        async for message in ws:
+            event = json.loads(message)
+            if event["type"] == "sync":
+                seqs.append(event["seq"])
+            elif event["type"] == "transfer_update":
+                seqs.append(event["seq"])
+
+
+async def _client(http, base_url, deadline, latencies, counter, name):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        async with http.post(f"{base_url}/api/create-transfer", params={"room_name": name}) as response:
+            transfer_id = (await response.json())["transfer"]["id"]
+        latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        async with http.post(f"{base_url}/api/accept-transfer",
+                             json={"transfer_id": transfer_id, "agent_name": name}) as response:
+            assert (await response.json()).get("success"), "accept failed"
+        latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        async with http.post(f"{base_url}/api/end-transfer/{transfer_id}") as response:
+            await response.read()
+        latencies.append(time.perf_counter() - start)
+        counter[0] += 1
+
+
+async def run_config(store, workers, args):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}/ws/agent"
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, TRANSFER_STORE=store, TRANSFER_STORE_DB=os.path.join(tmp, "transfers.db"),
+                   DISPATCH_MODE="broadcast", AGENT_SYNC_LOG_SIZE="100000",
+                   # The dashboards share this process's CPU with the load; don't drop them as slow
+                   AGENT_WS_QUEUE_SIZE="1000000", AGENT_WS_SEND_TIMEOUT="60",
+                   LIVEKIT_API_KEY=os.environ.get("LIVEKIT_API_KEY", "benchmark"),
+                   LIVEKIT_API_SECRET=os.environ.get("LIVEKIT_API_SECRET", "benchmark-secret-benchmark-secret"))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.api.app:app", "--port", str(port),
+             "--workers", str(workers), "--log-level", "error"],
+            env=env, stderr=subprocess.DEVNULL,
+        )
+        try:
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as http:
+                await wait_for_server(http, base_url)
+                # Let every worker finish starting before connecting dashboards
+                await asyncio.sleep(1 + workers * 0.5)
+
+                ready = asyncio.Semaphore(0)
+                dashboards = [[] for _ in range(args.dashboards)]
+                tasks = [asyncio.create_task(_dashboard(ws_url, seqs, ready)) for seqs in dashboards]
+                for _ in dashboards:
+                    await ready.acquire()
+
+                latencies = []
+                counter = [0]
+                start = time.perf_counter()
+                deadline = time.monotonic() + args.seconds
+                await asyncio.gather(*(
+                    _client(http, base_url, deadline, latencies, counter, f"bench-{i}") for i in range(args.clients)
+                ))
+                elapsed = time.perf_counter() - start
+
+                # Let the last changes reach every worker's dashboards
+                expected = counter[0] * 3
+                settle = time.monotonic() + 10
+                while time.monotonic() < settle and any(len(seqs) < expected + 1 for seqs in dashboards):
+                    await asyncio.sleep(0.1)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            server.terminate()
+            server.wait()
+
+    in_order = all(
+        len(seqs) == expected + 1 and all(b == a + 1 for a, b in zip(seqs, seqs[1:]))
+        for seqs in dashboards
+    )
+    return {
+        "transfers_per_s": counter[0] / elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else 0.0,
+        "fanout": "complete" if in_order else "MISSING/OUT OF ORDER",
+    }
+
+
+async def run(args):
+    print(f"{os.cpu_count()} CPU core(s); {args.clients} clients, {args.dashboards} dashboards, "
+          f"{args.seconds}s per configuration\n")
+    print(f"{'store':>7} {'workers':>8} {'transfers/s':>12} {'req/s':>8} {'p99 (ms)':>9}   fan-out")
+    for config in args.configs.split(","):
+        store, workers = config.split(":")
+        result = await run_config(store, int(workers), args)
+        print(f"{store:>7} {workers:>8} {result['transfers_per_s']:>12.0f} {result['requests_per_s']:>8.0f} "
+              f"{result['p99_ms']:>9.1f}   {result['fanout']}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", default="memory:1,sqlite:1,sqlite:2,sqlite:4",
+                        help="Comma-separated store:workers pairs")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent request loops")
+    parser.add_argument("--dashboards", type=int, default=20, help="Connected agent dashboards")
+    parser.add_argument("--seconds", type=float, default=10, help="Load duration per configuration")
+    asyncio.run(run(parser.parse_args()))
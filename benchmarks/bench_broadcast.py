@@ -0,0 +1,137 @@
+"""
+Dashboard broadcast benchmark with 1,000 local WebSocket clients.
+
+Starts the backend with uvicorn in a subprocess, connects --clients agent
+dashboards to /ws/agent (plus --stalled dashboards that stop reading after
+connecting, with a tiny socket receive buffer), then creates --events
+transfers and times how long each new-transfer update takes to
+reach the healthy dashboards:
+
+    delivery    POST /api/create-transfer -> one dashboard received it
+    fan-out     POST /api/create-transfer -> the last healthy dashboard received it
+
+Stalled dashboards should be disconnected once their outbound queue fills,
+without slowing anyone else down; the server's own broadcast counters (from
+GET /) are printed at the end.
+
+Usage:
+    python -m benchmarks.bench_broadcast [--clients 1000] [--stalled 5] [--events 200] [--payload 8000]
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+from websockets.asyncio.client import connect
+
+from benchmarks._util import free_port, percentile, wait_for_server
+
+
+async def _healthy_client(url, arrivals, ready):
+    async with connect(url, max_size=None, open_timeout=60) as ws:
+        await ws.recv()  # "connected"
+        ready.release()
+        async for message in ws:
+            event = json.loads(message)
+            if event.get("type") == "transfer_update" and event["transfer"]["status"] == "pending":
+                arrivals.setdefault(event["transfer"]["id"], []).append(time.perf_counter())
+
+
+async def _stalled_client(url, port, ready):
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+    # max_queue=1: after one unread message the client stops reading the socket
+    ws = await connect(url, sock=sock, max_queue=1, open_timeout=60)
+    ready.release()
+    return ws
+
+
+async def run(clients, stalled, events, payload, interval):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}/ws/agent"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.app:app", "--port", str(port), "--log-level", "error"],
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with aiohttp.ClientSession() as http:
+            await wait_for_server(http, base_url)
+
+            arrivals = {}
+            ready = asyncio.Semaphore(0)
+            tasks = []
+            for i in range(clients):
+                tasks.append(asyncio.create_task(_healthy_client(ws_url, arrivals, ready)))
+                if i % 100 == 99:
+                    await asyncio.sleep(0.05)
+            for _ in range(clients):
+                await ready.acquire()
+            stalled_sockets = [await _stalled_client(ws_url, port, ready) for _ in range(stalled)]
+            for _ in range(stalled):
+                await ready.acquire()
+            print(f"{clients} dashboards connected ({stalled} more stalled), sending {events} events "
+                  f"with ~{payload} byte payloads\n")
+
+            sent = {}
+            reason = "x" * payload
+            for i in range(events):
+                start = time.perf_counter()
+                async with http.post(f"{base_url}/api/create-transfer",
+                                     params={"room_name": f"bench-{i}", "reason": reason}) as response:
+                    transfer_id = (await response.json())["transfer"]["id"]
+                sent[transfer_id] = start
+                await asyncio.sleep(interval)
+
+            # Let the last notifications land
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline and any(len(arrivals.get(t, ())) < clients for t in sent):
+                await asyncio.sleep(0.1)
+
+            delivery = []
+            fanout = []
+            complete = 0
+            for transfer_id, start in sent.items():
+                received = arrivals.get(transfer_id, [])
+                delivery.extend((t - start) * 1000 for t in received)
+                if len(received) == clients:
+                    complete += 1
+                    fanout.append((max(received) - start) * 1000)
+
+            print(f"{'':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+            for name, samples in (("delivery", delivery), ("fan-out", fanout)):
+                if samples:
+                    print(f"{name:>10} {percentile(samples, 50):>9.1f} {percentile(samples, 99):>9.1f} "
+                          f"{max(samples):>9.1f}")
+            print(f"\n{complete}/{events} events reached all {clients} healthy dashboards")
+
+            async with http.get(f"{base_url}/") as response:
+                stats = (await response.json())["broadcast"]
+            print(f"server: {stats['connections']} connected, {stats['slow_disconnects']} slow dashboards "
+                  f"disconnected, {stats['failed_deliveries']} deliveries dropped")
+            print(f"server fan-out latency: {stats['fanout_latency']}")
+
+            for task in tasks:
+                task.cancel()
+            for ws in stalled_sockets:
+                ws.transport.abort()
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000, help="Healthy dashboards")
+    parser.add_argument("--stalled", type=int, default=5, help="Dashboards that stop reading")
+    parser.add_argument("--events", type=int, default=200, help="Transfers to create")
+    parser.add_argument("--payload", type=int, default=8000, help="Approximate event size in bytes")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between events")
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.stalled, args.events, args.payload, args.interval))
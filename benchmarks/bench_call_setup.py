@@ -0,0 +1,214 @@
+"""
+Call setup benchmark: first call vs warm call, with and without prewarm.
+
+Runs src.agents.entrypoint.entrypoint against stub LiveKit objects (job
+context, room, SIP participant and an AgentSession whose start() returns at
+once) in fresh interpreters, so only this repo's per-call work is timed:
+
+    setup           entrypoint start until session.start() is called
+    order ready     entrypoint start until the caller ID order prefetch has
+                    finished
+
+Each process handles two calls. Without prewarm the first call pays for
+building the realtime model, parsing instructions and loading orders; with
+prewarm (background steps included, as in a process that has been idle
+since it started) the first call should cost the same as the second. The
+p50 of each call setup trace stage (src.utils.tracing) over the process's
+calls is printed too; the stub session "speaks" as soon as it has started.
+
+The run fails (exit status 1) if, with prewarm, the first call's setup or
+order ready time exceeds the warm call's by more than --tolerance (a
+fraction) plus --slack-ms.
+
+Usage:
+    python -m benchmarks.bench_call_setup [--orders 100000] [--tolerance 0.5] [--slack-ms 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from livekit.agents import AgentStateChangedEvent
+
+from benchmarks.synthetic_orders import iter_orders, phone_for
+
+
+class _StubProcess:
+    def __init__(self):
+        self.userdata = {}
+
+
+class _StubParticipant:
+    def __init__(self, phone):
+        self.identity = f"sip_{phone}"
+        self.attributes = {"sip.phoneNumber": f"+91{phone}"}
+
+
+class _StubRoom:
+    def __init__(self, name):
+        self.name = name
+        self.creation_time = int(time.time())
+        self.creation_time_ms = int(time.time() * 1000)
+
+    def on(self, event):
+        return lambda callback: callback
+
+
+class _StubJob:
+    def __init__(self, room):
+        self.room = room
+
+
+class _StubJobContext:
+    def __init__(self, proc, room_name, phone):
+        self.proc = proc
+        self.room = _StubRoom(room_name)
+        self.job = _StubJob(self.room)
+        self._participant = _StubParticipant(phone)
+
+    async def connect(self):
+        pass
+
+    def add_shutdown_callback(self, callback):
+        pass
+
+    async def wait_for_participant(self, **kwargs):
+        return self._participant
+
+
+class _StubAgentSession:
+    """Stands in for AgentSession: records when start() is reached"""
+
+    started = None
+
+    def __init__(self, llm=None, userdata=None):
+        self.llm = llm
+        self.userdata = userdata
+        self._handlers = {}
+
+    def on(self, event):
+        def register(callback):
+            self._handlers[event] = callback
+            return callback
+        return register
+
+    async def start(self, room=None, agent=None, room_input_options=None):
+        _StubAgentSession.started = (time.perf_counter(), self.userdata)
+        speaking = AgentStateChangedEvent(old_state="listening", new_state="speaking")
+        asyncio.get_running_loop().call_soon(self._handlers["agent_state_changed"], speaking)
+
+    async def aclose(self):
+        pass
+
+
+async def _time_call(entrypoint, proc, call, phone):
+    _StubAgentSession.started = None
+    ctx = _StubJobContext(proc, f"bench-room-{call}", phone)
+    start = time.perf_counter()
+    task = asyncio.create_task(entrypoint(ctx))
+    while _StubAgentSession.started is None:
+        await asyncio.sleep(0.001)
+    started_at, state = _StubAgentSession.started
+    await state.order_prefetch
+    order_ready_at = time.perf_counter()
+    assert state.prefetched_order is not None, "caller order was not prefetched"
+
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return {
+        "setup_ms": (started_at - start) * 1000,
+        "order_ready_ms": (order_ready_at - start) * 1000,
+    }
+
+
+def child(mode, orders_path, phone):
+    os.environ["ORDERS_FILE"] = orders_path
+    os.environ["ORDERS_BACKEND"] = "json"
+    # The realtime model only needs a key to be constructed; nothing connects
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    os.environ["CONTROL_SOCKET_DIR"] = os.path.join(os.path.dirname(orders_path), "control")
+
+    from src.utils.logger import logger
+    logger.disabled = True
+    import src.agents.entrypoint as entrypoint_module
+    from src.agents.prewarm import prewarm, BACKGROUND_STEPS
+    entrypoint_module.AgentSession = _StubAgentSession
+
+    proc = _StubProcess()
+    result = {}
+    if mode == "prewarm":
+        start = time.perf_counter()
+        prewarm(proc)
+        result["prewarm_ms"] = (time.perf_counter() - start) * 1000
+        for name in BACKGROUND_STEPS:
+            proc.userdata[name].result()
+        result["prewarm_steps_ms"] = {name: s * 1000 for name, s in proc.userdata["prewarm_timings"].items()}
+
+    async def calls():
+        return [await _time_call(entrypoint_module.entrypoint, proc, call, phone) for call in (1, 2)]
+
+    result["calls"] = asyncio.run(calls())
+    from src.utils.tracing import get_trace_stats
+    result["stages"] = {stage: stats["p50_ms"] for stage, stats in get_trace_stats().items()}
+    print(json.dumps(result))
+
+
+def _first_call_ok(calls, tolerance, slack_ms):
+    """Whether the first call's timings are within tolerance of the warm call's"""
+    first, warm = calls
+    return all(first[key] <= warm[key] * (1 + tolerance) + slack_ms for key in ("setup_ms", "order_ready_ms"))
+
+
+def run(order_count, tolerance, slack_ms):
+    from src.agents.prewarm import BACKGROUND_STEPS
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        orders_path = Path(tmp) / "orders.json"
+        with open(orders_path, "w", encoding="utf-8") as f:
+            json.dump(dict(iter_orders(order_count)), f)
+        phone = phone_for(order_count // 3, max(1, order_count // 2))
+        print(f"{order_count} orders ({orders_path.stat().st_size / 1024 / 1024:.0f} MB)\n")
+
+        print(f"{'mode':>10} {'call':>5} {'setup (ms)':>11} {'order ready (ms)':>17}")
+        for mode in ("no-prewarm", "prewarm"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_call_setup", "--child", mode, str(orders_path), phone],
+                capture_output=True, text=True,
+            )
+            if out.returncode != 0:
+                raise RuntimeError(f"{mode} run failed:\n{out.stderr}")
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            for call, timing in enumerate(result["calls"], 1):
+                label = "first" if call == 1 else "warm"
+                print(f"{mode:>10} {label:>5} {timing['setup_ms']:>11.1f} {timing['order_ready_ms']:>17.1f}")
+            stages = ", ".join(f"{stage} {ms:.1f}ms" for stage, ms in result["stages"].items())
+            print(f"{'':>10} stages (p50): {stages}")
+            if "prewarm_ms" in result:
+                steps = ", ".join(f"{name} {ms:.0f}ms" for name, ms in result["prewarm_steps_ms"].items())
+                print(f"\nprewarm took {result['prewarm_ms']:.0f}ms before returning ({steps}; background: {', '.join(sorted(BACKGROUND_STEPS))})")
+                ok = _first_call_ok(result["calls"], tolerance, slack_ms)
+                verdict = "OK" if ok else "FAIL"
+                print(f"{verdict}: prewarmed first call vs warm call (tolerance {tolerance:.0%} + {slack_ms:g}ms)")
+    return ok
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(*sys.argv[2:5])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100000, help="Orders in the synthetic orders file")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed first-call excess, as a fraction of the warm call")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Allowed first-call excess on top of the tolerance (ms)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.orders, args.tolerance, args.slack_ms) else 1)
@@ -0,0 +1,178 @@
+"""
+Targeted dispatch versus broadcast-to-all with simulated agents.
+
+Starts the backend with uvicorn in a subprocess for each DISPATCH_MODE and
+connects --agents simulated dashboards to /ws/agent. Each reports itself
+idle, accepts a call after a short reaction delay, stays busy for
+--handle-time seconds, ends the transfer and goes idle again. A fraction of
+agents (--unresponsive) never answer offers, so the offer timeout and the
+fallback to the next agent are exercised. Transfers are created at a steady
+rate and the benchmark reports:
+
+    time-to-accept   POST /api/create-transfer -> the accept that won
+    attempts         POST /api/accept-transfer calls per transfer
+    lost races       accepts answered "Transfer already handled"
+    offers           messages that put a transfer in front of an agent
+
+Usage:
+    python -m benchmarks.bench_dispatch [--agents 50] [--transfers 200] [--modes longest_idle,round_robin,broadcast]
+                                        [--workers 2]  (several workers share TRANSFER_STORE=sqlite)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+from websockets.asyncio.client import connect
+
+from benchmarks._util import free_port, percentile, wait_for_server
+
+
+class _Counters:
+    def __init__(self):
+        self.offers = 0
+        self.attempts = 0
+        self.lost = 0
+        self.accepted = {}
+
+
+async def _agent(index, ws_url, base_url, http, counters, unresponsive, reaction, handle_time, ready):
+    name = f"agent-{index}"
+    async with connect(ws_url, open_timeout=60) as ws:
+        broadcast = json.loads(await ws.recv())["dispatch"] == "broadcast"
+        await ws.send(json.dumps({"type": "presence", "agent_name": name, "status": "idle"}))
+        ready.release()
+        busy = False
+        async for message in ws:
+            event = json.loads(message)
+            if event.get("type") == "transfer_update":
+                # Broadcast mode: every dashboard sees every new transfer
+                if not broadcast or event["transfer"]["status"] != "pending":
+                    continue
+            elif event.get("type") != "transfer_offer":
+                continue
+            counters.offers += 1
+            if unresponsive or busy:
+                continue
+            busy = True
+            transfer_id = event["transfer"]["id"]
+            await asyncio.sleep(random.uniform(*reaction))
+            counters.attempts += 1
+            async with http.post(f"{base_url}/api/accept-transfer",
+                                 json={"transfer_id": transfer_id, "agent_name": name}) as response:
+                result = await response.json()
+            if not result.get("success"):
+                counters.lost += 1
+                busy = False
+                continue
+            counters.accepted[transfer_id] = time.perf_counter()
+            await ws.send(json.dumps({"type": "presence", "agent_name": name, "status": "busy"}))
+            await asyncio.sleep(handle_time)
+            async with http.post(f"{base_url}/api/end-transfer/{transfer_id}"):
+                pass
+            await ws.send(json.dumps({"type": "presence", "agent_name": name, "status": "idle"}))
+            busy = False
+
+
+async def run_mode(mode, args):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}/ws/agent"
+    db = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+    env = dict(os.environ, DISPATCH_MODE=mode, DISPATCH_OFFER_TIMEOUT=str(args.offer_timeout),
+               TRANSFER_STORE="sqlite" if args.workers > 1 else os.environ.get("TRANSFER_STORE", "memory"),
+               TRANSFER_STORE_DB=db,
+               LIVEKIT_API_KEY=os.environ.get("LIVEKIT_API_KEY", "benchmark"),
+               LIVEKIT_API_SECRET=os.environ.get("LIVEKIT_API_SECRET", "benchmark-secret-benchmark-secret"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.app:app", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "error"],
+        env=env, stderr=subprocess.DEVNULL,
+    )
+    try:
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as http:
+            await wait_for_server(http, base_url)
+            # Let every worker finish starting
+            await asyncio.sleep(0.5 * (args.workers - 1))
+
+            counters = _Counters()
+            ready = asyncio.Semaphore(0)
+            rng = random.Random(0)
+            unresponsive = set(rng.sample(range(args.agents), int(args.agents * args.unresponsive)))
+            tasks = [
+                asyncio.create_task(_agent(i, ws_url, base_url, http, counters, i in unresponsive,
+                                           (args.reaction_min, args.reaction_max), args.handle_time, ready))
+                for i in range(args.agents)
+            ]
+            for _ in range(args.agents):
+                await ready.acquire()
+
+            created = {}
+            for i in range(args.transfers):
+                start = time.perf_counter()
+                async with http.post(f"{base_url}/api/create-transfer",
+                                     params={"room_name": f"bench-{mode}-{i}"}) as response:
+                    created[(await response.json())["transfer"]["id"]] = start
+                await asyncio.sleep(args.interval)
+
+            deadline = time.monotonic() + args.offer_timeout * 4 + args.handle_time + 10
+            while time.monotonic() < deadline and len(counters.accepted) < len(created):
+                await asyncio.sleep(0.1)
+
+            async with http.get(f"{base_url}/") as response:
+                server_stats = (await response.json())["dispatch"]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        server.terminate()
+        server.wait()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db + suffix):
+                os.remove(db + suffix)
+
+    waits = [(counters.accepted[t] - start) * 1000 for t, start in created.items() if t in counters.accepted]
+    return {
+        "accepted": len(waits),
+        "p50": percentile(waits, 50) if waits else 0.0,
+        "p99": percentile(waits, 99) if waits else 0.0,
+        "attempts": counters.attempts / max(len(created), 1),
+        "lost": counters.lost,
+        "offers": counters.offers / max(len(created), 1),
+        "server": server_stats,
+    }
+
+
+async def run(args):
+    print(f"{args.agents} agents ({args.unresponsive:.0%} unresponsive), {args.transfers} transfers, "
+          f"offer timeout {args.offer_timeout}s, {args.workers} worker(s)\n")
+    print(f"{'mode':>13} {'accepted':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'attempts':>9} "
+          f"{'lost':>6} {'offers':>7}   server expired")
+    for mode in args.modes.split(","):
+        result = await run_mode(mode, args)
+        print(f"{mode:>13} {result['accepted']:>5}/{args.transfers:<3} {result['p50']:>9.0f} "
+              f"{result['p99']:>9.0f} {result['attempts']:>9.2f} {result['lost']:>6} {result['offers']:>7.1f}"
+              f"   {result['server']['expired']:>6}", flush=True)
+    print("\nattempts and offers are per transfer; lost = accepts rejected as already handled")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=50, help="Simulated agent dashboards")
+    parser.add_argument("--transfers", type=int, default=200, help="Transfers to create")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between transfers")
+    parser.add_argument("--handle-time", type=float, default=1.0, help="Seconds an agent spends on a call")
+    parser.add_argument("--reaction-min", type=float, default=0.05, help="Fastest reaction to an offer")
+    parser.add_argument("--reaction-max", type=float, default=0.3, help="Slowest reaction to an offer")
+    parser.add_argument("--unresponsive", type=float, default=0.1, help="Fraction of agents that never answer")
+    parser.add_argument("--offer-timeout", type=float, default=1.0, help="DISPATCH_OFFER_TIMEOUT for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (more than one uses the SQLite store)")
+    parser.add_argument("--modes", default="longest_idle,round_robin,broadcast", help="Comma-separated modes")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,159 @@
+"""
+Firestore read-through cache benchmark.
+
+Runs FirestoreOrderRepository against an in-memory fake Firestore client
+that sleeps for a simulated round-trip on every document get / query, with
+and without the cache. Callers arrive in concurrent waves and look up a
+skewed mix of orders (a few popular orders, a long tail and some order
+numbers that do not exist), the way callers pile in during a regional delay.
+
+Usage:
+    python -m benchmarks.bench_firestore_cache [--orders 1000] [--calls 5000] [--rtt-ms 40]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks._util import percentile
+from benchmarks.synthetic_orders import iter_orders, order_number_for
+
+
+class _FakeDocument:
+    def __init__(self, data):
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _FakeQuery:
+    def __init__(self, collection, field, value):
+        self._collection = collection
+        self._field = field
+        self._value = value
+        self._limit = None
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def stream(self):
+        self._collection.client.round_trip()
+        found = 0
+        for data in self._collection.docs.values():
+            value = data
+            for part in self._field.split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+            if value == self._value:
+                yield _FakeDocument(data)
+                found += 1
+                if self._limit is not None and found >= self._limit:
+                    return
+
+
+class _FakeDocumentRef:
+    def __init__(self, collection, doc_id):
+        self._collection = collection
+        self._doc_id = doc_id
+
+    def get(self):
+        self._collection.client.round_trip()
+        return _FakeDocument(self._collection.docs.get(self._doc_id))
+
+
+class _FakeCollection:
+    def __init__(self, client, docs):
+        self.client = client
+        self.docs = docs
+
+    def document(self, doc_id):
+        return _FakeDocumentRef(self, doc_id)
+
+    def where(self, field, op, value):
+        assert op == "=="
+        return _FakeQuery(self, field, value)
+
+
+class FakeFirestore:
+    """The subset of google.cloud.firestore.Client used by search_order_in_firestore"""
+
+    def __init__(self, orders, rtt):
+        self._orders = _FakeCollection(self, orders)
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def collection(self, name):
+        assert name == "orders"
+        return self._orders
+
+    def round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.rtt)
+
+
+def _workload(order_count, calls, seed=3):
+    """Zipf-ish mix of order numbers: hot orders, a long tail and ~5% unknown numbers"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(order_count)]
+    lookups = rng.choices(range(order_count), weights=weights, k=calls)
+    return [
+        order_number_for(order_count + rng.randrange(1000)) if rng.random() < 0.05 else order_number_for(i)
+        for i in lookups
+    ]
+
+
+async def _run_mode(find_order, workload, wave):
+    timings = []
+
+    async def call(order_number):
+        start = time.perf_counter()
+        await find_order(order_number=order_number)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for i in range(0, len(workload), wave):
+        await asyncio.gather(*(call(order_number) for order_number in workload[i:i + wave]))
+    return time.perf_counter() - start, timings
+
+
+def run(order_count, calls, rtt_ms, wave):
+    from src.utils.logger import logger
+    from src.utils.order_cache import ReadThroughCache
+    from src.utils.order_repository import FirestoreOrderRepository, OrderRepository
+    logger.disabled = True
+
+    orders = {number: order for number, order in iter_orders(order_count)}
+    workload = _workload(order_count, calls)
+    print(f"{calls} lookups over {order_count} orders, {rtt_ms:g} ms simulated round-trip, "
+          f"waves of {wave} concurrent callers\n")
+    print(f"{'mode':>9} {'total (s)':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'round-trips':>12}")
+
+    for mode in ("uncached", "cached"):
+        client = FakeFirestore(orders, rtt_ms / 1000)
+        repository = FirestoreOrderRepository(client=client, timeout=60, cache=ReadThroughCache(maxsize=4096))
+        if mode == "cached":
+            find_order = repository.find_order
+        else:
+            # The pre-cache path: straight to the thread pool, no cache, no single-flight
+            def find_order(**kwargs):
+                return OrderRepository.find_order(repository, **kwargs)
+        total, timings = asyncio.run(_run_mode(find_order, workload, wave))
+        print(f"{mode:>9} {total:>10.2f} {percentile(timings, 50):>9.2f} {percentile(timings, 99):>9.2f} "
+              f"{client.round_trips:>12}")
+        if mode == "cached":
+            stats = repository.cache_stats()
+            print(f"\ncache: hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, "
+                  f"{stats['negative_hits']} negative hits, {stats['coalesced']} coalesced, "
+                  f"{stats['misses']} misses)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000, help="Orders in the fake collection")
+    parser.add_argument("--calls", type=int, default=5000, help="Total lookups")
+    parser.add_argument("--rtt-ms", type=float, default=40, help="Simulated Firestore round-trip")
+    parser.add_argument("--wave", type=int, default=50, help="Concurrent lookups per wave")
+    args = parser.parse_args()
+    run(args.orders, args.calls, args.rtt_ms, args.wave)
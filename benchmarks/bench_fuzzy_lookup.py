@@ -0,0 +1,78 @@
+"""
+Fuzzy order number lookup benchmark.
+
+Times matching a misheard order number against one caller's orders (as
+find_candidates does) for ASR-style mistakes: dropped dashes, a swapped
+digit pair, one wrong digit, one dropped digit and two wrong digits.
+"recall" is how often the order the caller meant is among the candidates.
+
+Usage:
+    python -m benchmarks.bench_fuzzy_lookup [--orders-per-phone 10] [--max-distance 2]
+"""
+import argparse
+import random
+import time
+
+from benchmarks._util import percentile
+from benchmarks.synthetic_orders import order_number_for
+from src.utils.fuzzy_match import closest_order_numbers
+
+
+def _swap(number, rng):
+    i = rng.randrange(len(number) - 5, len(number) - 1)
+    return number[:i] + number[i + 1] + number[i] + number[i + 2:]
+
+
+def _substitute(number, rng, count=1):
+    chars = list(number)
+    for i in rng.sample(range(len(number) - 4, len(number)), count):
+        chars[i] = str((int(chars[i]) + rng.randint(1, 9)) % 10)
+    return "".join(chars)
+
+
+def _drop(number, rng):
+    i = rng.randrange(len(number) - 4, len(number))
+    return number[:i] + number[i + 1:]
+
+
+MISTAKES = {
+    "no dashes": lambda number, rng: number.replace("-", " "),
+    "swapped digits": _swap,
+    "one wrong digit": _substitute,
+    "dropped digit": _drop,
+    "two wrong digits": lambda number, rng: _substitute(number, rng, count=2),
+}
+
+
+def run(orders_per_phone, max_distance, lookups, density):
+    rng = random.Random(7)
+    print(f"{orders_per_phone} orders per caller, max distance {max_distance}\n")
+
+    print(f"{'mistake':>18} {'p50 (ms)':>9} {'p99 (ms)':>9} {'recall':>7}")
+    for name, mistake in MISTAKES.items():
+        timings = []
+        hits = 0
+        for _ in range(lookups):
+            # Sample sparsely from the order number space: with every sequence
+            # number in use, a one-digit mistake just names a different order
+            own_orders = [order_number_for(i) for i in
+                          rng.sample(range(int(orders_per_phone / density)), orders_per_phone)]
+            actual = rng.choice(own_orders)
+            heard = mistake(actual, rng)
+            start = time.perf_counter()
+            candidates = closest_order_numbers(heard, own_orders, max_distance)
+            timings.append((time.perf_counter() - start) * 1000)
+            hits += any(number == actual for number, _ in candidates)
+        print(f"{name:>18} {percentile(timings, 50):>9.3f} {percentile(timings, 99):>9.3f} "
+              f"{hits / lookups:>7.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders-per-phone", type=int, default=10, help="Orders placed with the caller's phone")
+    parser.add_argument("--max-distance", type=int, default=2, help="Edit distance cutoff")
+    parser.add_argument("--lookups", type=int, default=500, help="Lookups per mistake type")
+    parser.add_argument("--density", type=float, default=0.01,
+                        help="Fraction of possible order numbers that are in use")
+    args = parser.parse_args()
+    run(args.orders_per_phone, args.max_distance, args.lookups, args.density)
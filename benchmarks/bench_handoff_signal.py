@@ -0,0 +1,125 @@
+"""
+Accept-to-AI-disconnect latency across processes.
+
+Starts the backend with uvicorn in a subprocess and --jobs stand-in call
+jobs, each in its own process listening on the control bus for its room the
+way entrypoint does. For --rounds rounds, every room gets a transfer that is
+then accepted over HTTP, and the time from sending the accept to the job
+process handling the disconnect command is measured (both sides read the
+system-wide monotonic clock).
+
+    signalled   accept sent -> job process runs its disconnect handler
+    accept      accept sent -> HTTP response (the signal is sent after it)
+    no job      accept response time for a room with no job listening
+
+Before the control bus the backend set a flag on its own copy of
+active_sessions, which no job process ever saw: 0 signals delivered.
+
+Usage:
+    python -m benchmarks.bench_handoff_signal [--jobs 20] [--rounds 10]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+from benchmarks._util import free_port, percentile, wait_for_server
+
+
+def _job(room_name, socket_dir, signals):
+    """A call job: answers disconnect commands for room_name until terminated"""
+    from src.utils.control_bus import ControlServer
+    from src.utils.logger import logger
+    logger.disabled = True
+
+    async def on_control(message):
+        signals.put((room_name, time.monotonic()))
+        return {"ok": True}
+
+    async def main():
+        await ControlServer(room_name, on_control, socket_dir=socket_dir).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def _accept(http, base_url, room_name):
+    async with http.post(f"{base_url}/api/create-transfer", params={"room_name": room_name}) as response:
+        transfer_id = (await response.json())["transfer"]["id"]
+    start = time.monotonic()
+    async with http.post(f"{base_url}/api/accept-transfer",
+                         json={"transfer_id": transfer_id, "agent_name": "bench"}) as response:
+        assert (await response.json()).get("success"), "accept failed"
+    return start, time.monotonic()
+
+
+async def run(jobs, rounds):
+    from src.utils.control_bus import control_socket_path
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    context = multiprocessing.get_context("spawn")
+    signals = context.Queue()
+    rooms = [f"bench-room-{i}" for i in range(jobs)]
+
+    with tempfile.TemporaryDirectory() as socket_dir:
+        env = dict(os.environ, CONTROL_SOCKET_DIR=socket_dir, DISPATCH_MODE="broadcast",
+                   LIVEKIT_API_KEY=os.environ.get("LIVEKIT_API_KEY", "benchmark"),
+                   LIVEKIT_API_SECRET=os.environ.get("LIVEKIT_API_SECRET", "benchmark-secret-benchmark-secret"))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.api.app:app", "--port", str(port), "--log-level", "error"],
+            env=env, stderr=subprocess.DEVNULL,
+        )
+        processes = [context.Process(target=_job, args=(room, socket_dir, signals), daemon=True) for room in rooms]
+        for process in processes:
+            process.start()
+        try:
+            while not all(os.path.exists(control_socket_path(room, socket_dir)) for room in rooms):
+                await asyncio.sleep(0.05)
+
+            loop = asyncio.get_running_loop()
+            signalled, accepts, no_job = [], [], []
+            delivered = 0
+            async with aiohttp.ClientSession() as http:
+                await wait_for_server(http, base_url)
+                for _ in range(rounds):
+                    for room in rooms:
+                        start, end = await _accept(http, base_url, room)
+                        accepts.append(end - start)
+                        try:
+                            signalled_room, at = await loop.run_in_executor(None, signals.get, True, 5)
+                        except queue.Empty:
+                            continue
+                        assert signalled_room == room, "signal reached the wrong job"
+                        delivered += 1
+                        signalled.append(at - start)
+
+                for i in range(rounds * jobs):
+                    start, end = await _accept(http, base_url, f"no-job-{i}")
+                    no_job.append(end - start)
+        finally:
+            for process in processes:
+                process.terminate()
+            server.terminate()
+            server.wait()
+
+    print(f"{jobs} job processes, {rounds} accepts each; delivered {delivered}/{jobs * rounds}\n")
+    print(f"{'':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for name, samples in (("signalled", signalled), ("accept", accepts), ("no job", no_job)):
+        if samples:
+            print(f"{name:>10} {percentile(samples, 50) * 1000:>9.2f} {percentile(samples, 99) * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20, help="Call job processes")
+    parser.add_argument("--rounds", type=int, default=10, help="Accepts per job")
+    args = parser.parse_args()
+    asyncio.run(run(args.jobs, args.rounds))
@@ -0,0 +1,120 @@
+"""
+Cold-load benchmark: eager json.load vs lazy per-order decoding.
+
+Writes a synthetic orders file of roughly the requested size, then loads it
+in fresh subprocesses with each loader and reports load time and peak RSS:
+
+    eager       json.load of the whole file (the pre-lazy loader)
+    lazy-scan   lazy loader on a file it has not seen (full offset scan)
+    lazy        lazy loader reusing the saved offset index, i.e. every
+                worker process and restart after the first
+
+Usage:
+    python -m benchmarks.bench_lazy_orders [--mb 500] [--keep PATH]
+
+Peak RSS comes from the resource module (Linux/macOS).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._util import peak_rss_mb
+from benchmarks.synthetic_orders import iter_orders, order_number_for
+
+
+def write_orders_file(path, target_mb):
+    """Stream synthetic orders to `path` until it reaches `target_mb`; returns the order count"""
+    target = target_mb * 1024 * 1024
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for order_num, order in iter_orders(10**9):
+            if count:
+                f.write(",")
+            f.write(f"\n{json.dumps(order_num)}: {json.dumps(order, indent=2)}")
+            count += 1
+            if count % 1000 == 0 and f.tell() >= target:
+                break
+        f.write("\n}\n")
+    return count
+
+
+def child(mode, path, lookup):
+    """Runs in a fresh interpreter so peak RSS only reflects this loader"""
+    os.environ["ORDERS_FILE"] = path
+    os.environ["ORDERS_LAZY_LOAD_MIN_MB"] = "1e12" if mode == "eager" else "0"
+
+    from src.utils.logger import logger
+    from src.utils.order_search import load_orders_database, search_order
+    logger.disabled = True
+    baseline_mb = peak_rss_mb()
+
+    start = time.perf_counter()
+    load_orders_database()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = search_order(order_number=lookup) is not None
+    lookup_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": baseline_mb,
+        "first_lookup_ms": lookup_ms,
+        "found": found,
+    }))
+
+
+def run(target_mb, keep):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(keep or Path(tmp) / "orders.json")
+        if not path.exists():
+            print(f"Writing ~{target_mb} MB of synthetic orders to {path} ...")
+            count = write_orders_file(path, target_mb)
+        else:
+            with open(path, "rb") as f:
+                count = sum(1 for line in f if line.startswith(b'"'))
+        size_mb = path.stat().st_size / 1024 / 1024
+        print(f"{count} orders, {size_mb:.0f} MB\n")
+
+        lookup = order_number_for(count // 2)
+        print(f"{'loader':>9} {'load (s)':>10} {'peak RSS (MB)':>14} {'first lookup (ms)':>18}")
+        results = {}
+        for mode in ("eager", "lazy-scan", "lazy"):
+            if mode == "lazy-scan":
+                index_path = path.with_name(f".{path.name}.idx")
+                if index_path.exists():
+                    index_path.unlink()
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_lazy_orders", "--child", mode, str(path), lookup],
+                capture_output=True, text=True, check=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            assert result["found"], f"{mode} loader did not find {lookup}"
+            results[mode] = result
+            print(f"{mode:>9} {result['load_seconds']:>10.2f} {result['peak_rss_mb']:>14.0f} "
+                  f"{result['first_lookup_ms']:>18.2f}")
+
+        eager = results["eager"]
+        for mode in ("lazy-scan", "lazy"):
+            lazy = results[mode]
+            print(f"\n{mode}: load {eager['load_seconds'] / lazy['load_seconds']:.1f}x faster, "
+                  f"peak RSS {eager['peak_rss_mb'] / lazy['peak_rss_mb']:.1f}x smaller than eager")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(*sys.argv[2:5])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=500, help="Approximate orders file size in MB")
+    parser.add_argument("--keep", default=None, help="Write (or reuse) the orders file at this path")
+    args = parser.parse_args()
+    run(args.mb, args.keep)
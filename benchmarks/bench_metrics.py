@@ -0,0 +1,86 @@
+"""
+/metrics scrape cost versus transfer history.
+
+Runs the backend in-process over ASGI (no network) with retention raised so
+completed transfers are kept, pushes --history transfers through create ->
+accept -> end in steps, and after each step times:
+
+    metrics   GET /metrics (incremental counters and histograms)
+    rescan    the same counts and timing histograms rebuilt by scanning
+              every stored transfer, the way a scrape of the transfer
+              list would work
+
+Usage:
+    python -m benchmarks.bench_metrics [--history 100000] [--scrapes 200]
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+
+from benchmarks._util import percentile
+
+# Keep every completed transfer so history really grows; nothing is sent to LiveKit
+os.environ["TRANSFER_RETENTION_COUNT"] = "100000000"
+os.environ["TRANSFER_RETENTION_SECONDS"] = "1e9"
+os.environ.setdefault("LIVEKIT_API_KEY", "benchmark")
+os.environ.setdefault("LIVEKIT_API_SECRET", "benchmark-secret-benchmark-secret")
+
+
+def _rescan(store):
+    counts = {"pending": 0, "accepted": 0, "completed": 0}
+    waits, handles = [], []
+    for transfer in list(store._by_id.values()):
+        counts[transfer["status"]] += 1
+        if transfer.get("accepted_at"):
+            waits.append((datetime.fromisoformat(transfer["accepted_at"])
+                          - datetime.fromisoformat(transfer["created_at"])).total_seconds())
+        if transfer.get("completed_at") and transfer.get("accepted_at"):
+            handles.append((datetime.fromisoformat(transfer["completed_at"])
+                            - datetime.fromisoformat(transfer["accepted_at"])).total_seconds())
+    return counts, sorted(waits), sorted(handles)
+
+
+async def run(history, scrapes):
+    import httpx
+    from src.utils.logger import logger
+    from src.api import app as backend
+    logger.disabled = True
+
+    store = backend.transfers
+    transport = httpx.ASGITransport(app=backend.app)
+    steps = [0] + [history // 100 * 10 ** i for i in range(3) if history // 100 * 10 ** i <= history]
+    print(f"{'history':>9} {'metrics p50 (ms)':>17} {'metrics p99 (ms)':>17} {'rescan p50 (ms)':>16}")
+    async with backend.app.router.lifespan_context(backend.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            done = 0
+            for target in steps:
+                while done < target:
+                    transfer = store.create(f"room-{done}", "benchmark")
+                    store.accept(transfer["id"], "bench")
+                    store.complete(transfer["id"])
+                    done += 1
+
+                timings = []
+                for _ in range(scrapes):
+                    start = time.perf_counter()
+                    response = await client.get("/metrics")
+                    timings.append(time.perf_counter() - start)
+                assert f"call_center_transfers_completed_total {float(done)}" in response.text
+
+                rescans = []
+                for _ in range(max(1, min(scrapes, 20))):
+                    start = time.perf_counter()
+                    _rescan(store)
+                    rescans.append(time.perf_counter() - start)
+                print(f"{done:>9} {percentile(timings, 50) * 1000:>17.2f} {percentile(timings, 99) * 1000:>17.2f} "
+                      f"{percentile(rescans, 50) * 1000:>16.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=100000, help="Transfers pushed through by the last step")
+    parser.add_argument("--scrapes", type=int, default=200, help="Scrapes timed per step")
+    args = parser.parse_args()
+    asyncio.run(run(args.history, args.scrapes))
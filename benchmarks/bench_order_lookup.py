@@ -0,0 +1,240 @@
+"""
+Order lookup benchmark suite with baseline comparison.
+
+For each catalog size, writes synthetic orders in the full orders.json schema
+(cached in --data-dir between runs), then starts one fresh interpreter per
+backend and measures:
+
+    load (s)        cold load_orders_database() / opening the SQLite store
+    peak RSS (MB)   process peak after loading and all lookups
+    order #         search_order(order_number=...) p50 / p99 in microseconds
+    phone           search_order(phone=...) p50 / p99
+    miss            lookups of order numbers and phones that are not on file
+
+The JSON backend's byte-offset sidecar is deleted before every run, so
+"load" is a worker's first start.
+
+Results are compared against the stored baseline (benchmarks/baselines/
+order_lookup.json): a metric more than --tolerance slower than the baseline
+is flagged and the run exits non-zero. Save a new baseline after an
+intentional change with --save-baseline. Baselines are only comparable on
+the machine that recorded them.
+
+Usage:
+    python -m benchmarks.bench_order_lookup [--scales 1000,100000,1000000] [--backends json,sqlite]
+                                            [--save-baseline] [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks._util import peak_rss_mb, percentile
+from benchmarks.synthetic_orders import iter_orders, order_number_for, phone_for
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "order_lookup.json"
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "bench"
+
+# Bump when the generator's output changes so cached catalogs are rebuilt
+_CATALOG_VERSION = 1
+
+# Metric -> (column label, format); all are "lower is better"
+METRICS = {
+    "load_seconds": ("load (s)", "{:.2f}"),
+    "peak_rss_mb": ("peak RSS (MB)", "{:.0f}"),
+    "order_number_p50_us": ("order # p50", "{:.1f}"),
+    "order_number_p99_us": ("order # p99", "{:.1f}"),
+    "phone_p50_us": ("phone p50", "{:.1f}"),
+    "phone_p99_us": ("phone p99", "{:.1f}"),
+    "miss_p50_us": ("miss p50", "{:.1f}"),
+    "miss_p99_us": ("miss p99", "{:.1f}"),
+}
+
+# Differences below these are timer noise, whatever the relative change
+_ABSOLUTE_SLACK = {"load_seconds": 0.05, "peak_rss_mb": 5}
+_LATENCY_SLACK_US = 5
+
+
+def write_catalog(path, count):
+    """Stream `count` synthetic orders to `path` as an orders.json-style object"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for i, (order_num, order) in enumerate(iter_orders(count)):
+            f.write(f"{',' if i else ''}\n{json.dumps(order_num)}: {json.dumps(order)}")
+        f.write("\n}\n")
+    os.replace(tmp_path, path)
+
+
+def prepare_catalog(data_dir, count, backends):
+    """Generate (or reuse) the catalog for `count` orders and any SQLite database the backends need"""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    json_path = data_dir / f"orders_v{_CATALOG_VERSION}_{count}.json"
+    if not json_path.exists():
+        print(f"Writing {count} synthetic orders to {json_path} ...", flush=True)
+        write_catalog(json_path, count)
+
+    db_path = json_path.with_suffix(".db")
+    if "sqlite" in backends and not db_path.exists():
+        from src.utils.order_store import import_orders_json
+        print(f"Importing into {db_path} ...", flush=True)
+        import_orders_json(json_path, db_path)
+    return json_path, db_path
+
+
+def _queries(count, lookups, seed=11):
+    rng = random.Random(seed)
+    phones = max(1, count // 2)
+    indexes = [rng.randrange(count) for _ in range(lookups)]
+    return {
+        "order_number": [("order_number", order_number_for(i)) for i in indexes],
+        "phone": [("phone", phone_for(i, phones)) for i in indexes],
+        # Half unknown order numbers (past the end of the catalog), half unknown phones
+        "miss": [
+            ("order_number", order_number_for(count + i)) if i % 2 else ("phone", f"8{i:09d}")
+            for i in range(lookups)
+        ],
+    }
+
+
+def child(backend, json_path, db_path, count, lookups):
+    """Runs in a fresh interpreter so load time and peak RSS only reflect this backend"""
+    os.environ.update({
+        "ORDERS_BACKEND": backend,
+        "ORDERS_FILE": json_path,
+        "ORDERS_DB": db_path,
+        "ORDERS_HOT_RELOAD": "false",
+    })
+    from src.utils.logger import logger
+    from src.utils.order_search import load_orders_database, search_order
+    logger.disabled = True
+
+    start = time.perf_counter()
+    if backend == "sqlite":
+        from src.utils.order_store import get_order_store
+        get_order_store().count()
+    else:
+        load_orders_database()
+    result = {"load_seconds": time.perf_counter() - start}
+
+    for kind, queries in _queries(count, lookups).items():
+        timings = []
+        found = 0
+        for field, value in queries:
+            start = time.perf_counter()
+            order_data = search_order(**{field: value})
+            timings.append((time.perf_counter() - start) * 1e6)
+            found += order_data is not None
+        expected = 0 if kind == "miss" else len(queries)
+        assert found == expected, f"{backend} {kind}: found {found} of {len(queries)}, expected {expected}"
+        result[f"{kind}_p50_us"] = percentile(timings, 50)
+        result[f"{kind}_p99_us"] = percentile(timings, 99)
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    print(json.dumps(result))
+
+
+def measure(backend, json_path, db_path, count, lookups):
+    index_path = json_path.with_name(f".{json_path.name}.idx")
+    if index_path.exists():
+        index_path.unlink()
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_order_lookup", "--child",
+         backend, str(json_path), str(db_path), str(count), str(lookups)],
+        capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"{backend} @ {count} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """Print each metric next to the baseline; returns the list of regressions"""
+    regressions = []
+    print(f"\nCompared with baseline from {baseline.get('recorded_at', '?')} "
+          f"({baseline.get('machine', '?')}), tolerance {tolerance:.0%}")
+    for key, metrics in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if previous is None:
+            print(f"  {key}: no baseline")
+            continue
+        for metric, value in metrics.items():
+            old = previous.get(metric)
+            if old is None:
+                continue
+            slack = _ABSOLUTE_SLACK.get(metric, _LATENCY_SLACK_US)
+            if value > old * (1 + tolerance) and value - old > slack:
+                label, fmt = METRICS[metric]
+                regressions.append(key)
+                print(f"  REGRESSION {key} {label}: {fmt.format(value)} vs {fmt.format(old)} "
+                      f"({value / old - 1:+.0%})")
+    if not regressions:
+        print("  no regressions")
+    return regressions
+
+
+def run(scales, backends, lookups, data_dir, save_baseline, tolerance):
+    catalogs = {count: prepare_catalog(data_dir, count, backends) for count in scales}
+
+    header = f"{'backend':>8} {'orders':>9}" + "".join(f" {METRICS[m][0]:>13}" for m in METRICS)
+    print(f"\n{header}")
+    results = {}
+    for count in scales:
+        json_path, db_path = catalogs[count]
+        for backend in backends:
+            result = measure(backend, json_path, db_path, count, lookups)
+            results[f"{backend}/{count}"] = result
+            print(f"{backend:>8} {count:>9}" + "".join(
+                f" {fmt.format(result[metric]):>13}" for metric, (_, fmt) in METRICS.items()
+            ), flush=True)
+
+    if save_baseline:
+        baseline = {}
+        if BASELINE_PATH.exists():
+            baseline = json.loads(BASELINE_PATH.read_text())
+        baseline.setdefault("results", {}).update(
+            {key: {metric: round(value, 3) for metric, value in metrics.items()} for key, metrics in results.items()}
+        )
+        baseline["recorded_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        baseline["machine"] = f"{platform.machine()} {platform.system()}, Python {platform.python_version()}"
+        baseline["lookups"] = lookups
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print(f"\nNo baseline at {BASELINE_PATH}; record one with --save-baseline")
+        return 0
+    return 1 if compare(results, json.loads(BASELINE_PATH.read_text()), tolerance) else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        backend, json_path, db_path, count, lookups = sys.argv[2:7]
+        child(backend, json_path, db_path, int(count), int(lookups))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1000,100000,1000000", help="Comma-separated catalog sizes")
+    parser.add_argument("--backends", default="json", help="Comma-separated backends: json, sqlite")
+    parser.add_argument("--lookups", type=int, default=5000, help="Lookups per query type")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR,
+                        help="Where generated catalogs are kept between runs")
+    parser.add_argument("--save-baseline", action="store_true", help="Record these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown relative to the baseline before flagging a regression")
+    args = parser.parse_args()
+    sys.exit(run(
+        [int(s) for s in args.scales.split(",")],
+        [b.strip() for b in args.backends.split(",")],
+        args.lookups,
+        args.data_dir,
+        args.save_baseline,
+        args.tolerance,
+    ))
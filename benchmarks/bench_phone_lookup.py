@@ -0,0 +1,75 @@
+"""
+Phone lookup benchmark for search_order.
+
+Builds slim synthetic catalogs from 1k to 1M orders and times phone and
+order-number lookups through search_order. With the phone index, lookup
+latency should stay flat as the catalog grows.
+
+Usage:
+    python -m benchmarks.bench_phone_lookup [--scales 1000,10000,100000,1000000]
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_orders import iter_orders, order_number_for, phone_for
+
+
+def _write_catalog(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(iter_orders(count, slim=True)), f)
+
+
+def _time_lookups(search_order, field, queries):
+    """Mean microseconds per search_order(field=query) call"""
+    start = time.perf_counter()
+    for query in queries:
+        search_order(**{field: query})
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run(scales, lookups):
+    # Silence per-lookup logging so we time the lookup, not the log handler
+    from src.utils.logger import logger
+    logger.setLevel(logging.ERROR)
+    rng = random.Random(42)
+
+    print(f"{'orders':>10} {'load (s)':>10} {'phone (µs)':>12} {'order # (µs)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in scales:
+            path = Path(tmp) / f"orders_{count}.json"
+            _write_catalog(path, count)
+            os.environ["ORDERS_FILE"] = str(path)
+
+            import config.settings
+            import src.utils.order_search
+            importlib.reload(config.settings)
+            order_search = importlib.reload(src.utils.order_search)
+
+            start = time.perf_counter()
+            order_search.load_orders_database()
+            load_seconds = time.perf_counter() - start
+
+            indexes = [rng.randrange(count) for _ in range(lookups)]
+            phones = [phone_for(i, max(1, count // 2)) for i in indexes]
+            numbers = [order_number_for(i) for i in indexes]
+
+            phone_us = _time_lookups(order_search.search_order, "phone", phones)
+            number_us = _time_lookups(order_search.search_order, "order_number", numbers)
+            print(f"{count:>10} {load_seconds:>10.2f} {phone_us:>12.2f} {number_us:>13.2f}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1000,10000,100000,1000000",
+                        help="Comma-separated catalog sizes")
+    parser.add_argument("--lookups", type=int, default=2000, help="Lookups per scale")
+    args = parser.parse_args()
+    run([int(s) for s in args.scales.split(",")], args.lookups)
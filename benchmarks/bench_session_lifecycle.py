@@ -0,0 +1,115 @@
+"""
+Handoff latency and idle wakeups: lifecycle events versus the polling loop.
+
+Runs --calls concurrent stand-in calls on one event loop. Each call waits
+for its human agent, who takes over at a random moment after --idle
+seconds, in two ways:
+
+    polling   the previous entrypoint: while not state.should_disconnect:
+              await asyncio.sleep(1)
+    events    MyState.human_joined, awaited
+
+Reported per mode: handoff latency (human takes over -> the call's code
+runs), wakeups per call per idle second, and memory per session state
+object (previous dict-backed MyState versus the __slots__ one, whose size
+is mostly its three asyncio.Events).
+
+Usage:
+    python -m benchmarks.bench_session_lifecycle [--calls 200] [--idle 3]
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+
+from src.models.state import MyState
+
+from benchmarks._util import percentile
+
+
+class _PollingState:
+    """The previous MyState"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.order_data = None
+        self.customer_phone = None
+        self.customer_order_number = None
+        self.caller_phone = None
+        self.order_prefetch = None
+        self.transfer_initiated = False
+        self.should_disconnect = False
+
+
+async def _polling_call(state):
+    wakeups = 0
+    while not state.should_disconnect:
+        await asyncio.sleep(1)
+        wakeups += 1
+    return wakeups, time.perf_counter()
+
+
+async def _event_call(state):
+    await state.human_joined.wait()
+    return 1, time.perf_counter()
+
+
+def _take_over_polling(state):
+    state.should_disconnect = True
+
+
+def _take_over_events(state):
+    state.human_joined.set()
+
+
+async def _run_mode(make_state, call, take_over, calls, idle):
+    states = [make_state(f"bench-{i}") for i in range(calls)]
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(call(state)) for state in states]
+    loop = asyncio.get_running_loop()
+    signalled = [0.0] * calls
+
+    def signal(i):
+        signalled[i] = time.perf_counter()
+        take_over(states[i])
+
+    for i in range(calls):
+        loop.call_later(idle + random.random(), signal, i)
+    results = await asyncio.gather(*tasks)
+
+    latencies = [(resumed - signalled[i]) * 1000 for i, (_, resumed) in enumerate(results)]
+    # The wakeup that finally sees the handoff is not an idle one
+    idle_wakeups = sum(wakeups - 1 for wakeups, _ in results) / sum(at - started for at in signalled)
+    return percentile(latencies, 50), percentile(latencies, 99), idle_wakeups
+
+
+def _bytes_per_state(make_state, count=10000):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    states = [make_state(f"bench-{i}") for i in range(count)]
+    size = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+    del states
+    return size
+
+
+async def run(calls, idle):
+    print(f"{calls} concurrent calls, human takes over after {idle}-{idle + 1}s\n")
+    print(f"{'':>8} {'handoff p50 (ms)':>17} {'handoff p99 (ms)':>17} {'idle wakeups/call/s':>20} {'bytes/state':>12}")
+    modes = (
+        ("polling", _PollingState, _polling_call, _take_over_polling),
+        ("events", MyState, _event_call, _take_over_events),
+    )
+    for name, make_state, call, take_over in modes:
+        p50, p99, wakeups = await _run_mode(make_state, call, take_over, calls, idle)
+        size = _bytes_per_state(make_state)
+        print(f"{name:>8} {p50:>17.2f} {p99:>17.2f} {wakeups:>20.2f} {size:>12,.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Concurrent calls")
+    parser.add_argument("--idle", type=float, default=3, help="Seconds before the first handoff")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.idle))
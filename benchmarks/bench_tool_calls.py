@@ -0,0 +1,110 @@
+"""
+Function tool instrumentation: what it reports and what it costs.
+
+Writes --orders synthetic orders, then calls the real Assistant.get_order_info
+tool (instrumented, with a stub RunContext and call state) --calls times for
+order numbers on file, misspoken order numbers (fuzzy suggestions among
+the caller's own orders) and phone numbers, and prints the per-process summary from get_tool_stats():
+wall time, event loop blocking time and result size per tool.
+
+It also times a trivial tool with and without instrument_tool to show the
+wrapper's own overhead per call.
+
+Usage:
+    python -m benchmarks.bench_tool_calls [--orders 20000] [--calls 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._util import percentile
+from benchmarks.synthetic_orders import iter_orders, order_number_for, phone_for
+
+
+class _StubSession:
+    def __init__(self, userdata):
+        self.userdata = userdata
+
+
+class _StubSpeechHandle:
+    num_steps = 1
+
+
+async def _overhead(calls):
+    from src.utils.tool_metrics import instrument_tool
+
+    async def tool(x):
+        return "ok"
+
+    timings = {}
+    for name, fn in (("plain", tool), ("instrumented", instrument_tool(tool))):
+        samples = []
+        for i in range(calls):
+            start = time.perf_counter()
+            await fn(i)
+            samples.append((time.perf_counter() - start) * 1e6)
+        timings[name] = percentile(samples, 50)
+    return timings
+
+
+async def run(order_count, calls):
+    from livekit.agents import RunContext
+    from src.utils.logger import logger
+    from src.agents.assistant import Assistant
+    from src.models.state import MyState
+    from src.utils.tool_metrics import get_tool_stats, pop_session_tool_stats
+    logger.disabled = True
+
+    phones = max(1, order_count // 2)
+    assistant = Assistant("bench-room")
+    rng = random.Random(0)
+
+    def misspoken(state):
+        n = rng.randrange(order_count)
+        state.customer_phone = phone_for(n, phones)
+        return {"order_number": order_number_for(n).replace("-", "")[:-1] + "9"}
+
+    kinds = {
+        "order #": lambda state: {"order_number": order_number_for(rng.randrange(order_count))},
+        "misspoken": misspoken,
+        "phone": lambda state: {"phone": phone_for(rng.randrange(order_count), phones)},
+    }
+    for kind, make_args in kinds.items():
+        state = MyState(f"bench-{kind}")
+        ctx = RunContext(session=_StubSession(state), speech_handle=_StubSpeechHandle(), function_call=None)
+        for i in range(calls):
+            await assistant.get_order_info(ctx, **make_args(state))
+        session = pop_session_tool_stats(state.session_id)["get_order_info"]
+        print(f"{kind:>10}: {session['calls']} calls, {session['wall_ms'] / session['calls']:.2f} ms wall and "
+              f"{session['blocking_ms'] / session['calls']:.2f} ms blocking per call, "
+              f"{session['result_bytes'] / session['calls']:,.0f} bytes per result")
+
+    print("\nget_tool_stats():")
+    print(json.dumps(get_tool_stats(), indent=2))
+
+    overhead = await _overhead(calls * 10)
+    print(f"\ntrivial tool p50: {overhead['plain']:.1f} µs plain, {overhead['instrumented']:.1f} µs instrumented")
+
+
+def main(order_count, calls):
+    with tempfile.TemporaryDirectory() as tmp:
+        orders_path = Path(tmp) / "orders.json"
+        with open(orders_path, "w", encoding="utf-8") as f:
+            json.dump(dict(iter_orders(order_count)), f)
+        os.environ["ORDERS_FILE"] = str(orders_path)
+        os.environ["ORDERS_BACKEND"] = "json"
+        os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+        asyncio.run(run(order_count, calls))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=20000, help="Orders in the synthetic orders file")
+    parser.add_argument("--calls", type=int, default=500, help="Tool calls per kind of lookup")
+    args = parser.parse_args()
+    main(args.orders, args.calls)
@@ -0,0 +1,95 @@
+"""
+Transfer creation latency from the agent: in-process versus HTTP.
+
+Serves the backend with uvicorn inside this process, the way main.py does
+(a backend thread with its own event loop), and times --requests transfer
+creations through each client:
+
+    direct (thread)     DirectTransferClient, run on the backend thread's loop
+    http (pooled)       HttpTransferClient over the shared keep-alive session
+    http (new session)  the previous code: a new aiohttp session per transfer
+
+then serves it on the caller's own event loop and times
+
+    direct (same loop)  DirectTransferClient calling the endpoint function
+
+Usage:
+    python -m benchmarks.bench_transfer_client [--requests 1000]
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+import aiohttp
+import uvicorn
+
+from benchmarks._util import free_port, percentile
+
+
+async def _time(create, count):
+    # Warm up connections and code paths first
+    for i in range(10):
+        await create(f"warmup-{i}")
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        await create(f"bench-{i}")
+        timings.append((time.perf_counter() - start) * 1e6)
+    return percentile(timings, 50), percentile(timings, 99)
+
+
+def _report(name, result):
+    print(f"{name:>20} {result[0]:>9.0f} {result[1]:>9.0f}", flush=True)
+
+
+async def _new_session_create(url, room_name):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, params={"room_name": room_name, "reason": "benchmark"}) as response:
+            return (await response.json())["transfer"]
+
+
+async def run(count):
+    from src.utils.logger import logger
+    from src.api import app as backend
+    from src.agents.transfer_client import DirectTransferClient, HttpTransferClient
+    from src.utils.http_client import close_http_session
+    logger.disabled = True
+
+    print(f"{count} transfers per client\n")
+    print(f"{'':>20} {'p50 (µs)':>9} {'p99 (µs)':>9}")
+
+    # Backend on its own thread and loop, as in main.py
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(backend.app, port=port, log_level="error", log_config=None))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    direct = DirectTransferClient()
+    http = HttpTransferClient(f"http://127.0.0.1:{port}")
+    url = f"http://127.0.0.1:{port}/api/create-transfer"
+    _report("direct (thread)", await _time(lambda room: direct.create_transfer(room, "benchmark"), count))
+    _report("http (pooled)", await _time(lambda room: http.create_transfer(room, "benchmark"), count))
+    _report("http (new session)", await _time(lambda room: _new_session_create(url, room), count))
+    await close_http_session()
+
+    server.should_exit = True
+    thread.join()
+
+    # Backend serving on this loop
+    server = uvicorn.Server(uvicorn.Config(backend.app, port=free_port(), log_level="error", log_config=None))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    _report("direct (same loop)", await _time(lambda room: direct.create_transfer(room, "benchmark"), count))
+    server.should_exit = True
+    await task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="Transfers created per client")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
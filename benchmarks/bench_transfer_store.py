@@ -0,0 +1,114 @@
+"""
+Transfer endpoint latency as transfer history grows.
+
+Drives the backend's endpoints in-process over ASGI (no network) while the
+process accumulates up to a million handled transfers (created, accepted and
+completed), with a steady backlog of pending ones. With the indexed
+TransferStore, latency and the number of transfers held in memory should not
+depend on history; the previous list-based lookups are timed alongside for
+comparison.
+
+Usage:
+    python -m benchmarks.bench_transfer_store [--history 1000,100000,1000000] [--pending 50]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks._util import percentile
+
+# Token minting needs credentials; nothing is sent to LiveKit
+os.environ.setdefault("LIVEKIT_API_KEY", "benchmark")
+os.environ.setdefault("LIVEKIT_API_SECRET", "benchmark-secret-benchmark-secret")
+
+
+def _list_endpoints(transfers):
+    """The previous list-scan implementations of the hot lookups"""
+    def pending():
+        return [t for t in transfers if t["status"] == "pending"]
+
+    def find(transfer_id):
+        return next((t for t in transfers if t["id"] == transfer_id), None)
+
+    return pending, find
+
+
+async def _time_requests(client, make_request, count):
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        response = await make_request(i)
+        timings.append((time.perf_counter() - start) * 1e6)
+        assert response.status_code == 200, response.text
+    return percentile(timings, 50), percentile(timings, 99)
+
+
+async def run(history_sizes, pending_backlog, requests):
+    import httpx
+    from src.utils.logger import logger
+    from src.api import app as backend
+    logger.disabled = True
+
+    store = backend.transfers
+    legacy = []
+    legacy_pending, legacy_find = _list_endpoints(legacy)
+    for _ in range(pending_backlog):
+        legacy.append(store.create("backlog-room", "benchmark"))
+
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'history':>9} {'in memory':>10}   endpoint p50 / p99 (µs)")
+        print(f"{'':>9} {'':>10} {'GET /':>12} {'transfers':>12} {'create':>12} {'accept':>12} {'end':>12}"
+              f"   {'list: pending':>14} {'list: by id':>12}")
+        handled = 0
+        for target in history_sizes:
+            # Handle transfers straight through the store until history reaches target
+            while handled < target:
+                transfer = store.create(f"room-{handled}", "history")
+                store.accept(transfer["id"], "bench")
+                store.complete(transfer["id"])
+                legacy.append(transfer)
+                handled += 1
+
+            created = []
+
+            async def create(i):
+                response = await client.post("/api/create-transfer", params={"room_name": f"bench-{i}"})
+                created.append(response.json()["transfer"]["id"])
+                return response
+
+            results = {
+                "root": await _time_requests(client, lambda i: client.get("/"), requests),
+                "transfers": await _time_requests(client, lambda i: client.get("/api/transfers"), requests),
+                "create": await _time_requests(client, create, requests),
+                "accept": await _time_requests(client, lambda i: client.post(
+                    "/api/accept-transfer", json={"transfer_id": created[i], "agent_name": "bench"}), requests),
+                "end": await _time_requests(client, lambda i: client.post(f"/api/end-transfer/{created[i]}"), requests),
+            }
+
+            # The old endpoints scanned every transfer ever created
+            start = time.perf_counter()
+            for _ in range(5):
+                legacy_pending()
+            scan_pending_us = (time.perf_counter() - start) / 5 * 1e6
+            start = time.perf_counter()
+            for _ in range(5):
+                legacy_find(created[-1])
+            scan_find_us = (time.perf_counter() - start) / 5 * 1e6
+
+            print(f"{target:>9} {len(store):>10}" + "".join(
+                f" {p50:>5.0f} / {p99:<4.0f}" for p50, p99 in results.values()
+            ) + f"   {scan_pending_us:>14.0f} {scan_find_us:>12.0f}", flush=True)
+
+    print(f"\nstore: {store.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", default="1000,100000,1000000",
+                        help="Comma-separated handled-transfer counts to measure at")
+    parser.add_argument("--pending", type=int, default=50, help="Pending transfers waiting throughout")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint per checkpoint")
+    args = parser.parse_args()
+    asyncio.run(run([int(n) for n in args.history.split(",")], args.pending, args.requests))
@@ -0,0 +1,103 @@
+"""
+Order payload size: what get_order_info returns to the model, before and after
+the compact projection.
+
+Serializes every order in the orders file (ORDERS_FILE, default
+data/orders.json) or a synthetic catalog three ways and reports bytes and
+estimated tokens per order:
+
+    before      json.dumps(order, indent=2), the previous tool result
+    compact     the whole order without indentation
+    projected   serialize_order_for_model() (ORDER_PROJECTION_FIELDS)
+
+Tokens are estimated without a model tokenizer: a word counts one token per
+four characters, each punctuation mark one token and each whitespace run one
+token. Real BPE tokenizers merge some of these, so treat the numbers as
+relative, not absolute.
+
+Usage:
+    python -m benchmarks.measure_order_projection [--synthetic 10000] [--fields full|a,b,c] [--history 3]
+"""
+import argparse
+import json
+import re
+import time
+
+from benchmarks._util import percentile
+from benchmarks.synthetic_orders import iter_orders
+
+_TOKEN_PIECES = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+def estimate_tokens(text):
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        tokens += -(-len(piece) // 4) if piece[0].isalnum() or piece[0] == "_" else 1
+    return tokens
+
+
+def run(synthetic, fields, history):
+    from src.utils.logger import logger
+    from src.utils.order_projection import FULL_ORDER, OrderProjector, parse_projection_fields
+    logger.disabled = True
+
+    if synthetic:
+        orders = [order for _, order in iter_orders(synthetic)]
+        source = f"{synthetic} synthetic orders"
+    else:
+        from src.utils.order_search import get_orders_file_path, load_orders_database
+        catalog = load_orders_database()
+        orders = [catalog[order_num] for order_num in catalog]
+        source = f"{len(orders)} orders from {get_orders_file_path()}"
+
+    projector = OrderProjector(
+        fields=parse_projection_fields(fields) if fields else None,
+        history_events=history,
+    )
+    described = "full order" if projector.fields == FULL_ORDER else ", ".join(projector.fields)
+    print(f"{source}\nprojection: {described} (last {history} history events)\n")
+
+    encoders = {
+        "before": lambda order: json.dumps(order, indent=2),
+        "compact": lambda order: json.dumps(order, ensure_ascii=False, separators=(",", ":")),
+        "projected": projector.serialize,
+    }
+    results = {}
+    print(f"{'payload':>10} {'avg bytes':>10} {'p99 bytes':>10} {'avg tokens':>11} {'p99 tokens':>11}")
+    for name, encode in encoders.items():
+        sizes = []
+        tokens = []
+        for order in orders:
+            text = encode(order)
+            sizes.append(len(text.encode("utf-8")))
+            tokens.append(estimate_tokens(text))
+        results[name] = (sum(sizes) / len(sizes), sum(tokens) / len(tokens))
+        print(f"{name:>10} {results[name][0]:>10.0f} {percentile(sizes, 99):>10} "
+              f"{results[name][1]:>11.0f} {percentile(tokens, 99):>11}")
+
+    before_bytes, before_tokens = results["before"]
+    after_bytes, after_tokens = results["projected"]
+    print(f"\nprojected vs before: {1 - after_bytes / before_bytes:.0%} fewer bytes, "
+          f"{1 - after_tokens / before_tokens:.0%} fewer tokens per get_order_info result")
+
+    # Repeat lookups of the same record are served from the projection cache
+    order = orders[0]
+    start = time.perf_counter()
+    for _ in range(10000):
+        projector.serialize(order)
+    cached_us = (time.perf_counter() - start) / 10000 * 1e6
+    start = time.perf_counter()
+    for _ in range(1000):
+        json.dumps(order, indent=2)
+    before_us = (time.perf_counter() - start) / 1000 * 1e6
+    print(f"serialize one order: {before_us:.1f} us before, {cached_us:.2f} us projected (cached)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Measure this many synthetic orders instead of the orders file")
+    parser.add_argument("--fields", default=None, help="Projection fields (default: ORDER_PROJECTION_FIELDS)")
+    parser.add_argument("--history", type=int, default=3, help="History events kept in the projection")
+    args = parser.parse_args()
+    run(args.synthetic, args.fields, args.history)
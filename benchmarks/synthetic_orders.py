@@ -0,0 +1,154 @@
+import random
+from datetime import datetime, timedelta
+
+# ============================================
+# SYNTHETIC ORDER GENERATOR
+# ============================================
+# Produces orders in the same schema as data/orders.json so the lookup path
+# can be measured at realistic catalog sizes.
+
+_BASE_DATE = datetime(2025, 1, 1, 9, 0)
+_ORDERS_PER_DAY = 9000
+_IST = "+05:30"
+
+_PRODUCTS = [
+    ("TSHIRT-BL-XL", "Men's Cotton T-Shirt (Black, XL)", 599.00),
+    ("WIRELESS-EARBUDS-01", "Wireless Earbuds Model A1", 1499.00),
+    ("SHOE-RUN-09", "Running Shoes (Size 9)", 2499.00),
+    ("BOTTLE-STEEL-1L", "Steel Water Bottle 1L", 449.00),
+    ("BACKPACK-GR-30", "Laptop Backpack 30L (Grey)", 1899.00),
+]
+_CITIES = [
+    ("Gurgaon", "Haryana", "122001"),
+    ("Mumbai", "Maharashtra", "400001"),
+    ("Bengaluru", "Karnataka", "560001"),
+    ("Chennai", "Tamil Nadu", "600001"),
+]
+_STATUSES = ["Order Confirmed", "Packed", "Shipped", "In Transit", "Out for Delivery", "Delivered"]
+_NOTES = {
+    "Order Confirmed": "Payment received and order confirmed by seller",
+    "Packed": "Warehouse packed the items",
+    "Shipped": "Handover to courier - AWB created",
+    "In Transit": "Arrived at sorting center",
+    "Out for Delivery": "Out for delivery with courier partner",
+    "Delivered": "Delivered to customer",
+}
+_SUPPORT = {
+    "refundPolicySummary": "Return within 7 days of delivery for eligible items. Refund processed after inspection within 5 working days.",
+    "sellerContact": {
+        "phone": "+91-11-40001234",
+        "email": "support@shop-example.com",
+        "hours": "Mon-Sat 09:00-18:00 IST",
+    },
+}
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S") + _IST
+
+
+def order_number_for(index):
+    """Order number for the index-th synthetic order (VN-YYYYMMDD-NNNN style)"""
+    day = _BASE_DATE + timedelta(days=index // _ORDERS_PER_DAY)
+    return f"VN-{day.strftime('%Y%m%d')}-{1000 + index % _ORDERS_PER_DAY}"
+
+
+def phone_for(index, phones):
+    """Customer phone for the index-th synthetic order, drawn from a pool of `phones` numbers"""
+    return f"9{(index % phones) * 7919 % 10**9:09d}"
+
+
+def make_order(index, phones, rng):
+    """Build one order dictionary in the orders.json schema"""
+    created = _BASE_DATE + timedelta(days=index // _ORDERS_PER_DAY, minutes=index % _ORDERS_PER_DAY)
+    order_number = order_number_for(index)
+    city, state, postal = _CITIES[index % len(_CITIES)]
+    products = rng.sample(_PRODUCTS, rng.randint(1, 3))
+    items = [
+        {"sku": sku, "name": name, "quantity": 1, "unitPrice": price, "currency": "INR"}
+        for sku, name, price in products
+    ]
+    total = sum(item["unitPrice"] for item in items)
+    stage = rng.randint(0, len(_STATUSES) - 1)
+    history = [
+        {
+            "timestamp": _iso(created + timedelta(hours=6 * (step + 1))),
+            "status": status,
+            "note": _NOTES[status],
+        }
+        for step, status in enumerate(_STATUSES[:stage + 1])
+    ]
+    tracking = f"FSIN{index:010d}"
+    return {
+        "orderNumber": order_number,
+        "orderDate": _iso(created),
+        "customer": {
+            "name": f"Customer {index}",
+            "email": f"customer{index}@example.com",
+            "phone": phone_for(index, phones),
+        },
+        "items": items,
+        "payment": {
+            "method": "UPI" if index % 2 else "Card",
+            "transactionId": f"TXN-{index:09d}",
+            "amountPaid": total,
+            "currency": "INR",
+            "status": "Paid",
+        },
+        "shipping": {
+            "address": {
+                "line1": f"{index % 500 + 1} MG Road",
+                "line2": "Near City Mall",
+                "city": city,
+                "state": state,
+                "postalCode": postal,
+                "country": "India",
+            },
+            "carrier": "FastShip Courier",
+            "trackingNumber": tracking,
+            "trackingUrl": f"https://fastship.example/track/{tracking}",
+            "status": _STATUSES[stage],
+            "currentLocation": f"{city} Sorting Center",
+            "lastUpdated": history[-1]["timestamp"],
+            "estimatedDelivery": _iso(created + timedelta(days=7)),
+            "delayReason": "Regional flooding due to heavy rainfall" if index % 10 == 0 else None,
+            "deliveryInstructions": "Leave with security if recipient unavailable",
+            "priority_update_requested": False,
+        },
+        "history": history,
+        "support": _SUPPORT,
+    }
+
+
+def make_slim_order(index, phones):
+    """Build an order with only the fields the lookup indexes read"""
+    created = _BASE_DATE + timedelta(days=index // _ORDERS_PER_DAY, minutes=index % _ORDERS_PER_DAY)
+    return {
+        "orderNumber": order_number_for(index),
+        "orderDate": _iso(created),
+        "customer": {"phone": phone_for(index, phones)},
+    }
+
+
+def iter_orders(count, phones=None, seed=0, slim=False):
+    """
+    Yield (order_number, order) pairs for `count` synthetic orders.
+
+    Args:
+        count: Number of orders to generate
+        phones: Size of the customer phone pool (defaults to count // 2 so
+            many customers have more than one order)
+        seed: Random seed for reproducible catalogs
+        slim: If True, only generate the fields lookups index on; keeps
+            million-order catalogs within a laptop's memory
+    """
+    rng = random.Random(seed)
+    phones = phones or max(1, count // 2)
+    for index in range(count):
+        order = make_slim_order(index, phones) if slim else make_order(index, phones, rng)
+        yield order["orderNumber"], order
+
+
+def generate_orders(count, phones=None, seed=0, slim=False):
+    """Return a dictionary of `count` synthetic orders keyed by order number"""
+    return dict(iter_orders(count, phones=phones, seed=seed, slim=slim))
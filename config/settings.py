@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment
@@ -9,4 +10,64 @@ LIVEKIT_URL = os.getenv("LIVEKIT_URL", "wss://your-livekit-url")
 LIVEKIT_KEY = os.getenv("LIVEKIT_API_KEY")
 LIVEKIT_SECRET = os.getenv("LIVEKIT_API_SECRET")
 BACKEND_API_URL = os.getenv("BACKEND_API_URL", "http://localhost:8000")
+# How the agent creates transfers: "direct" (backend code in this process), "http" (BACKEND_API_URL) or "auto"
+TRANSFER_CLIENT = os.getenv("TRANSFER_CLIENT", "auto").lower()
 
+# Orders database (defaults to data/orders.json in the project root)
+ORDERS_FILE = os.getenv("ORDERS_FILE")
+# Order lookup backend: "json" (orders.json in memory), "sqlite" (compiled ORDERS_DB) or "firestore"
+ORDERS_BACKEND = os.getenv("ORDERS_BACKEND", "json").lower()
+ORDERS_DB = os.getenv("ORDERS_DB")
+# Pick up edits to the orders file without a restart (checked at most every N seconds)
+ORDERS_HOT_RELOAD = os.getenv("ORDERS_HOT_RELOAD", "true").lower() == "true"
+ORDERS_RELOAD_CHECK_INTERVAL = float(os.getenv("ORDERS_RELOAD_CHECK_INTERVAL", "5"))
+# Order files at least this large are indexed by byte offset and decoded per order on lookup
+ORDERS_LAZY_LOAD_MIN_MB = float(os.getenv("ORDERS_LAZY_LOAD_MIN_MB", "64"))
+ORDERS_LAZY_CACHE_SIZE = int(os.getenv("ORDERS_LAZY_CACHE_SIZE", "1024"))
+# Order lookups run on a bounded thread pool, off the agent's event loop
+ORDER_LOOKUP_TIMEOUT = float(os.getenv("ORDER_LOOKUP_TIMEOUT", "3"))
+ORDER_LOOKUP_WORKERS = int(os.getenv("ORDER_LOOKUP_WORKERS", "4"))
+# Match misheard order numbers within this edit distance against the caller's own orders (0 disables)
+ORDER_FUZZY_MAX_DISTANCE = int(os.getenv("ORDER_FUZZY_MAX_DISTANCE", "2"))
+# Firestore order lookups are cached per process (seconds; misses are cached for the shorter TTL)
+FIRESTORE_CACHE_SIZE = int(os.getenv("FIRESTORE_CACHE_SIZE", "2048"))
+FIRESTORE_CACHE_TTL = float(os.getenv("FIRESTORE_CACHE_TTL", "300"))
+FIRESTORE_NEGATIVE_CACHE_TTL = float(os.getenv("FIRESTORE_NEGATIVE_CACHE_TTL", "30"))
+# Order fields returned to the model (comma-separated, or "full" for the whole order record)
+ORDER_PROJECTION_FIELDS = os.getenv(
+    "ORDER_PROJECTION_FIELDS",
+    "order_number,customer_name,status,location,eta,delay_reason,items,payment_status,amount_paid,history",
+)
+# Most recent order history events included in the projection
+ORDER_HISTORY_EVENTS = int(os.getenv("ORDER_HISTORY_EVENTS", "3"))
+# Completed transfers kept in memory (count and seconds); evicted ones are appended to the archive file if set
+TRANSFER_RETENTION_COUNT = int(os.getenv("TRANSFER_RETENTION_COUNT", "1000"))
+TRANSFER_RETENTION_SECONDS = float(os.getenv("TRANSFER_RETENTION_SECONDS", "3600"))
+TRANSFERS_ARCHIVE_FILE = os.getenv("TRANSFERS_ARCHIVE_FILE")
+# Transfer state: "memory" (single backend worker) or "sqlite" (TRANSFER_STORE_DB, shared by BACKEND_WORKERS processes)
+TRANSFER_STORE = os.getenv("TRANSFER_STORE", "memory").lower()
+TRANSFER_STORE_DB = os.getenv("TRANSFER_STORE_DB")
+BACKEND_WORKERS = int(os.getenv("BACKEND_WORKERS", "1"))
+# Ports probed by `python main.py supervise`: backend /readyz and the LiveKit worker's health server
+BACKEND_PORT = int(os.getenv("BACKEND_PORT", "8000"))
+AGENT_HEALTH_PORT = int(os.getenv("AGENT_HEALTH_PORT", "8081"))
+# Longest delay (seconds) before the supervisor restarts a service that keeps failing
+SUPERVISOR_BACKOFF_MAX = float(os.getenv("SUPERVISOR_BACKOFF_MAX", "30"))
+# Seconds the agent worker lets active calls finish after SIGTERM; the supervisor waits this long before SIGKILL
+AGENT_DRAIN_TIMEOUT = int(os.getenv("AGENT_DRAIN_TIMEOUT", "1800"))
+# Unix sockets the backend uses to signal call jobs by room name, and seconds to wait for a job's acknowledgement
+CONTROL_SOCKET_DIR = os.getenv("CONTROL_SOCKET_DIR", os.path.join(tempfile.gettempdir(), "call-center-control"))
+CONTROL_TIMEOUT = float(os.getenv("CONTROL_TIMEOUT", "2"))
+# JSON-lines file call setup traces are appended to (optional; every job process appends to it)
+CALL_TRACE_FILE = os.getenv("CALL_TRACE_FILE")
+# JSON-lines file each job process appends its per-tool call summary to when a call ends (optional)
+TOOL_STATS_FILE = os.getenv("TOOL_STATS_FILE")
+# Agent dashboard WebSockets: events queued per connection and seconds per send before a slow dashboard is disconnected
+AGENT_WS_QUEUE_SIZE = int(os.getenv("AGENT_WS_QUEUE_SIZE", "64"))
+AGENT_WS_SEND_TIMEOUT = float(os.getenv("AGENT_WS_SEND_TIMEOUT", "5"))
+# Transfer changes kept for dashboards resuming from a sequence number; further behind gets a snapshot
+AGENT_SYNC_LOG_SIZE = int(os.getenv("AGENT_SYNC_LOG_SIZE", "1000"))
+# How transfers reach human agents: "longest_idle" or "round_robin" (offered to one idle agent at a time), or "broadcast"
+DISPATCH_MODE = os.getenv("DISPATCH_MODE", "longest_idle").lower()
+# Seconds an agent has to accept an offered transfer before it moves to the next agent
+DISPATCH_OFFER_TIMEOUT = float(os.getenv("DISPATCH_OFFER_TIMEOUT", "15"))
@@ -1,11 +1,20 @@
+import asyncio
+import atexit
+import subprocess
+import sys
 import time
+import urllib.request
 from threading import Thread
 import uvicorn
 from src.utils.logger import logger
 from src.api.app import app
 from src.agents.entrypoint import entrypoint
+from src.agents.prewarm import prewarm
 from livekit.agents import cli, WorkerOptions
-from config.settings import LIVEKIT_URL
+from config.settings import (
+    LIVEKIT_URL, BACKEND_WORKERS, TRANSFER_STORE, BACKEND_PORT, AGENT_HEALTH_PORT, SUPERVISOR_BACKOFF_MAX,
+    AGENT_DRAIN_TIMEOUT,
+)
 
 # Initialize Firebase (if credentials exist)
 try:
@@ -17,29 +26,124 @@ except ImportError:
 # ============================================
 # STARTUP FUNCTIONS
 # ============================================
+# Seconds on top of the agent's drain timeout for its job processes to shut
+# down (LiveKit's shutdown_process_timeout) before the supervisor kills it
+_AGENT_SHUTDOWN_GRACE = 60
+
+
+def _backend_workers():
+    workers = BACKEND_WORKERS
+    if workers > 1 and TRANSFER_STORE == "memory":
+        logger.warning("BACKEND_WORKERS > 1 needs a shared transfer store (TRANSFER_STORE=sqlite); using 1 worker")
+        workers = 1
+    return workers
+
+
+def _backend_command(workers):
+    return [
+        sys.executable, "-m", "uvicorn", "src.api.app:app",
+        "--host", "0.0.0.0", "--port", str(BACKEND_PORT),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+
+
 def start_backend_server():
     """Start FastAPI backend server"""
     logger.info("\n🚀 Starting Backend Server...")
-    logger.info(f"   URL: http://localhost:8000")
-    logger.info(f"   WebSocket: ws://localhost:8000/ws/agent")
+    logger.info(f"   URL: http://localhost:{BACKEND_PORT}")
+    logger.info(f"   WebSocket: ws://localhost:{BACKEND_PORT}/ws/agent")
+    
+    workers = _backend_workers()
+    if workers == 1:
+        uvicorn.run(app, host="0.0.0.0", port=BACKEND_PORT, log_level="warning")
+        return
+    
+    # uvicorn's worker supervisor needs its own main thread, so run it as a child process
+    logger.info(f"   Workers: {workers}")
+    server = subprocess.Popen(_backend_command(workers))
+    atexit.register(server.terminate)
+    server.wait()
+
+
+def wait_for_backend(timeout=30.0):
+    """
+    Block until the backend answers /readyz.
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="warning")
+    Returns:
+        True once ready, False after timeout seconds
+    """
+    url = f"http://127.0.0.1:{BACKEND_PORT}/readyz"
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    return False
 
 
-def start_ai_agent():
+def start_ai_agent(port=None):
     """Start LiveKit AI agent"""
     logger.info("\n🤖 Starting AI Agent with Gemini Realtime...")
     logger.info(f"   LiveKit URL: {LIVEKIT_URL}")
     logger.info(f"   Model: Gemini 2.0 Flash (Realtime)")
     logger.info(f"   Voice: Puck")
     
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
+    options = WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm, drain_timeout=AGENT_DRAIN_TIMEOUT)
+    if port is not None:
+        # Health server ("/" answers 200 once the worker is up), probed by the supervisor
+        options.port = port
+    cli.run_app(options)
+
+
+def supervise(agent_args):
+    """Run the backend and the agent worker as separate supervised processes"""
+    from src.utils.supervisor import SupervisedProcess, Supervisor
+    
+    workers = _backend_workers()
+    logger.info(f"   Backend: http://localhost:{BACKEND_PORT} ({workers} worker(s))")
+    logger.info(f"   Agent health: http://localhost:{AGENT_HEALTH_PORT}/")
+    backend = SupervisedProcess(
+        "backend", _backend_command(workers),
+        ready_url=f"http://127.0.0.1:{BACKEND_PORT}/readyz",
+        live_url=f"http://127.0.0.1:{BACKEND_PORT}/healthz",
+        backoff_max=SUPERVISOR_BACKOFF_MAX,
+    )
+    agent = SupervisedProcess(
+        "agent", [sys.executable, __file__, "agent", *agent_args],
+        ready_url=f"http://127.0.0.1:{AGENT_HEALTH_PORT}/",
+        backoff_max=SUPERVISOR_BACKOFF_MAX,
+        # SIGTERM starts a drain: calls in progress run to the end first
+        stop_timeout=AGENT_DRAIN_TIMEOUT + _AGENT_SHUTDOWN_GRACE,
+    )
+    asyncio.run(Supervisor([backend, agent]).run())
 
 
 # ============================================
 # MAIN ENTRY POINT
 # ============================================
+# python main.py [dev|start|...]          backend thread + agent in one process
+# python main.py supervise [dev|start]    backend and agent as supervised processes
+# python main.py backend                  backend only
+# python main.py agent [dev|start|...]    agent worker only
 if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    
+    if command == "backend":
+        start_backend_server()
+        sys.exit(0)
+    
+    if command == "agent":
+        # LiveKit's CLI parses the remaining arguments
+        del sys.argv[1]
+        start_ai_agent(port=AGENT_HEALTH_PORT)
+        sys.exit(0)
+    
     logger.info("\n" + "="*60)
     logger.info("🏢 AI CALL CENTER - STARTING ALL SERVICES")
     logger.info("="*60)
@@ -49,13 +153,17 @@ if __name__ == "__main__":
     logger.info(f"   Transfer: Browser-based (Web Dashboard)")
     logger.info("="*60 + "\n")
     
+    if command == "supervise":
+        supervise(sys.argv[2:] or ["start"])
+        sys.exit(0)
+    
     # Start backend server in separate thread
     backend_thread = Thread(target=start_backend_server, daemon=True)
     backend_thread.start()
     
-    # Give backend time to start
-    time.sleep(2)
+    # Wait for the backend to answer instead of a fixed delay
+    if not wait_for_backend():
+        logger.error("Backend did not become ready; starting the agent anyway")
     
     # Start AI agent in main thread
     start_ai_agent()
-
@@ -1,6 +1,4 @@
 import asyncio
-import json
-import aiohttp
 import yaml
 from pathlib import Path
 from livekit import agents, rtc, api
@@ -8,14 +6,22 @@ from livekit.agents import Agent, RunContext, function_tool
 from livekit.agents import get_job_context
 from src.models.state import MyState
 from src.utils.logger import logger
-from src.utils.order_search import search_order
+from src.utils.order_search import normalize_phone
+from src.utils.order_repository import get_order_repository, OrderLookupError
+from src.utils.order_projection import serialize_order_for_model
 from src.utils.call_utils import hangup_call
-from config.settings import BACKEND_API_URL
-from src.api.app import get_active_sessions
+from src.agents.caller_prefetch import get_prefetched_order
+from src.agents.transfer_client import get_transfer_client
+from src.utils.tool_metrics import instrument_tool
 
 
-def load_instructions():
-    """Load agent instructions from YAML file"""
+# Parsed instructions, reused across calls in this process:
+# (path, (mtime_ns, size), instructions)
+_INSTRUCTIONS_CACHE = None
+
+
+def get_instructions_path():
+    """Get the path to the agent instructions YAML file"""
     # Get the project root directory (parent of src/)
     current_file = Path(__file__).resolve()
     project_root = current_file.parent.parent.parent
@@ -25,6 +31,13 @@ def load_instructions():
     if not instructions_path.exists():
         instructions_path = Path("instructions/agent_instructions.yml")
     
+    return instructions_path
+
+
+def load_instructions(instructions_path=None):
+    """Load agent instructions from YAML file"""
+    instructions_path = instructions_path or get_instructions_path()
+    
     if not instructions_path.exists():
         error_msg = f"Instructions file not found at: {instructions_path}"
         logger.error(error_msg)
@@ -56,14 +69,53 @@ def load_instructions():
         raise
 
 
+def get_instructions():
+    """
+    Get the agent instructions, parsing the YAML file only when it changed.
+    
+    The file is stat()ed on every call (microseconds) and re-parsed only if
+    its mtime or size differ from the cached copy. If an edited file fails
+    to parse, the previous instructions keep being served.
+    
+    Returns:
+        Instructions string
+    """
+    global _INSTRUCTIONS_CACHE
+    cached = _INSTRUCTIONS_CACHE
+    instructions_path = cached[0] if cached else get_instructions_path()
+    
+    try:
+        stat = instructions_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+    
+    if cached and signature == cached[1]:
+        return cached[2]
+    
+    try:
+        instructions = load_instructions(instructions_path)
+    except Exception:
+        if cached:
+            logger.error(f"Keeping previously loaded instructions; fix {instructions_path}")
+            # Don't re-parse the broken file on every call; retry on its next change
+            _INSTRUCTIONS_CACHE = (instructions_path, signature, cached[2])
+            return cached[2]
+        raise
+    
+    _INSTRUCTIONS_CACHE = (instructions_path, signature, instructions)
+    return instructions
+
+
 class Assistant(Agent):
     def __init__(self, room_name: str):
-        instructions = load_instructions()
+        instructions = get_instructions()
         super().__init__(instructions=instructions)
         self.room_name = room_name
 
     
     @function_tool
+    @instrument_tool
     async def get_order_info(self, ctx: RunContext, order_number: str = None, phone: str = None) -> str:
         """
         Fetch complete order information from database.
@@ -73,19 +125,29 @@ class Assistant(Agent):
         
         # Normalize phone
         if phone:
-            phone = phone.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
-            if phone.startswith("+91"):
-                phone = phone[3:]
-            elif phone.startswith("91") and len(phone) == 12:
-                phone = phone[2:]
+            phone = normalize_phone(phone)
             state.customer_phone = phone
         
         if order_number:
             state.customer_order_number = order_number
         
-        # Search database
+        # Usually already looked up from the caller ID while the call started
+        order_data = await get_prefetched_order(state, order_number=order_number, phone=phone)
+        if order_data:
+            state.order_data = order_data
+            return serialize_order_for_model(order_data)
+        
+        # Search database (off the event loop, bounded by ORDER_LOOKUP_TIMEOUT)
         logger.info(f"🔍 Searching - Order: {order_number}, Phone: {phone}")
-        order_data = search_order(order_number=order_number, phone=phone)
+        try:
+            order_data = await get_order_repository().find_order(order_number=order_number, phone=phone)
+        except OrderLookupError:
+            return "Our order system is responding slowly right now. Please apologize to the customer and offer to try again in a moment."
+        
+        if not order_data and order_number:
+            # Speech recognition often drops dashes or swaps digits; offer the
+            # closest order numbers instead of asking the caller to repeat it
+            return await self._suggest_order_candidates(state, order_number)
         
         if not order_data:
             return "Order not found. Please check your order number or phone number and try again."
@@ -93,45 +155,49 @@ class Assistant(Agent):
         # Store in state
         state.order_data = order_data
         
-        # Return complete order info as JSON string for agent to use
-        return json.dumps(order_data, indent=2)
+        # Return the order summary as compact JSON for the agent to use
+        return serialize_order_for_model(order_data)
 
-    # @function_tool
-    # async def get_order_info(self, ctx: RunContext, order_number: str = None, phone: str = None) -> str:
-    #     """
-    #     Fetch complete order information from Firebase database.
-    #     Call this when user provides order number or phone number.
-    #     """
-    #     # Note: When uncommenting this, also uncomment and import:
-    #     # from src.utils.firebase import search_order_from_firebase
-    #     state: MyState = ctx.session.userdata
+    async def _suggest_order_candidates(self, state: MyState, order_number: str) -> str:
+        """Answer a missed order number lookup with the closest matches placed from the caller's phone"""
+        not_found = "Order not found. Please check your order number or phone number and try again."
+        phone = state.customer_phone or normalize_phone(state.caller_phone)
+        repository = get_order_repository()
+        candidates = await repository.find_candidates(order_number, phone)
+        if not candidates:
+            return not_found
         
-    #     # Normalize phone
-    #     if phone:
-    #         phone = phone.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
-    #         if phone.startswith("+91"):
-    #             phone = phone[3:]
-    #         elif phone.startswith("91") and len(phone) == 12:
-    #             phone = phone[2:]
-    #         state.customer_phone = phone
+        best_number, best_distance = candidates[0]
+        ties = [number for number, distance in candidates if distance == best_distance]
+        if len(ties) > 1:
+            logger.info(f"🔎 Fuzzy order match for {order_number}: {ties}")
+            options = ", ".join(ties)
+            return (
+                f"No exact match for order number {order_number}. Closest order numbers on file: {options}. "
+                "Read these back to the customer and ask which one is theirs, then look it up."
+            )
         
-    #     if order_number:
-    #         state.customer_order_number = order_number
-        
-    #     # Search Firebase database
-    #     logger.info(f"🔍 Searching Firebase - Order: {order_number}, Phone: {phone}")
-    #     order_data = await search_order_from_firebase(order_number=order_number, phone=phone)
-        
-    #     if not order_data:
-    #         return "Order not found in our system. Please check your order number or phone number and try again."
+        try:
+            order_data = await repository.find_order(order_number=best_number)
+        except OrderLookupError:
+            return not_found
+        if not order_data:
+            return not_found
         
-    #     # Store in state
-    #     state.order_data = order_data
+        logger.info(f"🔎 Fuzzy order match: {order_number} -> {best_number} (distance {best_distance})")
+        if best_distance == 0:
+            state.customer_order_number = best_number
+            state.order_data = order_data
+            return serialize_order_for_model(order_data)
         
-    #     # Return complete order info as JSON string for agent to use
-    #     return json.dumps(order_data, indent=2)
+        return (
+            f"No exact match for order number {order_number}, but {best_number} is very close. "
+            f"Confirm with the customer that their order number is {best_number} before sharing any details. "
+            f"If they confirm, use this order information:\n{serialize_order_for_model(order_data)}"
+        )
 
     @function_tool
+    @instrument_tool
     async def transfer_to_human(self, ctx: RunContext, reason: str = "Customer request") -> str:
         """
         Transfer call to human agent via browser (web-based transfer)
@@ -149,21 +215,11 @@ class Assistant(Agent):
             job_ctx = get_job_context()
             room_name = job_ctx.room.name
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{BACKEND_API_URL}/api/create-transfer",
-                    params={"room_name": room_name, "reason": reason}
-                ) as response:
-                    data = await response.json()
-                    if data.get("success"):
-                        transfer_id = data['transfer']['id']
-                        logger.info(f"✅ Browser transfer created: {transfer_id}")
-                        
-                        state.should_disconnect = True
-                        
-                        return "I'm transferring you to our support specialist now. Please hold for just a moment while they join the call..."
-                    else:
-                        raise Exception("Failed to create transfer")
+            # In-process when the backend shares this process's state, pooled HTTP otherwise
+            transfer = await get_transfer_client().create_transfer(room_name, reason)
+            logger.info(f"✅ Browser transfer created: {transfer['id']}")
+            
+            return "I'm transferring you to our support specialist now. Please hold for just a moment while they join the call..."
                         
         except Exception as e:
             logger.error(f"Browser transfer failed: {e}")
@@ -216,6 +272,7 @@ class Assistant(Agent):
 
 
     @function_tool
+    @instrument_tool
     async def end_call(self, ctx: RunContext) -> str:
         """
         End the call gracefully.
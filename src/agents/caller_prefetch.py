@@ -0,0 +1,146 @@
+import asyncio
+import time
+from livekit import rtc
+from livekit.agents import JobContext
+from src.models.state import MyState
+from src.utils.logger import logger
+from src.utils.fuzzy_match import normalize_order_number
+from src.utils.order_search import normalize_phone
+from src.utils.order_repository import get_order_repository, OrderLookupError
+
+# ============================================
+# CALLER ID ORDER PREFETCH
+# ============================================
+# The SIP participant's phone number is known as soon as they join, well
+# before the model has asked for and transcribed an order or phone number.
+# The caller's latest order is looked up by caller ID while the session
+# starts, so get_order_info can usually answer from the call state.
+
+# Process-wide outcome counts for get_order_info calls
+_PREFETCH_STATS = {"hits": 0, "misses": 0, "no_prefetch": 0, "prefetched": 0, "prefetch_failed": 0}
+
+
+def start_caller_prefetch(ctx: JobContext, state: MyState, repository_ready=None) -> asyncio.Task:
+    """
+    Start looking up the caller's order by SIP caller ID; the task is kept on state.order_prefetch.
+
+    Args:
+        ctx: Job context
+        state: Call state
+        repository_ready: Optional awaitable for the OrderRepository (e.g. a prewarm
+            step still loading); defaults to get_order_repository()
+    """
+    state.order_prefetch = asyncio.create_task(
+        _prefetch_caller_order(ctx, state, repository_ready), name="caller-order-prefetch"
+    )
+    return state.order_prefetch
+
+
+async def _prefetch_caller_order(ctx: JobContext, state: MyState, repository_ready=None):
+    try:
+        repository = await repository_ready if repository_ready is not None else get_order_repository()
+        # Idempotent; session.start() connects the room too
+        await ctx.connect()
+        participant = await ctx.wait_for_participant(kind=rtc.ParticipantKind.PARTICIPANT_KIND_SIP)
+    except Exception as e:
+        logger.warning(f"Caller ID order prefetch skipped: {e}")
+        return None
+    caller_id = participant.attributes.get("sip.phoneNumber")
+    if not caller_id:
+        logger.info("📇 No caller ID on SIP participant; skipping order prefetch")
+        return None
+
+    phone = normalize_phone(caller_id)
+    state.caller_phone = phone
+    if not state.customer_phone:
+        state.customer_phone = phone
+
+    start = time.perf_counter()
+    try:
+        order_data = await repository.find_order(phone=phone)
+    except OrderLookupError:
+        _PREFETCH_STATS["prefetch_failed"] += 1
+        return None
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not order_data:
+        logger.info(f"📇 No order on file for caller {phone} ({elapsed_ms:.0f}ms)")
+        return None
+
+    _PREFETCH_STATS["prefetched"] += 1
+    state.prefetched_order = order_data
+    # Don't overwrite an order the model already looked up
+    if state.order_data is None:
+        state.order_data = order_data
+    logger.info(f"📇 Prefetched order {order_data.get('orderNumber')} for caller {phone} ({elapsed_ms:.0f}ms)")
+    return order_data
+
+
+async def get_prefetched_order(state: MyState, order_number: str = None, phone: str = None, timeout: float = 1.0):
+    """
+    The caller ID's prefetched order if it answers this lookup, else None.
+
+    Waits up to `timeout` seconds for a caller ID lookup that is still in
+    flight. Every call is counted towards the prefetch hit rate. Only the
+    prefetched order is matched, never an order the model looked up since.
+
+    Args:
+        state: Call state
+        order_number: Order number the caller gave, if any
+        phone: Normalized phone number the caller gave, if any
+        timeout: Longest wait for an unfinished prefetch
+
+    Returns:
+        Order data dictionary, or None if the caller asked about a different order
+    """
+    prefetch = state.order_prefetch
+    if prefetch is not None and not prefetch.done() and state.caller_phone:
+        # The caller ID is known and its lookup is in flight: waiting for it
+        # is cheaper than starting a second lookup
+        await asyncio.wait({prefetch}, timeout=timeout)
+
+    order_data = state.prefetched_order
+    if order_data is None:
+        # No caller ID, nothing on file for it, or the lookup is still running
+        _record("no_prefetch", order_number or phone)
+        return None
+
+    if _matches(order_data, state, order_number, phone):
+        _record("hits", order_number or phone)
+        return order_data
+
+    _record("misses", order_number or phone)
+    return None
+
+
+def _matches(order_data, state, order_number, phone):
+    if order_number:
+        return normalize_order_number(order_number) == normalize_order_number(order_data.get("orderNumber"))
+    if phone:
+        # order_data is the caller ID's latest order, so the caller ID itself matches too
+        on_file = normalize_phone(order_data.get("customer", {}).get("phone"))
+        return phone in (on_file, state.caller_phone)
+    # No identifier given: the caller means their own order
+    return True
+
+
+_OUTCOME_LABELS = {"hits": "hit", "misses": "miss", "no_prefetch": "nothing prefetched"}
+
+
+def _record(outcome, asked_for=None):
+    _PREFETCH_STATS[outcome] += 1
+    stats = get_prefetch_stats()
+    logger.info(
+        f"📊 Caller prefetch {_OUTCOME_LABELS[outcome]} for {asked_for or 'caller'} | "
+        f"hit rate {stats['hit_rate']:.0%} over {stats['lookups']} lookups"
+    )
+
+
+def get_prefetch_stats():
+    """Prefetch counters for this process, with hit rate over all get_order_info calls"""
+    lookups = _PREFETCH_STATS["hits"] + _PREFETCH_STATS["misses"] + _PREFETCH_STATS["no_prefetch"]
+    return {
+        **_PREFETCH_STATS,
+        "lookups": lookups,
+        "hit_rate": _PREFETCH_STATS["hits"] / lookups if lookups else 0.0,
+    }
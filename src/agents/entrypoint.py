@@ -1,12 +1,17 @@
 import asyncio
+import json
+import time
 from datetime import datetime
 from livekit import agents, rtc
-from livekit.agents import AgentSession, RoomInputOptions, JobContext
-from livekit.plugins import google as google_livekit, noise_cancellation
+from livekit.agents import AgentSession, RoomInputOptions, JobContext, CloseEvent, AgentStateChangedEvent
 from src.agents.assistant import Assistant
+from src.agents.prewarm import get_prewarmed
+from src.agents.caller_prefetch import start_caller_prefetch
 from src.models.state import MyState
 from src.utils.logger import logger
-from src.api.app import get_active_sessions
+from src.utils.control_bus import ControlServer
+from src.utils.tracing import CallTrace, export_trace_stats
+from src.utils.tool_metrics import pop_session_tool_stats, export_tool_stats
 
 
 # ============================================
@@ -15,8 +20,16 @@ from src.api.app import get_active_sessions
 async def entrypoint(ctx: JobContext):
     session_id = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{ctx.room.name}"
     room_name = ctx.room.name
+    trace = CallTrace(session_id, room_name)
     
-    await asyncio.sleep(0.5)
+    # Dispatch: the room was created for the call, then this job was assigned and started
+    room = ctx.job.room
+    created_ms = room.creation_time_ms or room.creation_time * 1000
+    if created_ms:
+        trace.record("job_accept", max(0.0, trace.started_at - created_ms / 1000))
+    
+    # Connect while the rest of the call is built; session.start() waits for it
+    room_connect = asyncio.create_task(trace.timed("room_connect", ctx.connect()))
     
     logger.info(f"\n{'='*60}")
     logger.info(f"🎯 NEW CALL - GEMINI REALTIME")
@@ -25,27 +38,56 @@ async def entrypoint(ctx: JobContext):
     logger.info(f"   Time: {datetime.now().strftime('%H:%M:%S')}")
     logger.info(f"{'='*60}\n")
     
-    assistant = Assistant(room_name)
+    with trace.span("instruction_load"):
+        assistant = Assistant(room_name)
     state = MyState(session_id)
     
-    # Store in active sessions
-    active_sessions = get_active_sessions()
-    active_sessions[room_name] = state
-    
+    # Built once per process by prewarm
     session = AgentSession(
-        llm=google_livekit.realtime.RealtimeModel(
-            model="gemini-2.0-flash-exp",
-            voice="Puck",
-            temperature=0.7,
-        ),
+        llm=await get_prewarmed(ctx.proc, "llm"),
         userdata=state
     )
+    
+    async def on_control(message):
+        if message.get("command") == "disconnect":
+            logger.info(f"🚪 Transfer accepted by {message.get('agent_name')}; AI leaving {room_name}")
+            state.human_joined.set()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown command: {message.get('command')}"}
+    
+    # The backend signals this job by room name when a human accepts the transfer
+    control = ControlServer(room_name, on_control)
+    await control.start()
+    ctx.add_shutdown_callback(control.stop)
+    
+    @session.on("close")
+    def on_session_close(event: CloseEvent):
+        state.end(event.error)
+    
+    session_ready = None
+    
+    @session.on("agent_state_changed")
+    def on_agent_state_changed(event: AgentStateChangedEvent):
+        if event.new_state == "speaking" and not trace.finished:
+            # Includes the realtime model's connection, which runs in the background
+            if session_ready is not None:
+                trace.record("first_speech", time.perf_counter() - session_ready)
+            trace.mark("total")
+            trace.finish()
 
-    await session.start(
-        room=ctx.room,
-        agent=assistant,
-        room_input_options=RoomInputOptions(noise_cancellation=noise_cancellation.BVC())
-    )
+    # Look up the caller's order by caller ID while the session starts, once
+    # the orders prewarm step (which may still be loading) has finished
+    start_caller_prefetch(ctx, state, get_prewarmed(ctx.proc, "orders"))
+    
+    await room_connect
+    noise_cancellation = await get_prewarmed(ctx.proc, "noise_cancellation")
+    with trace.span("session_start"):
+        await session.start(
+            room=ctx.room,
+            agent=assistant,
+            room_input_options=RoomInputOptions(noise_cancellation=noise_cancellation)
+        )
+    session_ready = time.perf_counter()
 
     logger.info(f"✓ Session Started with Gemini Realtime: {session_id}")
     logger.info("🎤 AI is now listening and will greet automatically...")
@@ -54,23 +96,38 @@ async def entrypoint(ctx: JobContext):
     def on_participant_connected(participant: rtc.RemoteParticipant):
         if participant.identity.startswith("agent_"):
             logger.info(f"👤 Human agent joined via browser: {participant.identity}")
-            logger.info(f"🚪 AI Agent disconnecting to allow human conversation...")
-            
-            state.should_disconnect = True
-            asyncio.create_task(disconnect_ai_agent(ctx, session))
+            state.human_joined.set()
+    
+    async def hand_over():
+        await state.human_joined.wait()
+        logger.info(f"🚪 AI Agent disconnecting to allow human conversation...")
+        await disconnect_ai_agent(ctx, session)
+        state.end()
+    
+    hand_over_task = asyncio.create_task(hand_over(), name="hand-over")
     
+    # Woken only by lifecycle events: hand-over, session close or caller hang-up
     try:
-        while not state.should_disconnect:
-            await asyncio.sleep(1)
-        
-        logger.info(f"✅ AI Agent successfully disconnected from {room_name}")
-        
-    except Exception as e:
-        logger.error(f"Error in AI agent loop: {e}")
+        await state.ended.wait()
+        if state.error:
+            logger.error(f"AI session ended with error in {room_name}: {state.error}")
+        elif state.human_joined.is_set():
+            logger.info(f"✅ AI Agent successfully disconnected from {room_name}")
     finally:
-        active_sessions = get_active_sessions()
-        if room_name in active_sessions:
-            del active_sessions[room_name]
+        if state.human_joined.is_set():
+            # session.aclose() ends the session first; finish leaving the room
+            await hand_over_task
+        else:
+            hand_over_task.cancel()
+        if state.order_prefetch and not state.order_prefetch.done():
+            state.order_prefetch.cancel()
+        # Calls that ended before the AI spoke
+        trace.finish(incomplete=True)
+        export_trace_stats()
+        tool_stats = pop_session_tool_stats(session_id)
+        if tool_stats:
+            logger.info(f"🧰 Tool calls {session_id}: {json.dumps(tool_stats)}")
+        export_tool_stats()
         logger.info("✓ Session ended")
 
 
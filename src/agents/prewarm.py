@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from livekit.agents import JobProcess
+from livekit.plugins import google as google_livekit, noise_cancellation
+from src.agents.assistant import get_instructions
+from src.utils.logger import logger
+from src.utils.order_repository import get_order_repository
+
+# ============================================
+# WORKER PREWARM
+# ============================================
+# Runs once in every job process before it is handed a call. Everything a
+# call needs that can be shared across calls is built here and kept in
+# proc.userdata, so the first call in a process costs the same as the
+# next. The shared HTTP session needs the job's event loop, which doesn't
+# exist yet, so it is created on first use (see http_client).
+#
+# LiveKit kills a process whose prewarm runs longer than
+# initialize_process_timeout (10 s by default), and a cold orders load can
+# take far longer on a large catalog, so BACKGROUND_STEPS run on a thread
+# after prewarm returns and get_prewarmed() awaits them.
+
+
+def build_realtime_model():
+    """Gemini realtime model; a factory for per-call sessions, safe to share"""
+    return google_livekit.realtime.RealtimeModel(
+        model="gemini-2.0-flash-exp",
+        voice="Puck",
+        temperature=0.7,
+    )
+
+
+def build_noise_cancellation():
+    return noise_cancellation.BVC()
+
+
+def _prepare_orders():
+    repository = get_order_repository()
+    repository.prepare()
+    return repository
+
+
+# proc.userdata key -> builder, in run order
+PREWARM_STEPS = {
+    "llm": build_realtime_model,
+    "noise_cancellation": build_noise_cancellation,
+    "orders": _prepare_orders,
+    "instructions": get_instructions,
+}
+
+# Steps that may outlast initialize_process_timeout
+BACKGROUND_STEPS = {"orders"}
+
+
+def prewarm(proc: JobProcess):
+    """
+    Build per-process resources into proc.userdata before accepting jobs.
+
+    A failed step is logged and skipped; the entrypoint builds that resource
+    per call instead. BACKGROUND_STEPS are left running, their
+    concurrent.futures.Future in proc.userdata until get_prewarmed() resolves
+    it. Step timings are kept in proc.userdata["prewarm_timings"].
+    """
+    timings = {}
+    proc.userdata["prewarm_timings"] = timings
+    background = {}
+    for name, build in PREWARM_STEPS.items():
+        if name in BACKGROUND_STEPS:
+            background[name] = proc.userdata[name] = Future()
+            continue
+        start = time.perf_counter()
+        try:
+            proc.userdata[name] = build()
+        except Exception as e:
+            logger.error(f"Prewarm step '{name}' failed: {e}")
+        timings[name] = time.perf_counter() - start
+
+    summary = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items())
+    logger.info(f"🔥 Worker prewarmed in {sum(timings.values()) * 1000:.0f}ms ({summary})")
+    if background:
+        threading.Thread(
+            target=_run_background_steps, args=(background, timings), name="prewarm", daemon=True
+        ).start()
+
+
+def _run_background_steps(futures, timings):
+    for name, future in futures.items():
+        start = time.perf_counter()
+        try:
+            value = PREWARM_STEPS[name]()
+        except Exception as e:
+            timings[name] = time.perf_counter() - start
+            logger.error(f"Prewarm step '{name}' failed: {e}")
+            future.set_exception(e)
+            continue
+        timings[name] = time.perf_counter() - start
+        logger.info(f"🔥 Background prewarm step '{name}' done in {timings[name] * 1000:.0f}ms")
+        future.set_result(value)
+
+
+async def get_prewarmed(proc: JobProcess, name):
+    """
+    Resource built by prewarm, waiting for it if it is still building in the
+    background, or built now if prewarm didn't run or that step failed
+    """
+    value = proc.userdata.get(name) if proc is not None else None
+    if isinstance(value, Future):
+        try:
+            value = await asyncio.wrap_future(value)
+        except Exception:
+            value = None
+    if value is None:
+        if name in BACKGROUND_STEPS:
+            value = await asyncio.to_thread(PREWARM_STEPS[name])
+        else:
+            value = PREWARM_STEPS[name]()
+    if proc is not None:
+        proc.userdata[name] = value
+    return value
@@ -0,0 +1,107 @@
+import asyncio
+from abc import ABC, abstractmethod
+from src.utils.logger import logger
+from src.utils.http_client import get_http_session
+from config.settings import BACKEND_API_URL, TRANSFER_CLIENT
+
+# ============================================
+# TRANSFER CLIENT
+# ============================================
+# How the agent hands a call to the human-agent backend.
+#
+#   direct  calls the backend's create-transfer code in this process: no
+#           socket, HTTP parsing or JSON round-trip. Only correct when this
+#           process sees the backend's state, i.e. the backend is serving in
+#           this process (the call is run on the backend's own event loop) or
+#           transfers are in the shared SQLite store (TRANSFER_STORE=sqlite).
+#   http    POSTs to BACKEND_API_URL over the process's shared keep-alive
+#           session, for a backend on another process or host.
+#   auto    direct when it is correct, http otherwise (decided on first use).
+
+
+class TransferError(Exception):
+    """The backend did not create the transfer"""
+
+
+class TransferClient(ABC):
+    name = "base"
+
+    @abstractmethod
+    async def create_transfer(self, room_name: str, reason: str) -> dict:
+        """
+        Create a pending transfer for room_name.
+
+        Returns:
+            The transfer dictionary
+
+        Raises:
+            TransferError: The backend refused or could not be reached
+        """
+
+
+class DirectTransferClient(TransferClient):
+    name = "direct"
+
+    async def create_transfer(self, room_name, reason):
+        from src.api import app as backend
+        loop = backend.get_serving_loop()
+        if loop is None or loop is asyncio.get_running_loop():
+            data = await backend.create_transfer(room_name, reason)
+        else:
+            # Backend serving on another thread's loop (main.py): its state
+            # and dashboard queues belong to that loop
+            future = asyncio.run_coroutine_threadsafe(backend.create_transfer(room_name, reason), loop)
+            data = await asyncio.wrap_future(future)
+        if not data.get("success"):
+            raise TransferError("Backend did not create the transfer")
+        return data["transfer"]
+
+
+class HttpTransferClient(TransferClient):
+    name = "http"
+
+    def __init__(self, base_url=BACKEND_API_URL):
+        self.url = f"{base_url.rstrip('/')}/api/create-transfer"
+
+    async def create_transfer(self, room_name, reason):
+        try:
+            async with get_http_session().post(self.url, params={"room_name": room_name, "reason": reason}) as response:
+                data = await response.json()
+        except Exception as e:
+            raise TransferError(f"Backend request failed: {e}") from e
+        if not data.get("success"):
+            raise TransferError(f"Backend did not create the transfer: {data}")
+        return data["transfer"]
+
+
+_CLIENTS = {
+    "direct": DirectTransferClient,
+    "http": HttpTransferClient,
+}
+
+_CLIENT = None
+
+
+def _backend_is_local():
+    from src.api import app as backend
+    return backend.get_serving_loop() is not None or backend.transfers.shared
+
+
+def get_transfer_client() -> TransferClient:
+    """
+    Get the process-wide transfer client selected by TRANSFER_CLIENT.
+
+    Returns:
+        TransferClient
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        mode = TRANSFER_CLIENT
+        if mode == "auto":
+            mode = "direct" if _backend_is_local() else "http"
+        client = _CLIENTS.get(mode)
+        if client is None:
+            raise ValueError(f"Unknown TRANSFER_CLIENT '{TRANSFER_CLIENT}' (expected one of: auto, {', '.join(_CLIENTS)})")
+        _CLIENT = client()
+        logger.info(f"✅ Transfer client: {client.name}")
+    return _CLIENT
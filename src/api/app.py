@@ -1,20 +1,82 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket
+from fastapi.responses import JSONResponse, Response
 from starlette.middleware.cors import CORSMiddleware
-from datetime import datetime
 from src.models.schemas import AcceptTransfer
+from src.api.transfer_store import create_transfer_store, PENDING, ACCEPTED
+from src.api.broadcast import Broadcaster
+from src.api.dispatcher import TransferDispatcher
+from src.api.metrics import BackendMetrics
+from src.utils.control_bus import send_control, count_control_sockets
 from src.utils.logger import logger
-from config.settings import LIVEKIT_URL, LIVEKIT_KEY, LIVEKIT_SECRET, BACKEND_API_URL
+from config.settings import (
+    LIVEKIT_URL,
+    LIVEKIT_KEY,
+    LIVEKIT_SECRET,
+    TRANSFER_RETENTION_COUNT,
+    TRANSFER_RETENTION_SECONDS,
+    TRANSFERS_ARCHIVE_FILE,
+    AGENT_WS_QUEUE_SIZE,
+    AGENT_WS_SEND_TIMEOUT,
+    AGENT_SYNC_LOG_SIZE,
+    TRANSFER_STORE,
+    TRANSFER_STORE_DB,
+    DISPATCH_MODE,
+    DISPATCH_OFFER_TIMEOUT,
+)
 from livekit import api
 
 # Global state
-transfers = []
-connected_agents = []
-active_sessions = {}
+# In-memory by default; TRANSFER_STORE=sqlite shares transfers between backend workers
+transfers = create_transfer_store(
+    TRANSFER_STORE,
+    db_path=TRANSFER_STORE_DB,
+    max_completed=TRANSFER_RETENTION_COUNT,
+    completed_ttl=TRANSFER_RETENTION_SECONDS,
+    archive_path=TRANSFERS_ARCHIVE_FILE,
+    change_log_size=AGENT_SYNC_LOG_SIZE,
+)
+metrics = BackendMetrics()
+broadcaster = Broadcaster(queue_size=AGENT_WS_QUEUE_SIZE, send_timeout=AGENT_WS_SEND_TIMEOUT,
+                          on_fanout=metrics.fanout.observe)
+# websocket -> AgentConnection
+connected_agents = broadcaster.connections
+dispatcher = TransferDispatcher(transfers, broadcaster, mode=DISPATCH_MODE, offer_timeout=DISPATCH_OFFER_TIMEOUT)
+# Event loop the backend is serving on, when it runs in this process
+_serving_loop = None
+# In-flight "disconnect" signals to AI jobs (referenced so they aren't garbage collected)
+_control_tasks = set()
+
+# Every transfer change (from any worker) goes to every dashboard as a
+# numbered delta, and drives dispatch
+transfers.subscribe(lambda change: broadcaster.broadcast({"type": "transfer_update", **change}))
+transfers.subscribe(dispatcher.on_change)
+transfers.subscribe(metrics.on_change)
+# Queried off the event loop when /metrics is scraped, then read by the gauges
+_transfer_counts = {PENDING: 0, ACCEPTED: 0}
+metrics.track("call_center_transfers_pending", "Transfers waiting for a human agent", lambda: _transfer_counts[PENDING])
+metrics.track("call_center_transfers_in_progress", "Transfers accepted and not yet ended", lambda: _transfer_counts[ACCEPTED])
+metrics.track("call_center_agents_connected", "Agent dashboards connected to this worker", lambda: len(connected_agents))
+metrics.track("call_center_ai_sessions_active", "AI calls listening on the control bus on this host", count_control_sockets)
 
 # ============================================
 # FASTAPI BACKEND
 # ============================================
-app = FastAPI(title="AI Call Center Backend")
+@asynccontextmanager
+async def lifespan(app):
+    global _serving_loop
+    _serving_loop = asyncio.get_running_loop()
+    await transfers.start()
+    dispatcher.start()
+    yield
+    dispatcher.stop()
+    await transfers.stop()
+    _serving_loop = None
+
+
+app = FastAPI(title="AI Call Center Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,82 +92,163 @@ async def root():
         "status": "running",
         "message": "AI Call Center Backend",
         "agents_online": len(connected_agents),
-        "pending_transfers": len([t for t in transfers if t["status"] == "pending"])
+        "pending_transfers": await transfers.run(transfers.count, PENDING),
+        "transfers": await transfers.run(transfers.stats),
+        "broadcast": broadcaster.stats(),
+        "dispatch": dispatcher.stats()
     }
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus text-format metrics"""
+    for status in _transfer_counts:
+        _transfer_counts[status] = await transfers.run(transfers.count, status)
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is serving requests"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: startup finished and the transfer store answers"""
+    if _serving_loop is None:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    try:
+        await transfers.run(transfers.count)
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        return JSONResponse({"status": "unavailable", "error": str(e)}, status_code=503)
+    return {"status": "ready"}
+
+
 @app.websocket("/ws/agent")
 async def agent_websocket(websocket: WebSocket):
-    """WebSocket for real-time agent notifications"""
+    """
+    WebSocket for real-time agent notifications.
+    
+    Connect with ?since=<seq> to resume: the first message after "connected"
+    is a "sync" with the transfers changed since that sequence (or a snapshot
+    of pending transfers), followed by {"type": "transfer_update", "seq": ...,
+    "transfer": ...} for every later change, in order.
+    
+    Dashboards send {"type": "presence", "agent_name": ..., "status": "idle" | "busy" | "wrap_up"}
+    and {"type": "offer_declined", "transfer_id": ...}; they receive transfer
+    offers and transfer updates.
+    """
+    try:
+        since = int(websocket.query_params["since"])
+    except (KeyError, ValueError):
+        since = None
+    
     await websocket.accept()
-    connected_agents.append(websocket)
+    broadcaster.register(websocket)
     logger.info(f"✅ Agent connected. Total: {len(connected_agents)}")
     
     try:
-        await websocket.send_json({
+        broadcaster.send(websocket, {
             "type": "connected",
-            "message": "Connected to call center"
+            "message": "Connected to call center",
+            "dispatch": dispatcher.mode
+        })
+        # Queued before any later update, so nothing falls between sync and stream
+        # (inline: a read, which in WAL mode never waits for the write lock)
+        mode, seq, changed = transfers.sync(since)
+        broadcaster.send(websocket, {
+            "type": "sync",
+            "mode": mode,
+            "seq": seq,
+            "transfers": changed
         })
         
         while True:
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except ValueError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            
+            if message.get("type") == "presence":
+                dispatcher.set_presence(websocket, message.get("agent_name"), message.get("status"))
+            elif message.get("type") == "offer_declined":
+                dispatcher.on_declined(websocket, message.get("transfer_id"))
             
     except Exception as e:
         logger.info(f"Agent disconnected: {e}")
     finally:
-        if websocket in connected_agents:
-            connected_agents.remove(websocket)
+        dispatcher.remove_agent(websocket)
+        broadcaster.unregister(websocket)
 
 
 @app.get("/api/transfers")
 async def get_transfers():
     """Get all pending transfers"""
-    pending = [t for t in transfers if t["status"] == "pending"]
+    pending = await transfers.run(transfers.pending)
     return {"transfers": pending, "count": len(pending)}
 
 
-@app.post("/api/accept-transfer")
-async def accept_transfer(request: AcceptTransfer):
-    """Accept a transfer and get LiveKit token"""
-    transfer = next((t for t in transfers if t["id"] == request.transfer_id), None)
-    if not transfer:
-        return {"error": "Transfer not found"}
-    
-    if transfer["status"] != "pending":
-        return {"error": "Transfer already handled"}
-    
-    transfer["status"] = "accepted"
-    transfer["agent_name"] = request.agent_name
-    transfer["accepted_at"] = datetime.now().isoformat()
-    
-    room_name = transfer["room_name"]
-    
-    # Signal AI to disconnect
-    if room_name in active_sessions:
-        active_sessions[room_name].should_disconnect = True
-        logger.info(f"🚪 Signaling AI to leave room {room_name}")
-    
+def _agent_token(agent_name, room_name):
+    """LiveKit JWT letting a human agent join the caller's room"""
     token = api.AccessToken(LIVEKIT_KEY, LIVEKIT_SECRET)
-    token.with_identity(f"agent_{request.agent_name}")
-    token.with_name(request.agent_name)
+    token.with_identity(f"agent_{agent_name}")
+    token.with_name(agent_name)
     token.with_grants(api.VideoGrants(
         room_join=True,
         room=room_name,
         can_publish=True,
         can_subscribe=True
     ))
+    return token.to_jwt()
+
+
+async def _signal_ai_leave(room_name, agent_name):
+    """Tell the AI job in room_name to leave for the human agent"""
+    try:
+        ack = await send_control(room_name, "disconnect", agent_name=agent_name)
+        if ack and ack.get("ok"):
+            logger.info(f"🚪 AI acknowledged leaving room {room_name}")
+        elif ack is None:
+            logger.info(f"No AI job listening for room {room_name}")
+        else:
+            logger.warning(f"AI job for room {room_name} refused to leave: {ack}")
+    except Exception as e:
+        # The human still joins; the AI then leaves when they do
+        logger.warning(f"Could not signal the AI in room {room_name}: {e}")
+
+
+@app.post("/api/accept-transfer")
+async def accept_transfer(request: AcceptTransfer):
+    """Accept a transfer and get LiveKit token"""
+    # Atomic claim: of concurrent accepts for one transfer exactly one gets past here
+    transfer, error = await transfers.run(transfers.accept, request.transfer_id, request.agent_name)
+    if error:
+        return {"error": error}
+    
+    room_name = transfer["room_name"]
+    
+    # Minted only by the winner, after the claim
+    try:
+        jwt_token = _agent_token(request.agent_name, room_name)
+    except Exception as e:
+        await transfers.run(transfers.release, request.transfer_id, request.agent_name)
+        logger.error(f"Failed to create token for {request.agent_name}: {e}")
+        return {"error": "Failed to create room token"}
+    
+    # Signal the AI to leave without holding up the token: its job runs in
+    # another process, reached by room name
+    task = asyncio.create_task(_signal_ai_leave(room_name, request.agent_name), name="ai-disconnect")
+    _control_tasks.add(task)
+    task.add_done_callback(_control_tasks.discard)
     
-    jwt_token = token.to_jwt()
     logger.info(f"✅ Transfer accepted by {request.agent_name} for room {room_name}")
     
-    for agent_ws in connected_agents:
-        try:
-            await agent_ws.send_json({
-                "type": "transfer_accepted",
-                "transfer_id": request.transfer_id
-            })
-        except:
-            pass
     
     return {
         "success": True,
@@ -119,36 +262,18 @@ async def accept_transfer(request: AcceptTransfer):
 @app.post("/api/create-transfer")
 async def create_transfer(room_name: str, reason: str = "Customer request"):
     """Create new transfer request"""
-    transfer = {
-        "id": f"transfer_{len(transfers)}_{datetime.now().strftime('%H%M%S')}",
-        "room_name": room_name,
-        "reason": reason,
-        "status": "pending",
-        "created_at": datetime.now().isoformat()
-    }
-    transfers.append(transfer)
+    transfer = await transfers.run(transfers.create, room_name, reason)
     
     logger.info(f"📞 New transfer created: {transfer['id']}")
     
-    for agent_ws in connected_agents:
-        try:
-            await agent_ws.send_json({
-                "type": "incoming_call",
-                "transfer": transfer
-            })
-        except:
-            pass
-    
     return {"success": True, "transfer": transfer}
 
 
 @app.post("/api/end-transfer/{transfer_id}")
 async def end_transfer(transfer_id: str):
     """Mark transfer as completed"""
-    transfer = next((t for t in transfers if t["id"] == transfer_id), None)
+    transfer = await transfers.run(transfers.complete, transfer_id)
     if transfer:
-        transfer["status"] = "completed"
-        transfer["completed_at"] = datetime.now().isoformat()
         logger.info(f"✅ Transfer completed: {transfer_id}")
     return {"success": True}
 
@@ -162,6 +287,7 @@ def get_connected_agents():
     return connected_agents
 
 
-def get_active_sessions():
-    return active_sessions
+def get_serving_loop():
+    """Event loop the backend is serving on in this process, or None if it isn't running here"""
+    return _serving_loop
 
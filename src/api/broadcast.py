@@ -0,0 +1,180 @@
+import asyncio
+import json
+import time
+from src.utils.latency import LatencyWindow
+from src.utils.logger import logger
+
+# ============================================
+# AGENT DASHBOARD BROADCAST
+# ============================================
+# Every event is JSON-encoded once and queued on each dashboard's bounded
+# outbound queue; a sender task per connection drains its own queue. A slow
+# or half-dead dashboard therefore only delays itself. A connection whose
+# queue overflows or whose send exceeds the timeout is closed: the dashboard
+# reconnects and reloads pending transfers, which is safer than silently
+# skipping events it never received.
+
+# Close code for "try again later"
+_CLOSE_SLOW_CONSUMER = 1013
+
+
+class _Event:
+    """One encoded message shared by all its recipients"""
+
+    __slots__ = ("text", "created", "remaining")
+
+    def __init__(self, text, recipients):
+        self.text = text
+        self.created = time.monotonic()
+        self.remaining = recipients
+
+
+class AgentConnection:
+    """A dashboard WebSocket with its outbound queue and sender task"""
+
+    def __init__(self, websocket, queue_size):
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.sender = None
+        # Event currently being written, if any
+        self.inflight = None
+        self.connected_at = time.monotonic()
+
+
+class Broadcaster:
+    """
+    Fans events out to connected dashboards concurrently.
+
+    Args:
+        queue_size: Events that may wait for one connection before it is
+            considered too slow and disconnected
+        send_timeout: Seconds a single send may take before the connection
+            is disconnected
+        on_fanout: Called with each event's fan-out time (seconds)
+    """
+
+    def __init__(self, queue_size=64, send_timeout=5.0, on_fanout=None):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.on_fanout = on_fanout
+        # websocket -> AgentConnection
+        self.connections = {}
+        # Enqueue -> written to the socket, per recipient
+        self.delivery_latency = LatencyWindow()
+        # Enqueue -> last recipient done, per event
+        self.fanout_latency = LatencyWindow()
+        self.events = 0
+        self.deliveries = 0
+        self.failed_deliveries = 0
+        self.slow_disconnects = 0
+
+    def __len__(self):
+        return len(self.connections)
+
+    def register(self, websocket):
+        """Start delivering events to an accepted websocket"""
+        connection = AgentConnection(websocket, self.queue_size)
+        connection.sender = asyncio.create_task(self._sender(connection), name="agent-ws-sender")
+        self.connections[websocket] = connection
+        return connection
+
+    def unregister(self, websocket):
+        """Stop delivering to websocket (it disconnected); queued events are discarded"""
+        connection = self.connections.pop(websocket, None)
+        if connection is not None:
+            self._discard(connection)
+
+    def send(self, websocket, message):
+        """Queue a message for a single connection"""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            self._enqueue(connection, _Event(json.dumps(message), 1))
+
+    def broadcast(self, message):
+        """
+        Queue a message for every connected dashboard without waiting for delivery.
+
+        Returns:
+            Number of recipients
+        """
+        connections = list(self.connections.values())
+        if not connections:
+            return 0
+        event = _Event(json.dumps(message), len(connections))
+        self.events += 1
+        for connection in connections:
+            self._enqueue(connection, event)
+        return len(connections)
+
+    def _enqueue(self, connection, event):
+        try:
+            connection.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._finish(event, delivered=False)
+            self._disconnect_slow(connection, f"{self.queue_size} events behind")
+
+    def _finish(self, event, delivered):
+        now = time.monotonic()
+        if delivered:
+            self.deliveries += 1
+            self.delivery_latency.record(now - event.created)
+        else:
+            self.failed_deliveries += 1
+        event.remaining -= 1
+        if event.remaining == 0:
+            self.fanout_latency.record(now - event.created)
+            if self.on_fanout is not None:
+                self.on_fanout(now - event.created)
+
+    async def _sender(self, connection):
+        while True:
+            event = await connection.queue.get()
+            connection.inflight = event
+            try:
+                await asyncio.wait_for(connection.websocket.send_text(event.text), timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                self._finish(event, delivered=False)
+                self._disconnect_slow(connection, f"send took over {self.send_timeout}s")
+                return
+            except Exception:
+                # Socket already gone; stop sending to it
+                self._finish(event, delivered=False)
+                self.unregister(connection.websocket)
+                return
+            finally:
+                connection.inflight = None
+            self._finish(event, delivered=True)
+
+    def _discard(self, connection):
+        if connection.sender is not None and connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+            if connection.inflight is not None:
+                self._finish(connection.inflight, delivered=False)
+                connection.inflight = None
+        while not connection.queue.empty():
+            self._finish(connection.queue.get_nowait(), delivered=False)
+
+    def _disconnect_slow(self, connection, reason):
+        if self.connections.pop(connection.websocket, None) is None:
+            return
+        self.slow_disconnects += 1
+        logger.warning(f"Disconnecting slow agent dashboard ({reason})")
+        self._discard(connection)
+        asyncio.create_task(self._close(connection.websocket))
+
+    async def _close(self, websocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=_CLOSE_SLOW_CONSUMER), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+    def stats(self):
+        return {
+            "connections": len(self.connections),
+            "events": self.events,
+            "deliveries": self.deliveries,
+            "failed_deliveries": self.failed_deliveries,
+            "slow_disconnects": self.slow_disconnects,
+            "delivery_latency": self.delivery_latency.summary(),
+            "fanout_latency": self.fanout_latency.summary(),
+        }
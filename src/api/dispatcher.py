@@ -0,0 +1,350 @@
+import asyncio
+import os
+import time
+from collections import deque
+from src.api.transfer_store import PENDING, ACCEPTED
+from src.utils.latency import LatencyWindow
+from src.utils.logger import logger
+
+# ============================================
+# TRANSFER DISPATCH
+# ============================================
+# Dashboards report presence (idle / busy / wrap_up) over /ws/agent. Each
+# pending transfer is offered to one idle agent at a time, oldest transfer
+# first; an offer that is declined or not accepted within the timeout moves
+# on to the next agent. Agents can still accept any pending transfer
+# directly. With DISPATCH_MODE=broadcast, nothing is offered: every dashboard
+# shows every pending transfer from its transfer updates and agents race to
+# accept (the original behaviour).
+#
+# The dispatcher follows the transfer store's change stream rather than the
+# endpoints, so with a shared store every backend worker sees every transfer
+# and offers it to its own connected agents. A short offer lease in the store
+# makes sure only one worker offers a given transfer at a time; longest-idle
+# and round-robin then hold per worker rather than across the whole team.
+#
+# Reading pending transfers and taking or returning leases are store calls
+# (SQLite writes with the shared store), so they run through transfers.run()
+# in a single dispatch task: dispatch() and _withdraw() only request a pass,
+# and passes never overlap.
+
+IDLE = "idle"
+BUSY = "busy"
+WRAP_UP = "wrap_up"
+PRESENCE_STATUSES = (IDLE, BUSY, WRAP_UP)
+
+DISPATCH_MODES = ("longest_idle", "round_robin", "broadcast")
+
+
+class AgentPresence:
+    """Presence of one connected dashboard"""
+
+    __slots__ = ("websocket", "name", "status", "since", "offer", "order")
+
+    def __init__(self, websocket, name, order):
+        self.websocket = websocket
+        self.name = name
+        self.status = BUSY
+        self.since = time.monotonic()
+        # transfer_id currently offered to this agent
+        self.offer = None
+        # Registration order, for round-robin
+        self.order = order
+
+
+class _Offer:
+    __slots__ = ("agent", "offered_at", "timer")
+
+    def __init__(self, agent, timer):
+        self.agent = agent
+        self.offered_at = time.monotonic()
+        self.timer = timer
+
+
+class TransferDispatcher:
+    """
+    Offers pending transfers to one idle agent at a time.
+
+    Args:
+        transfers: TransferStore
+        broadcaster: Broadcaster used to message individual dashboards
+        mode: "longest_idle", "round_robin" or "broadcast"
+        offer_timeout: Seconds an agent has to accept an offer
+    """
+
+    def __init__(self, transfers, broadcaster, mode="longest_idle", offer_timeout=15.0):
+        if mode not in DISPATCH_MODES:
+            raise ValueError(f"Unknown DISPATCH_MODE '{mode}' (expected one of: {', '.join(DISPATCH_MODES)})")
+        self.transfers = transfers
+        self.broadcaster = broadcaster
+        self.mode = mode
+        self.offer_timeout = offer_timeout
+        # websocket -> AgentPresence
+        self.agents = {}
+        # transfer_id -> _Offer
+        self.offers = {}
+        # transfer_id -> {agent name: monotonic time they declined or let it expire}
+        self._passed = {}
+        # transfer_id -> monotonic creation time
+        self._created = {}
+        self._agent_order = 0
+        self._last_agent_order = -1
+        self._retry = None
+        self._tick = None
+        # Dispatch task, whether another pass was requested, and leases to return
+        self._dispatcher = None
+        self._dispatch_requested = False
+        self._releases = deque()
+        # Offer lease owner: this worker
+        self.owner = f"worker-{os.getpid()}"
+        # Transfer created -> accepted, and offer sent -> accepted
+        self.queue_wait = LatencyWindow()
+        self.offer_to_accept = LatencyWindow()
+        self.offered = 0
+        self.expired = 0
+        self.declined = 0
+
+    @property
+    def targeted(self):
+        return self.mode != "broadcast"
+
+    # ----- agent presence -----
+
+    def set_presence(self, websocket, name, status):
+        """Record presence reported by a dashboard and dispatch if it became idle"""
+        if status not in PRESENCE_STATUSES:
+            return
+        agent = self.agents.get(websocket)
+        if agent is None:
+            agent = AgentPresence(websocket, name, self._agent_order)
+            self._agent_order += 1
+            self.agents[websocket] = agent
+            logger.info(f"👤 Agent {name} reported presence: {status}")
+        agent.name = name or agent.name
+        if agent.status != status:
+            agent.status = status
+            agent.since = time.monotonic()
+        if status != IDLE and agent.offer is not None:
+            self._withdraw(agent.offer, notify=True)
+        self.dispatch()
+
+    def remove_agent(self, websocket):
+        agent = self.agents.pop(websocket, None)
+        if agent is not None and agent.offer is not None:
+            self._withdraw(agent.offer, notify=False)
+            self.dispatch()
+
+    # ----- transfer lifecycle -----
+
+    def on_change(self, change):
+        """Transfer store listener"""
+        transfer = change["transfer"]
+        if transfer["status"] == PENDING:
+            self.on_created(transfer)
+        elif transfer["status"] == ACCEPTED:
+            self.on_accepted(transfer["id"], transfer.get("agent_name"))
+        else:
+            self.on_completed(transfer["id"])
+
+    def on_created(self, transfer):
+        """A transfer became pending (created, or released after a failed accept)"""
+        self._created.setdefault(transfer["id"], time.monotonic())
+        self.dispatch()
+
+    def on_declined(self, websocket, transfer_id):
+        offer = self.offers.get(transfer_id)
+        if offer is None or offer.agent.websocket is not websocket:
+            return
+        self.declined += 1
+        logger.info(f"↩️ {offer.agent.name} declined {transfer_id}")
+        self._pass(transfer_id, offer.agent)
+        self.dispatch()
+
+    def on_accepted(self, transfer_id, agent_name):
+        """A transfer was accepted (through an offer or directly); record timings and update presence"""
+        now = time.monotonic()
+        created = self._created.pop(transfer_id, None)
+        if created is not None:
+            self.queue_wait.record(now - created)
+        offer = self.offers.pop(transfer_id, None)
+        if offer is not None:
+            offer.timer.cancel()
+            offer.agent.offer = None
+            if offer.agent.name == agent_name:
+                self.offer_to_accept.record(now - offer.offered_at)
+            else:
+                self.broadcaster.send(offer.agent.websocket, {"type": "offer_revoked", "transfer_id": transfer_id})
+        self._passed.pop(transfer_id, None)
+
+        for agent in self.agents.values():
+            if agent.name == agent_name and agent.status != BUSY:
+                agent.status = BUSY
+                agent.since = now
+                if agent.offer is not None:
+                    self._withdraw(agent.offer, notify=True)
+        self.dispatch()
+
+    def on_completed(self, transfer_id):
+        self._created.pop(transfer_id, None)
+        self._passed.pop(transfer_id, None)
+        if transfer_id in self.offers:
+            self._withdraw(transfer_id, notify=True)
+
+    # ----- dispatch -----
+
+    def dispatch(self):
+        """Request a dispatch pass (runs on the dispatch task, after any pass in progress)"""
+        if not self.targeted:
+            return
+        self._dispatch_requested = True
+        self._start_dispatcher()
+
+    def _start_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._run_dispatcher(), name="transfer-dispatch")
+
+    async def _run_dispatcher(self):
+        while self._dispatch_requested or self._releases:
+            self._dispatch_requested = False
+            try:
+                while self._releases:
+                    await self.transfers.run(self.transfers.release_offer, self._releases.popleft(), self.owner)
+                await self._dispatch_pass()
+            except Exception as e:
+                logger.error(f"Dispatch failed: {e}")
+
+    def _available(self, agent):
+        return self.agents.get(agent.websocket) is agent and agent.status == IDLE and agent.offer is None
+
+    async def _dispatch_pass(self):
+        """Offer every unoffered pending transfer, oldest first, while idle agents are available"""
+        if not any(self._available(agent) for agent in self.agents.values()):
+            return
+        for transfer in await self.transfers.run(self.transfers.pending):
+            transfer_id = transfer["id"]
+            if transfer_id in self.offers:
+                continue
+            if transfer_id in self._releases:
+                # Its old lease is returned first; offer it on the next pass
+                self._dispatch_requested = True
+                continue
+            agent = self._choose_agent(transfer_id)
+            if agent is None:
+                # No eligible agent for the oldest waiting transfer; newer ones
+                # would only jump the queue
+                break
+            if not await self.transfers.run(self.transfers.lease_offer, transfer_id, self.owner, self.offer_timeout + 1):
+                # Being offered by another worker
+                continue
+            if transfer_id in self.offers or not self._available(agent):
+                # Offered, or the agent went away, while the lease was being taken
+                self._releases.append(transfer_id)
+                self._dispatch_requested = True
+                break
+            self._offer(transfer, agent)
+
+    def _choose_agent(self, transfer_id):
+        now = time.monotonic()
+        passed = self._passed.get(transfer_id, {})
+        candidates = [
+            agent for agent in self.agents.values()
+            if agent.status == IDLE and agent.offer is None
+            and now - passed.get(agent.name, -float("inf")) >= self.offer_timeout
+        ]
+        if not candidates:
+            if passed and any(agent.status == IDLE and agent.offer is None for agent in self.agents.values()):
+                # Everyone idle has passed on it recently; try again once the first back-off ends
+                self._schedule_retry(min(passed.values()) + self.offer_timeout - now)
+            return None
+        if self.mode == "round_robin":
+            after = [agent for agent in candidates if agent.order > self._last_agent_order]
+            agent = min(after or candidates, key=lambda a: a.order)
+            self._last_agent_order = agent.order
+            return agent
+        return min(candidates, key=lambda a: a.since)
+
+    def _offer(self, transfer, agent):
+        transfer_id = transfer["id"]
+        timer = asyncio.get_running_loop().call_later(self.offer_timeout, self._expire, transfer_id)
+        self.offers[transfer_id] = _Offer(agent, timer)
+        agent.offer = transfer_id
+        self.offered += 1
+        self.broadcaster.send(agent.websocket, {
+            "type": "transfer_offer",
+            "transfer": transfer,
+            "expires_in": self.offer_timeout,
+        })
+        logger.info(f"📨 Offered {transfer_id} to {agent.name}")
+
+    def _expire(self, transfer_id):
+        offer = self.offers.get(transfer_id)
+        if offer is None:
+            return
+        self.expired += 1
+        logger.info(f"⏱️ Offer of {transfer_id} to {offer.agent.name} expired")
+        self._pass(transfer_id, offer.agent)
+        self.broadcaster.send(offer.agent.websocket, {"type": "offer_expired", "transfer_id": transfer_id})
+        self.dispatch()
+
+    def _pass(self, transfer_id, agent):
+        self._withdraw(transfer_id, notify=False)
+        now = time.monotonic()
+        self._passed.setdefault(transfer_id, {})[agent.name] = now
+        # Passing counts as the agent's turn: back of the longest-idle queue
+        agent.since = now
+
+    def _withdraw(self, transfer_id, notify):
+        offer = self.offers.pop(transfer_id, None)
+        if offer is None:
+            return
+        offer.timer.cancel()
+        offer.agent.offer = None
+        self._releases.append(transfer_id)
+        self._start_dispatcher()
+        if notify:
+            self.broadcaster.send(offer.agent.websocket, {"type": "offer_revoked", "transfer_id": transfer_id})
+
+    def _schedule_retry(self, delay):
+        if self._retry is not None and not self._retry.cancelled():
+            return
+        self._retry = asyncio.get_running_loop().call_later(max(delay, 0.1), self._run_retry)
+
+    def _run_retry(self):
+        self._retry = None
+        self.dispatch()
+
+    def start(self, interval=1.0):
+        """
+        With a shared store, re-check pending transfers periodically: a
+        transfer another worker stopped offering produces no change to react to.
+        """
+        if self.targeted and self.transfers.shared and self._tick is None:
+            self._tick = asyncio.create_task(self._run_tick(interval), name="transfer-dispatch-tick")
+
+    def stop(self):
+        if self._tick is not None:
+            self._tick.cancel()
+            self._tick = None
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+
+    async def _run_tick(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.dispatch()
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "agents": {
+                status: sum(1 for agent in self.agents.values() if agent.status == status)
+                for status in PRESENCE_STATUSES
+            },
+            "open_offers": len(self.offers),
+            "offered": self.offered,
+            "expired": self.expired,
+            "declined": self.declined,
+            "queue_wait": self.queue_wait.summary(),
+            "offer_to_accept": self.offer_to_accept.summary(),
+        }
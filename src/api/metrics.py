@@ -0,0 +1,94 @@
+from datetime import datetime
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from src.api.transfer_store import PENDING, ACCEPTED, COMPLETED
+from src.utils.logger import logger
+
+# ============================================
+# BACKEND METRICS
+# ============================================
+# Prometheus metrics for GET /metrics. Everything is updated as it happens
+# (one transfer change, one finished broadcast) or read at scrape time from
+# counts of what is live now (queued transfers, connections, calls), so a
+# scrape costs the same however much history exists.
+#
+# Transfer counters and timings come from the store's change stream. With
+# the shared store every worker sees every worker's changes, so whichever
+# worker answers a scrape reports all transfers; agent connections and
+# fan-out are per worker.
+
+# Seconds
+QUEUE_WAIT_BUCKETS = (1, 5, 10, 15, 30, 60, 120, 300, 600, 1800)
+HANDLE_TIME_BUCKETS = (30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+FANOUT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def _seconds_between(start, end):
+    """Seconds between two ISO timestamps on the transfer, or None if either is missing"""
+    if not start or not end:
+        return None
+    return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+
+
+class BackendMetrics:
+    """
+    Call-center metrics in their own registry.
+
+    Args:
+        registry: CollectorRegistry to register into (a new one by default)
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or CollectorRegistry()
+        self.created = Counter(
+            "call_center_transfers_created", "Transfers to a human agent created", registry=self.registry)
+        self.accepted = Counter(
+            "call_center_transfers_accepted", "Transfers accepted by a human agent", registry=self.registry)
+        self.released = Counter(
+            "call_center_transfers_released", "Accepted transfers returned to the queue", registry=self.registry)
+        self.completed = Counter(
+            "call_center_transfers_completed", "Transfers ended", registry=self.registry)
+        self.queue_wait = Histogram(
+            "call_center_transfer_queue_wait_seconds", "Transfer created -> accepted",
+            buckets=QUEUE_WAIT_BUCKETS, registry=self.registry)
+        self.handle_time = Histogram(
+            "call_center_transfer_handle_seconds", "Transfer accepted -> completed",
+            buckets=HANDLE_TIME_BUCKETS, registry=self.registry)
+        self.fanout = Histogram(
+            "call_center_ws_fanout_seconds", "Dashboard event enqueued -> sent to every connected dashboard",
+            buckets=FANOUT_BUCKETS, registry=self.registry)
+
+    def track(self, name, documentation, read):
+        """Gauge whose value is read(), called at scrape time (keep it O(1))"""
+        Gauge(name, documentation, registry=self.registry).set_function(read)
+
+    def on_change(self, change):
+        """Transfer store listener"""
+        transfer = change["transfer"]
+        status = transfer["status"]
+        try:
+            if status == PENDING:
+                if transfer.get("releases"):
+                    self.released.inc()
+                else:
+                    self.created.inc()
+            elif status == ACCEPTED:
+                self.accepted.inc()
+                wait = _seconds_between(transfer.get("created_at"), transfer.get("accepted_at"))
+                if wait is not None:
+                    self.queue_wait.observe(wait)
+            elif status == COMPLETED:
+                self.completed.inc()
+                handle = _seconds_between(transfer.get("accepted_at"), transfer.get("completed_at"))
+                if handle is not None:
+                    self.handle_time.observe(handle)
+        except ValueError as e:
+            logger.warning(f"Transfer {transfer.get('id')} has a malformed timestamp: {e}")
+
+    def render(self):
+        """
+        Current metrics in the Prometheus text format.
+
+        Returns:
+            (body bytes, content type)
+        """
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,658 @@
+import asyncio
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from src.utils.logger import logger
+
+# ============================================
+# TRANSFER STORE
+# ============================================
+# Transfers by id plus one ordered bucket per lifecycle stage, so every
+# endpoint is a dict operation regardless of how many calls the process has
+# handled. Transfers move pending -> accepted -> completed; completed ones
+# are kept for a while (dashboard lookups, late end-transfer calls) and then
+# evicted by age and count, optionally appended to a JSON-lines archive.
+# Status changes are compare-and-set under a short lock, so exactly one
+# accept wins a transfer whichever thread or task it arrives on; slow work
+# such as token minting happens after the claim, outside the lock.
+#
+# Every change is numbered with a store-wide sequence and kept in a bounded
+# change log, so a dashboard that reconnects with the last sequence it saw
+# gets only the transfers that changed since (or a snapshot of the pending
+# transfers when it is too far behind or that would be smaller).
+
+PENDING = "pending"
+ACCEPTED = "accepted"
+COMPLETED = "completed"
+
+
+def _archive_transfers(archive_path, evicted):
+    """Append evicted transfers to the JSON-lines archive, if one is configured"""
+    if not archive_path:
+        return
+    try:
+        with open(archive_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(transfer) + "\n" for transfer in evicted)
+    except OSError as e:
+        logger.error(f"Failed to archive {len(evicted)} transfers to {archive_path}: {e}")
+
+
+class TransferStore:
+    """
+    In-memory transfers with O(1) lookup and bounded retention.
+
+    Args:
+        max_completed: Completed transfers kept in memory
+        completed_ttl: Seconds a completed transfer is kept
+        accepted_ttl: Seconds before an accepted transfer that was never
+            ended is treated as abandoned and evicted
+        archive_path: JSON-lines file evicted transfers are appended to
+        change_log_size: Changes kept for dashboards resuming with a sequence
+        clock: Monotonic clock (for tests and benchmarks)
+    """
+
+    # Only visible to this process: the backend must run as a single worker
+    shared = False
+
+    def __init__(self, max_completed=1000, completed_ttl=3600.0, accepted_ttl=12 * 3600.0,
+                 archive_path=None, change_log_size=1000, clock=time.monotonic):
+        self.max_completed = max_completed
+        self.completed_ttl = completed_ttl
+        self.accepted_ttl = accepted_ttl
+        self.archive_path = archive_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._by_id = {}
+        # id -> monotonic time the transfer entered the bucket; insertion
+        # order is time order, so the oldest entry is always first
+        self._buckets = {PENDING: OrderedDict(), ACCEPTED: OrderedDict(), COMPLETED: OrderedDict()}
+        self.evicted = 0
+        # Sequence of the latest change, and (seq, transfer copy) for recent ones
+        self.seq = 0
+        self._changes = deque(maxlen=change_log_size)
+        # Called with each change as {"seq": ..., "transfer": ...}
+        self._listeners = []
+        self.syncs = {"delta": 0, "snapshot": 0}
+        # transfer_id -> (owner, expires) for transfers currently offered to an agent
+        self._offer_leases = {}
+
+    async def start(self):
+        """Nothing to start: listeners are called synchronously"""
+
+    async def stop(self):
+        pass
+
+    async def run(self, operation, *args):
+        """Call a store method from async code (inline: every operation is a dict update)"""
+        return operation(*args)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, transfer_id):
+        """Transfer dictionary, or None if unknown or already evicted"""
+        return self._by_id.get(transfer_id)
+
+    def count(self, status=PENDING):
+        return len(self._buckets[status])
+
+    def pending(self):
+        """Pending transfers, oldest first"""
+        by_id = self._by_id
+        with self._lock:
+            return [by_id[transfer_id] for transfer_id in self._buckets[PENDING]]
+
+    def create(self, room_name, reason):
+        """Create and store a new pending transfer"""
+        transfer = {
+            "id": f"transfer_{next(self._ids)}_{datetime.now().strftime('%H%M%S')}",
+            "room_name": room_name,
+            "reason": reason,
+            "status": PENDING,
+            "created_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._by_id[transfer["id"]] = transfer
+            self._buckets[PENDING][transfer["id"]] = self._clock()
+            change = self._record(transfer)
+        self._notify(change)
+        self.evict_expired()
+        return transfer
+
+    def _move(self, transfer, status):
+        self._buckets[transfer["status"]].pop(transfer["id"], None)
+        transfer["status"] = status
+        self._buckets[status][transfer["id"]] = self._clock()
+        self._offer_leases.pop(transfer["id"], None)
+
+    def _record(self, transfer):
+        """Number a change (caller holds the lock)"""
+        self.seq += 1
+        change = {"seq": self.seq, "transfer": dict(transfer)}
+        self._changes.append(change)
+        return change
+
+    def _notify(self, change):
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                logger.error(f"Transfer change listener failed: {e}")
+
+    def subscribe(self, listener):
+        """Call listener(change) after every transfer change, in sequence order"""
+        self._listeners.append(listener)
+
+    def sync(self, since=None):
+        """
+        What a dashboard that last saw sequence `since` needs to catch up.
+
+        Returns:
+            (mode, seq, transfers): "delta" with the latest state of each
+            transfer changed since then, or "snapshot" with every pending
+            transfer (no sequence, a sequence from before a restart, one
+            older than the change log, or a delta larger than the snapshot)
+        """
+        with self._lock:
+            seq = self.seq
+            oldest = self._changes[0]["seq"] if self._changes else seq + 1
+            if since is not None and oldest - 1 <= since <= seq:
+                changed = {}
+                for change in itertools.islice(self._changes, since - oldest + 1, None):
+                    changed[change["transfer"]["id"]] = change["transfer"]
+                if len(changed) <= len(self._buckets[PENDING]):
+                    self.syncs["delta"] += 1
+                    return "delta", seq, list(changed.values())
+            self.syncs["snapshot"] += 1
+            by_id = self._by_id
+            return "snapshot", seq, [dict(by_id[transfer_id]) for transfer_id in self._buckets[PENDING]]
+
+    def lease_offer(self, transfer_id, owner, ttl):
+        """
+        Reserve the right to offer a pending transfer for ttl seconds, so one
+        dispatcher at a time offers it. Returns False if another owner holds
+        an unexpired lease or the transfer is no longer pending.
+        """
+        now = self._clock()
+        with self._lock:
+            transfer = self._by_id.get(transfer_id)
+            if transfer is None or transfer["status"] != PENDING:
+                return False
+            holder = self._offer_leases.get(transfer_id)
+            if holder is not None and holder[0] != owner and holder[1] > now:
+                return False
+            self._offer_leases[transfer_id] = (owner, now + ttl)
+        return True
+
+    def release_offer(self, transfer_id, owner):
+        with self._lock:
+            holder = self._offer_leases.get(transfer_id)
+            if holder is not None and holder[0] == owner:
+                del self._offer_leases[transfer_id]
+
+    def accept(self, transfer_id, agent_name):
+        """
+        Atomically claim a pending transfer for agent_name (compare-and-set on
+        its status); of any number of concurrent calls exactly one succeeds.
+
+        Returns:
+            (transfer, error): error is None on success
+        """
+        accepted_at = datetime.now().isoformat()
+        with self._lock:
+            transfer = self._by_id.get(transfer_id)
+            if transfer is None:
+                return None, "Transfer not found"
+            if transfer["status"] != PENDING:
+                return transfer, "Transfer already handled"
+            self._move(transfer, ACCEPTED)
+            transfer["agent_name"] = agent_name
+            transfer["accepted_at"] = accepted_at
+            change = self._record(transfer)
+        self._notify(change)
+        return transfer, None
+
+    def release(self, transfer_id, agent_name):
+        """Return a transfer claimed by agent_name to pending (the accept could not be completed)"""
+        with self._lock:
+            transfer = self._by_id.get(transfer_id)
+            if transfer is None or transfer["status"] != ACCEPTED or transfer.get("agent_name") != agent_name:
+                return False
+            self._move(transfer, PENDING)
+            transfer.pop("agent_name", None)
+            transfer.pop("accepted_at", None)
+            transfer["releases"] = transfer.get("releases", 0) + 1
+            change = self._record(transfer)
+        self._notify(change)
+        return True
+
+    def complete(self, transfer_id):
+        """Mark a transfer as completed; returns it, or None if unknown"""
+        completed_at = datetime.now().isoformat()
+        with self._lock:
+            transfer = self._by_id.get(transfer_id)
+            if transfer is None:
+                return None
+            if transfer["status"] == COMPLETED:
+                return transfer
+            self._move(transfer, COMPLETED)
+            transfer["completed_at"] = completed_at
+            change = self._record(transfer)
+        self._notify(change)
+        self.evict_expired()
+        return transfer
+
+    def evict_expired(self):
+        """Drop completed transfers past the age / count limits and abandoned accepted ones"""
+        now = self._clock()
+        evicted = []
+        with self._lock:
+            completed = self._buckets[COMPLETED]
+            while completed:
+                transfer_id, since = next(iter(completed.items()))
+                if len(completed) <= self.max_completed and now - since < self.completed_ttl:
+                    break
+                completed.popitem(last=False)
+                evicted.append(self._by_id.pop(transfer_id))
+
+            accepted = self._buckets[ACCEPTED]
+            abandoned = []
+            while accepted:
+                transfer_id, since = next(iter(accepted.items()))
+                if now - since < self.accepted_ttl:
+                    break
+                accepted.popitem(last=False)
+                evicted.append(self._by_id.pop(transfer_id))
+                abandoned.append(transfer_id)
+
+        for transfer_id in abandoned:
+            logger.warning(f"Evicting transfer {transfer_id}: accepted but never ended")
+
+        if evicted:
+            self.evicted += len(evicted)
+            self._archive(evicted)
+        return len(evicted)
+
+    def _archive(self, evicted):
+        _archive_transfers(self.archive_path, evicted)
+
+    def stats(self):
+        return {
+            "pending": self.count(PENDING),
+            "accepted": self.count(ACCEPTED),
+            "completed": self.count(COMPLETED),
+            "evicted": self.evicted,
+            "seq": self.seq,
+            "syncs": dict(self.syncs),
+        }
+
+
+# ============================================
+# SHARED (SQLITE) TRANSFER STORE
+# ============================================
+# The same operations against a SQLite database in WAL mode, so several
+# backend worker processes on one host share transfers. Every state change
+# and its change-log row are written in one BEGIN IMMEDIATE transaction (the
+# database write lock makes check-then-update atomic across processes).
+# Each worker tails the change log and calls its own listeners in sequence
+# order: that is the cross-worker pub/sub that carries a transfer created in
+# one worker to dashboards connected to another.
+#
+# A write can wait up to busy_timeout for another worker's write lock, so
+# async callers go through run(), which executes the operation on the
+# store's own thread instead of the event loop.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    since REAL NOT NULL,
+    body TEXT NOT NULL,
+    offer_owner TEXT,
+    offer_until REAL
+);
+CREATE INDEX IF NOT EXISTS idx_transfers_status ON transfers (status, since);
+CREATE TABLE IF NOT EXISTS transfer_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transfer_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO transfer_meta (key, value) VALUES ('next_id', 0);
+"""
+
+
+class SqliteTransferStore:
+    """
+    Transfers shared by every backend worker on the host.
+
+    Args:
+        db_path: SQLite database file, created if missing
+        max_completed / completed_ttl / accepted_ttl / archive_path /
+            change_log_size: As for TransferStore
+        poll_interval: Seconds between checks for other workers' changes
+        busy_timeout: Seconds to wait for another worker's write lock
+    """
+
+    shared = True
+
+    def __init__(self, db_path, max_completed=1000, completed_ttl=3600.0, accepted_ttl=12 * 3600.0,
+                 archive_path=None, change_log_size=1000, poll_interval=0.05, busy_timeout=5.0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_completed = max_completed
+        self.completed_ttl = completed_ttl
+        self.accepted_ttl = accepted_ttl
+        self.archive_path = archive_path
+        self.change_log_size = change_log_size
+        self.poll_interval = poll_interval
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+        # Sequence of the latest change delivered to this worker's listeners
+        self.seq = self._connection().execute("SELECT COALESCE(MAX(seq), 0) FROM transfer_changes").fetchone()[0]
+        self._listeners = []
+        self._tailer = None
+        self._wakeup = None
+        self._loop = None
+        # One thread: this worker's writes would queue on the database lock anyway
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transfer-store")
+        self._last_evict = 0.0
+        self.evicted = 0
+        self.syncs = {"delta": 0, "snapshot": 0}
+
+    def _connection(self):
+        """Per-thread connection (sqlite3 connections aren't shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    async def run(self, operation, *args):
+        """Call a store method from async code, on the store's thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, operation, *args)
+
+    @contextmanager
+    def _transaction(self, write=True):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ----- change delivery -----
+
+    async def start(self):
+        """Start delivering every worker's changes to this worker's listeners"""
+        if self._tailer is None:
+            self._wakeup = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+            self._tailer = asyncio.create_task(self._tail(), name="transfer-change-tailer")
+
+    async def stop(self):
+        if self._tailer is not None:
+            self._tailer.cancel()
+            try:
+                await self._tailer
+            except asyncio.CancelledError:
+                pass
+            self._tailer = None
+            self._wakeup = None
+
+    def subscribe(self, listener):
+        """Call listener(change) for every transfer change from any worker, in sequence order"""
+        self._listeners.append(listener)
+
+    def _notify(self, change):
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                logger.error(f"Transfer change listener failed: {e}")
+
+    def _wake(self):
+        # Deliver this worker's own change now rather than at the next poll
+        # (writes usually run on the store's thread, so hand the wakeup to the loop)
+        if self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _tail(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                rows = self._connection().execute(
+                    "SELECT seq, body FROM transfer_changes WHERE seq > ? ORDER BY seq", (self.seq,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to read transfer changes: {e}")
+                continue
+            for seq, body in rows:
+                self.seq = seq
+                self._notify({"seq": seq, "transfer": json.loads(body)})
+
+    def _record(self, conn, transfer):
+        """Save a transfer and append its change (inside a write transaction)"""
+        conn.execute(
+            "UPDATE transfers SET status = ?, since = ?, body = ?,"
+            " offer_owner = CASE WHEN ? = ? THEN offer_owner END,"
+            " offer_until = CASE WHEN ? = ? THEN offer_until END WHERE id = ?",
+            (transfer["status"], time.time(), json.dumps(transfer),
+             transfer["status"], PENDING, transfer["status"], PENDING, transfer["id"]),
+        )
+        seq = conn.execute("INSERT INTO transfer_changes (body) VALUES (?)", (json.dumps(transfer),)).lastrowid
+        conn.execute("DELETE FROM transfer_changes WHERE seq <= ?", (seq - self.change_log_size,))
+
+    # ----- transfers -----
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM transfers").fetchone()[0]
+
+    @staticmethod
+    def _load(conn, transfer_id):
+        row = conn.execute("SELECT body FROM transfers WHERE id = ?", (transfer_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, transfer_id):
+        """Transfer dictionary, or None if unknown or already evicted"""
+        return self._load(self._connection(), transfer_id)
+
+    def count(self, status=PENDING):
+        return self._connection().execute("SELECT COUNT(*) FROM transfers WHERE status = ?", (status,)).fetchone()[0]
+
+    def pending(self):
+        """Pending transfers, oldest first"""
+        rows = self._connection().execute(
+            "SELECT body FROM transfers WHERE status = ? ORDER BY since", (PENDING,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def create(self, room_name, reason):
+        """Create and store a new pending transfer"""
+        with self._transaction() as conn:
+            conn.execute("UPDATE transfer_meta SET value = value + 1 WHERE key = 'next_id'")
+            number = conn.execute("SELECT value FROM transfer_meta WHERE key = 'next_id'").fetchone()[0]
+            transfer = {
+                "id": f"transfer_{number}_{datetime.now().strftime('%H%M%S')}",
+                "room_name": room_name,
+                "reason": reason,
+                "status": PENDING,
+                "created_at": datetime.now().isoformat(),
+            }
+            conn.execute("INSERT INTO transfers (id, status, since, body) VALUES (?, ?, 0, '')",
+                         (transfer["id"], PENDING))
+            self._record(conn, transfer)
+        self._wake()
+        self.evict_expired()
+        return transfer
+
+    def lease_offer(self, transfer_id, owner, ttl):
+        """Reserve the right to offer a pending transfer for ttl seconds (see TransferStore.lease_offer)"""
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE transfers SET offer_owner = ?, offer_until = ? WHERE id = ? AND status = ?"
+            " AND (offer_owner IS NULL OR offer_owner = ? OR offer_until < ?)",
+            (owner, now + ttl, transfer_id, PENDING, owner, now),
+        )
+        return cursor.rowcount == 1
+
+    def release_offer(self, transfer_id, owner):
+        self._connection().execute(
+            "UPDATE transfers SET offer_owner = NULL, offer_until = NULL WHERE id = ? AND offer_owner = ?",
+            (transfer_id, owner),
+        )
+
+    def accept(self, transfer_id, agent_name):
+        """
+        Atomically claim a pending transfer for agent_name, across workers.
+
+        Returns:
+            (transfer, error): error is None on success
+        """
+        with self._transaction() as conn:
+            transfer = self._load(conn, transfer_id)
+            if transfer is None:
+                return None, "Transfer not found"
+            if transfer["status"] != PENDING:
+                return transfer, "Transfer already handled"
+            transfer["status"] = ACCEPTED
+            transfer["agent_name"] = agent_name
+            transfer["accepted_at"] = datetime.now().isoformat()
+            self._record(conn, transfer)
+        self._wake()
+        return transfer, None
+
+    def release(self, transfer_id, agent_name):
+        """Return a transfer claimed by agent_name to pending (the accept could not be completed)"""
+        with self._transaction() as conn:
+            transfer = self._load(conn, transfer_id)
+            if transfer is None or transfer["status"] != ACCEPTED or transfer.get("agent_name") != agent_name:
+                return False
+            transfer["status"] = PENDING
+            transfer.pop("agent_name", None)
+            transfer.pop("accepted_at", None)
+            transfer["releases"] = transfer.get("releases", 0) + 1
+            self._record(conn, transfer)
+        self._wake()
+        return True
+
+    def complete(self, transfer_id):
+        """Mark a transfer as completed; returns it, or None if unknown"""
+        with self._transaction() as conn:
+            transfer = self._load(conn, transfer_id)
+            if transfer is None or transfer["status"] == COMPLETED:
+                return transfer
+            transfer["status"] = COMPLETED
+            transfer["completed_at"] = datetime.now().isoformat()
+            self._record(conn, transfer)
+        self._wake()
+        self.evict_expired()
+        return transfer
+
+    def evict_expired(self):
+        """Drop completed transfers past the age / count limits and abandoned accepted ones (at most once a second)"""
+        now = time.time()
+        if now - self._last_evict < 1.0:
+            return 0
+        self._last_evict = now
+        with self._transaction() as conn:
+            newest_kept = conn.execute(
+                "SELECT since FROM transfers WHERE status = ? ORDER BY since DESC LIMIT 1 OFFSET ?",
+                (COMPLETED, self.max_completed - 1),
+            ).fetchone()
+            rows = conn.execute(
+                "SELECT id, status, body FROM transfers WHERE (status = ? AND (since < ? OR since < ?))"
+                " OR (status = ? AND since < ?)",
+                (COMPLETED, now - self.completed_ttl, newest_kept[0] if newest_kept else 0,
+                 ACCEPTED, now - self.accepted_ttl),
+            ).fetchall()
+            conn.executemany("DELETE FROM transfers WHERE id = ?", [(row[0],) for row in rows])
+
+        for transfer_id, status, _ in rows:
+            if status == ACCEPTED:
+                logger.warning(f"Evicting transfer {transfer_id}: accepted but never ended")
+        if rows:
+            self.evicted += len(rows)
+            _archive_transfers(self.archive_path, [json.loads(row[2]) for row in rows])
+        return len(rows)
+
+    def sync(self, since=None):
+        """What a dashboard that last saw sequence `since` needs to catch up (see TransferStore.sync)"""
+        # Up to the change last delivered here, so the live updates that follow continue from it
+        seq = self.seq
+        with self._transaction(write=False) as conn:
+            if since is not None and since <= seq:
+                oldest = conn.execute("SELECT MIN(seq) FROM transfer_changes").fetchone()[0]
+                if oldest is None or oldest - 1 <= since:
+                    changed = {}
+                    for (body,) in conn.execute(
+                        "SELECT body FROM transfer_changes WHERE seq > ? AND seq <= ? ORDER BY seq", (since, seq)
+                    ):
+                        transfer = json.loads(body)
+                        changed[transfer["id"]] = transfer
+                    pending = conn.execute("SELECT COUNT(*) FROM transfers WHERE status = ?", (PENDING,)).fetchone()[0]
+                    if len(changed) <= pending:
+                        self.syncs["delta"] += 1
+                        return "delta", seq, list(changed.values())
+            rows = conn.execute("SELECT body FROM transfers WHERE status = ? ORDER BY since", (PENDING,)).fetchall()
+        self.syncs["snapshot"] += 1
+        return "snapshot", seq, [json.loads(row[0]) for row in rows]
+
+    def stats(self):
+        counts = dict(self._connection().execute("SELECT status, COUNT(*) FROM transfers GROUP BY status").fetchall())
+        return {
+            "pending": counts.get(PENDING, 0),
+            "accepted": counts.get(ACCEPTED, 0),
+            "completed": counts.get(COMPLETED, 0),
+            "evicted": self.evicted,
+            "seq": self.seq,
+            "syncs": dict(self.syncs),
+        }
+
+
+def get_transfers_db_path(db_path=None):
+    """Path to the shared transfers database (data/transfers.db in the project root by default)"""
+    if db_path:
+        return Path(db_path)
+    return Path(__file__).resolve().parent.parent.parent / "data" / "transfers.db"
+
+
+def create_transfer_store(backend="memory", db_path=None, **options):
+    """
+    Create the transfer store for a backend.
+
+    Args:
+        backend: "memory" (this process only) or "sqlite" (shared by every
+            backend worker on the host)
+        db_path: Database file for "sqlite"
+        **options: Retention and change-log settings for the store
+
+    Returns:
+        TransferStore or SqliteTransferStore
+    """
+    if backend == "memory":
+        return TransferStore(**options)
+    if backend == "sqlite":
+        path = get_transfers_db_path(db_path)
+        logger.info(f"✅ Transfer store: SQLite at {path}")
+        return SqliteTransferStore(path, **options)
+    raise ValueError(f"Unknown TRANSFER_STORE '{backend}' (expected one of: memory, sqlite)")
@@ -1,9 +1,53 @@
+import asyncio
+
+
 class MyState:
+    """
+    Per-call session state shared by the entrypoint, tools and room callbacks.
+
+    Lifecycle events are set once and awaited, never polled:
+        human_joined   a human agent took the call (accepted it in the
+                       dashboard, or joined the room)
+        ended          the AI's part of the call is over; error holds the
+                       exception that ended it, if any
+    """
+
+    __slots__ = (
+        "session_id",
+        "order_data",
+        "customer_phone",
+        "customer_order_number",
+        # SIP caller ID, the task looking up its order and the order it found (see caller_prefetch)
+        "caller_phone",
+        "order_prefetch",
+        "prefetched_order",
+        "transfer_initiated",
+        "human_joined",
+        "ended",
+        "error",
+    )
+
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.order_data = None
         self.customer_phone = None
         self.customer_order_number = None
+        self.caller_phone = None
+        self.order_prefetch = None
+        self.prefetched_order = None
         self.transfer_initiated = False
-        self.should_disconnect = False
+        self.human_joined = asyncio.Event()
+        self.ended = asyncio.Event()
+        self.error = None
+
+    @property
+    def should_disconnect(self) -> bool:
+        """The AI has left or is leaving the call"""
+        return self.human_joined.is_set() or self.ended.is_set()
 
+    def end(self, error: Exception = None):
+        """Mark the AI's part of the call over (the first reason wins)"""
+        if self.ended.is_set():
+            return
+        self.error = error
+        self.ended.set()
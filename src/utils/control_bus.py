@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import sys
+from src.utils.logger import logger
+from config.settings import CONTROL_SOCKET_DIR, CONTROL_TIMEOUT
+
+# ============================================
+# JOB CONTROL BUS
+# ============================================
+# LiveKit runs every call's entrypoint in its own job process, so the backend
+# cannot reach a call through shared Python objects. Each job listens on a
+# Unix socket named after its room in CONTROL_SOCKET_DIR; the backend (any
+# worker) connects to the room's socket, writes one JSON command line and
+# reads one JSON reply line, which is the job's acknowledgement.
+#
+# No broker and no registry: the socket file is the registration. A job
+# replaces a stale socket for its room when it starts and removes it when it
+# stops; a socket left behind by a crashed job refuses connections, which
+# reads as "no job for this room".
+
+_SUPPORTED = hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+_MAX_MESSAGE = 64 * 1024
+
+
+def control_socket_path(room_name: str, socket_dir: str = None) -> str:
+    """Socket path for room_name (hashed: room names are not safe or short file names)"""
+    digest = hashlib.sha1(room_name.encode("utf-8")).hexdigest()[:20]
+    return os.path.join(socket_dir or CONTROL_SOCKET_DIR, f"room-{digest}.sock")
+
+
+def count_control_sockets(socket_dir: str = None) -> int:
+    """Rooms with a job listening on this host (a crashed job's socket counts until the room is reused)"""
+    try:
+        with os.scandir(socket_dir or CONTROL_SOCKET_DIR) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(".sock"))
+    except FileNotFoundError:
+        return 0
+
+
+class ControlServer:
+    """
+    Job side: answers control commands for one room.
+
+    Args:
+        room_name: Room this job serves
+        handler: async (message dict) -> reply dict
+        socket_dir: Directory for the socket (defaults to CONTROL_SOCKET_DIR)
+    """
+
+    def __init__(self, room_name, handler, socket_dir=None):
+        self.room_name = room_name
+        self.handler = handler
+        self.path = control_socket_path(room_name, socket_dir)
+        self._server = None
+        self._inode = None
+
+    async def start(self):
+        """Start listening; returns False where Unix sockets are unavailable"""
+        if not _SUPPORTED:
+            logger.warning("Job control bus needs Unix sockets; backend handoff signals are disabled")
+            return False
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path, limit=_MAX_MESSAGE)
+        self._inode = os.stat(self.path).st_ino
+        logger.info(f"✅ Control socket for {self.room_name}: {self.path}")
+        return True
+
+    async def _serve(self, reader, writer):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                message = json.loads(line)
+                reply = await self.handler(message)
+            except Exception as e:
+                logger.error(f"Control command failed for {self.room_name}: {e}")
+                reply = {"ok": False, "error": str(e)}
+            writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def stop(self):
+        """Stop listening and remove the socket"""
+        if self._server is None:
+            return
+        self._server.close()
+        self._server = None
+        try:
+            # Only our own socket: a newer job for the same room may have replaced it
+            if os.stat(self.path).st_ino == self._inode:
+                os.unlink(self.path)
+        except OSError:
+            pass
+
+
+async def send_control(room_name: str, command: str, timeout: float = None, socket_dir: str = None, **fields):
+    """
+    Send a command to the job serving room_name and wait for its acknowledgement.
+
+    Returns:
+        The job's reply dict, or None if no job is listening for the room
+
+    Raises:
+        asyncio.TimeoutError: The job did not reply within timeout seconds
+    """
+    if not _SUPPORTED:
+        return None
+    path = control_socket_path(room_name, socket_dir)
+
+    async def exchange():
+        try:
+            reader, writer = await asyncio.open_unix_connection(path, limit=_MAX_MESSAGE)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        try:
+            writer.write(json.dumps({"command": command, "room_name": room_name, **fields}).encode("utf-8") + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+            return json.loads(line) if line else None
+        finally:
+            writer.close()
+
+    return await asyncio.wait_for(exchange(), timeout=CONTROL_TIMEOUT if timeout is None else timeout)
@@ -1,12 +1,19 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
 from src.utils.logger import logger
+from src.utils.order_search import normalize_phone
 import os
 
-# Initialize Firebase (only if credentials file exists)
+try:
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+except ImportError:
+    firebase_admin = None
+
+# Initialize Firebase (only if firebase-admin is installed and credentials file exists)
 db = None
 try:
-    if os.path.exists("credentials.json"):
+    if firebase_admin is None:
+        logger.warning("⚠️ firebase-admin not installed. Firebase features disabled.")
+    elif os.path.exists("credentials.json"):
         cred = credentials.Certificate("credentials.json")
         firebase_admin.initialize_app(cred)
         db = firestore.client()
@@ -19,48 +26,55 @@ except Exception as e:
 # ============================================
 # FIREBASE UTILITIES
 # ============================================
-# async def search_order_from_firebase(order_number: str = None, phone: str = None):
-#     try:
-#         orders_ref = db.collection('orders')
+def search_order_in_firestore(order_number: str = None, phone: str = None, client=None):
+    """
+    Search Firestore for an order by order number or phone number.
+    
+    Blocking: every lookup is one or more network round-trips. Call it through
+    FirestoreOrderRepository, which runs it on a worker thread.
+    
+    Args:
+        order_number: Order number to search for
+        phone: Phone number to search for
+        client: Firestore client (defaults to the module-level db)
+    
+    Returns:
+        Order data dictionary if found, None otherwise
+    """
+    client = client or db
+    if client is None:
+        logger.error("Firebase search error: Firestore is not initialized")
+        return None
+    
+    orders_ref = client.collection('orders')
+    
+    if order_number:
+        order_number_clean = order_number.strip().upper()
+        logger.info(f"🔍 Searching by order number: {order_number_clean}")
         
-#         if order_number:
-#             order_number_clean = order_number.strip().upper()
-#             logger.info(f"🔍 Searching by order number: {order_number_clean}")
-            
-#             doc = orders_ref.document(order_number_clean).get()
-#             if doc.exists:
-#                 logger.info(f"✓ Order found: {order_number_clean}")
-#                 return doc.to_dict()
-            
-#             query = orders_ref.where('orderNumber', '==', order_number_clean).limit(1)
-#             docs = query.stream()
-#             for doc in docs:
-#                 logger.info(f"✓ Order found: {order_number_clean}")
-#                 return doc.to_dict()
+        doc = orders_ref.document(order_number_clean).get()
+        if doc.exists:
+            logger.info(f"✓ Order found: {order_number_clean}")
+            return doc.to_dict()
         
-#         if phone:
-#             phone_clean = phone.replace("+91", "").replace("+", "").replace("-", "").replace(" ", "").strip()
-#             logger.info(f"🔍 Searching by phone: {phone_clean}")
-            
-#             query = orders_ref.where('customer.phone', '==', phone_clean).limit(1)
-#             docs = query.stream()
-            
-#             for doc in docs:
-#                 logger.info(f"✓ Order found by phone: {phone_clean}")
-#                 return doc.to_dict()
-            
-#             query = orders_ref.where('customer.phone', '==', f"+91{phone_clean}").limit(1)
-#             docs = query.stream()
-            
-#             for doc in docs:
-#                 logger.info(f"✓ Order found by phone: +91{phone_clean}")
-#                 return doc.to_dict()
+        query = orders_ref.where('orderNumber', '==', order_number_clean).limit(1)
+        for doc in query.stream():
+            logger.info(f"✓ Order found: {order_number_clean}")
+            return doc.to_dict()
+    
+    if phone:
+        phone_clean = normalize_phone(phone)
+        logger.info(f"🔍 Searching by phone: {phone_clean}")
         
-#         logger.warning("✗ Order not found in Firebase")
-#         return None
+        query = orders_ref.where('customer.phone', '==', phone_clean).limit(1)
+        for doc in query.stream():
+            logger.info(f"✓ Order found by phone: {phone_clean}")
+            return doc.to_dict()
         
-#     except Exception as e:
-#         logger.error(f"Firebase search error: {e}")
-
-#         return None
-
+        query = orders_ref.where('customer.phone', '==', f"+91{phone_clean}").limit(1)
+        for doc in query.stream():
+            logger.info(f"✓ Order found by phone: +91{phone_clean}")
+            return doc.to_dict()
+    
+    logger.warning("✗ Order not found in Firebase")
+    return None
@@ -0,0 +1,84 @@
+import re
+
+# ============================================
+# FUZZY ORDER NUMBER MATCHING
+# ============================================
+# Speech recognition drops dashes, swaps or mishears digits in order numbers
+# read aloud. Order numbers are compared in a normalized form (uppercase
+# letters and digits only), and near misses are only looked for among the
+# orders placed with the caller's phone number: a handful of candidates, so
+# a direct edit distance against each one costs microseconds and needs no
+# catalog-wide index.
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+
+
+def normalize_order_number(order_number):
+    """Uppercase and strip everything but letters and digits: 'vn-2025 1018' -> 'VN20251018'"""
+    if not order_number:
+        return ""
+    return _NON_ALNUM.sub("", str(order_number).upper())
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or max_distance + 1 once it is exceeded.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    # Order numbers that differ mostly share their date prefix and often a
+    # suffix; trimming both leaves a DP over just the differing middle
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def closest_order_numbers(order_number, candidates, max_distance, limit=3):
+    """
+    Find the candidate order numbers closest to what the caller said.
+
+    Args:
+        order_number: Order number as transcribed
+        candidates: Order numbers to compare against (the caller's own orders)
+        max_distance: Edit distance cutoff
+        limit: Maximum number of candidates to return
+
+    Returns:
+        List of (order number, distance) tuples from the closest distance
+        tier that has any matches. Distance 0 means an exact match once
+        dashes, spaces and case are ignored.
+    """
+    query = normalize_order_number(order_number)
+    if not query or max_distance <= 0:
+        return []
+    matches = []
+    for candidate in candidates:
+        distance = edit_distance(query, normalize_order_number(candidate), max_distance)
+        if distance <= max_distance:
+            matches.append((distance, candidate))
+    if not matches:
+        return []
+    matches.sort()
+    closest = matches[0][0]
+    return [(candidate, distance) for distance, candidate in matches if distance == closest][:limit]
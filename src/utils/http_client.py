@@ -0,0 +1,44 @@
+import asyncio
+import aiohttp
+from src.utils.logger import logger
+
+# ============================================
+# SHARED HTTP CLIENT
+# ============================================
+# One keep-alive aiohttp session per job process, reused by every call it
+# handles, instead of a new session (and TCP connection) per request. A
+# session is bound to the event loop it was created on, so it is created on
+# first use inside the job's loop rather than during prewarm.
+
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# (event loop, session)
+_HTTP_SESSION = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the process-wide HTTP session for the running event loop.
+
+    Returns:
+        aiohttp.ClientSession (do not close it; it is shared)
+    """
+    global _HTTP_SESSION
+    loop = asyncio.get_running_loop()
+    if _HTTP_SESSION is None or _HTTP_SESSION[0] is not loop or _HTTP_SESSION[1].closed:
+        session = aiohttp.ClientSession(
+            timeout=_HTTP_TIMEOUT,
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+        )
+        _HTTP_SESSION = (loop, session)
+        logger.info("✅ Shared HTTP session created")
+    return _HTTP_SESSION[1]
+
+
+async def close_http_session():
+    """Close the shared session (process shutdown)"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is not None:
+        session = _HTTP_SESSION[1]
+        _HTTP_SESSION = None
+        await session.close()
@@ -0,0 +1,40 @@
+from collections import deque
+
+# ============================================
+# LATENCY WINDOW
+# ============================================
+# Keeps the most recent N samples so percentiles reflect current behaviour
+# and memory stays bounded no matter how long the process runs.
+
+
+class LatencyWindow:
+    """Bounded window of latency samples (seconds) with percentile summaries"""
+
+    def __init__(self, maxlen=10000):
+        self._samples = deque(maxlen=maxlen)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds):
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct):
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def summary(self):
+        """count plus p50 / p99 / max over the window, in milliseconds"""
+        if not self._samples:
+            return {"count": self.count, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        samples = sorted(self._samples)
+        last = len(samples) - 1
+        return {
+            "count": self.count,
+            "p50_ms": samples[min(last, int(len(samples) * 0.50))] * 1000,
+            "p99_ms": samples[min(last, int(len(samples) * 0.99))] * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
@@ -0,0 +1,283 @@
+import json
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from src.utils.logger import logger
+
+# ============================================
+# LAZY ORDERS FILE
+# ============================================
+# One streaming pass over orders.json records where each order's JSON body
+# starts and ends plus the few fields the indexes need. Full order bodies are
+# only decoded when looked up, and kept in a small LRU.
+#
+# The offsets are saved to a sidecar file next to orders.json, so only the
+# first process to see a given version of the file pays for the scan; every
+# other worker (and every restart) just reads the offsets back.
+
+_INDEX_VERSION = 2
+
+# JSON string (with escapes)
+_STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# Anything between brackets that is not itself a bracket (strings may contain brackets)
+_FLAT = rb'(?:[^"{}\[\]]++|' + _STRING + rb')'
+
+# Orders nested deeper than this inside their own body don't match the scan
+# regex and are decoded with the JSON decoder instead (see _decode_member)
+_MAX_DEPTH = 16
+
+
+def _balanced(depth):
+    """Regex for a bracketed JSON value nested at most `depth` levels"""
+    inner = rb'[{\[]' + _FLAT + rb'*+[}\]]'
+    for _ in range(depth - 1):
+        inner = rb'[{\[](?:' + _FLAT + rb'|' + inner + rb')*+[}\]]'
+    return inner
+
+
+# One top-level `"order number": {...}` member, matched in a single pass of
+# the regex engine. Atomic groups/possessive quantifiers keep it linear.
+_ORDER_MEMBER = re.compile(
+    rb'\s*(' + _STRING + rb')\s*:\s*(\{(?>' + _FLAT + rb'|' + _balanced(_MAX_DEPTH - 1) + rb')*+\})\s*(,?)'
+)
+# Fallback for an order the member regex can't match: its key, then its separator
+_MEMBER_KEY = re.compile(rb'\s*(' + _STRING + rb')\s*:\s*(?=\{)')
+_MEMBER_END = re.compile(rb'\s*(,?)')
+_OBJECT_START = re.compile(rb'\s*\{')
+_OBJECT_END = re.compile(rb'\s*\}\s*\Z')
+# One top-level `"key": value` member inside an order's body
+_FIELD = re.compile(
+    rb'\s*(' + _STRING + rb')\s*:\s*(' + _STRING + rb'|' + _balanced(_MAX_DEPTH - 1) + rb'|[^\s,{}\[\]"]++)\s*,?'
+)
+_KEY_FIELDS = {b'"customer"': "customer", b'"orderDate"': "orderDate"}
+
+# Drop already-scanned pages from memory every this many bytes
+_RELEASE_EVERY = 64 * 1024 * 1024
+
+# Bytes decoded at a time when an order has to go through the JSON decoder
+_DECODE_WINDOW = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+
+
+def _customer_phone(customer):
+    return customer.get("phone", "") if isinstance(customer, dict) else ""
+
+
+class LazyOrders(Mapping):
+    """
+    Read-only mapping of order number -> order data backed by byte offsets.
+
+    Behaves like the dictionary json.load would return, but only decodes the
+    orders that are actually accessed.
+    """
+
+    def __init__(self, path, cache_size=1024, use_index_file=True):
+        self.path = str(path)
+        self.cache_size = cache_size
+        self.key_fields = []  # (order number, raw customer phone, orderDate) per order
+        self.index_loaded = False
+        self._positions = {}
+        self._starts = array("q")
+        self._ends = array("q")
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        # Keep the scanned file open: if it is replaced on disk, lookups keep
+        # reading the exact bytes the offsets were taken from
+        self._file = open(self.path, "rb")
+        try:
+            st = os.fstat(self._file.fileno())
+            signature = [st.st_size, st.st_mtime_ns]
+            if use_index_file and self._load_index(signature):
+                self.index_loaded = True
+            else:
+                self._scan()
+                if use_index_file:
+                    self._save_index(signature)
+        except Exception:
+            self._file.close()
+            raise
+
+    @property
+    def index_path(self):
+        path = Path(self.path)
+        return path.with_name(f".{path.name}.idx")
+
+    def _load_index(self, signature):
+        """Read offsets saved by a previous scan of this exact file version"""
+        try:
+            with open(self.index_path, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != _INDEX_VERSION or header.get("signature") != signature:
+                    return False
+                count = header["count"]
+                self._starts.frombytes(f.read(8 * count))
+                self._ends.frombytes(f.read(8 * count))
+                self.key_fields = [tuple(fields) for fields in json.loads(f.read())]
+        except (OSError, ValueError, KeyError):
+            self._starts, self._ends, self.key_fields = array("q"), array("q"), []
+            return False
+
+        if len(self._starts) != count or len(self._ends) != count or len(self.key_fields) != count:
+            self._starts, self._ends, self.key_fields = array("q"), array("q"), []
+            return False
+        self._positions = {fields[0]: position for position, fields in enumerate(self.key_fields)}
+        return True
+
+    def _save_index(self, signature):
+        """Best effort: a read-only data directory just means every process scans"""
+        index_path = self.index_path
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                header = {"version": _INDEX_VERSION, "signature": signature, "count": len(self._starts)}
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                f.write(self._starts.tobytes())
+                f.write(self._ends.tobytes())
+                f.write(json.dumps(self.key_fields, separators=(",", ":")).encode("utf-8"))
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save orders offset index to {index_path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _scan(self):
+        fileno = self._file.fileno()
+        if not self._file.seek(0, 2):
+            raise ValueError(f"Orders file is empty: {self.path}")
+
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buf:
+            release = getattr(mmap, "MADV_DONTNEED", None)
+            released_to = 0
+
+            m = _OBJECT_START.match(buf)
+            if not m:
+                raise ValueError(f"Orders file is not a JSON object: {self.path}")
+            pos = m.end()
+
+            while True:
+                m = _ORDER_MEMBER.match(buf, pos)
+                if m:
+                    raw_key = m.group(1)
+                    order_start, order_end = m.span(2)
+                    phone, order_date = self._key_fields(buf, order_start, order_end)
+                    member_end, more = m.end(), m.group(3)
+                else:
+                    member = self._decode_member(buf, pos)
+                    if member is None:
+                        break
+                    raw_key, order_start, order_end, member_end, more, order = member
+                    phone, order_date = _customer_phone(order.get("customer")), order.get("orderDate")
+                order_num = raw_key[1:-1].decode("utf-8") if b"\\" not in raw_key else json.loads(raw_key)
+
+                self._positions[order_num] = len(self._starts)
+                self._starts.append(order_start)
+                self._ends.append(order_end)
+                self.key_fields.append((order_num, phone, order_date))
+
+                pos = member_end
+                if release is not None and pos - released_to >= _RELEASE_EVERY:
+                    upto = pos - pos % mmap.PAGESIZE
+                    buf.madvise(release, released_to, upto - released_to)
+                    released_to = upto
+                if not more:
+                    break
+
+            if not _OBJECT_END.match(buf, pos):
+                raise ValueError(f"Orders file is malformed near byte {pos}: {self.path}")
+
+    @staticmethod
+    def _decode_member(buf, pos):
+        """
+        Decode the `"order number": {...}` member at pos with the JSON decoder,
+        for orders nested too deeply for the scan regex.
+
+        Returns:
+            (raw key, body start, body end, end of member, separator, order),
+            or None if there is no valid member at pos
+        """
+        m = _MEMBER_KEY.match(buf, pos)
+        if not m:
+            return None
+        order_start = m.end()
+        window = _DECODE_WINDOW
+        while True:
+            # surrogateescape keeps a multi-byte character cut by the window
+            # byte-for-byte, so the decoded length maps back to a byte offset
+            text = buf[order_start:order_start + window].decode("utf-8", "surrogateescape")
+            try:
+                order, end = _DECODER.raw_decode(text)
+                break
+            except json.JSONDecodeError:
+                if order_start + window >= len(buf):
+                    return None
+                window *= 4
+        order_end = order_start + len(text[:end].encode("utf-8", "surrogateescape"))
+        sep = _MEMBER_END.match(buf, order_end)
+        return m.group(1), order_start, order_end, sep.end(), sep.group(1), order
+
+    @staticmethod
+    def _key_fields(buf, order_start, order_end):
+        """
+        Customer phone and orderDate of the order whose body spans
+        buf[order_start:order_end], read from its top-level members only (a
+        "customer" nested inside another field is not the order's customer)
+        """
+        found = {}
+        pos, end = order_start + 1, order_end - 1
+        while len(found) < len(_KEY_FIELDS):
+            m = _FIELD.match(buf, pos, end)
+            if not m:
+                if buf[pos:end].strip():
+                    # Members the pattern can't split: decode the whole order instead
+                    order = json.loads(buf[order_start:order_end])
+                    return _customer_phone(order.get("customer")), order.get("orderDate")
+                break
+            name = _KEY_FIELDS.get(m.group(1))
+            if name is not None and name not in found:
+                found[name] = m.group(2)
+            pos = m.end()
+
+        phone = _customer_phone(json.loads(found["customer"])) if "customer" in found else ""
+        order_date = json.loads(found["orderDate"]) if "orderDate" in found else None
+        return phone, order_date
+
+    def __getitem__(self, order_num):
+        with self._lock:
+            order_data = self._cache.get(order_num)
+            if order_data is not None:
+                self._cache.move_to_end(order_num)
+                return order_data
+
+            position = self._positions[order_num]
+            start = self._starts[position]
+            self._file.seek(start)
+            raw = self._file.read(self._ends[position] - start)
+
+        order_data = json.loads(raw)
+        with self._lock:
+            self._cache[order_num] = order_data
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return order_data
+
+    def __contains__(self, order_num):
+        return order_num in self._positions
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def close(self):
+        """Close the orders file; lookups of orders not in the LRU fail afterwards"""
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+# ============================================
+# READ-THROUGH CACHE
+# ============================================
+# Bounded LRU with per-entry TTL for slow lookups (Firestore). Misses are
+# cached too, for a shorter time, and concurrent lookups of the same key
+# share a single load instead of each making their own round-trips.
+
+
+class ReadThroughCache:
+    """
+    Async read-through LRU cache with TTL, negative caching and single-flight loads.
+
+    A loaded value of None is a miss and is kept for negative_ttl seconds;
+    exceptions from the loader are passed to every waiter and never cached.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0, negative_ttl=30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> asyncio.Future
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.load_errors = 0
+
+    def get(self, key, default=None):
+        """Cached value for key, or default if absent or expired (does not count as a lookup)"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return default
+        return entry[1]
+
+    def put(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_load(self, key, loader):
+        """
+        Return the cached value for key, loading it with `await loader()` on a miss.
+
+        Args:
+            key: Hashable cache key
+            loader: Zero-argument coroutine function returning the value (None for not found)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                if entry[1] is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                # Shielded so one waiter being cancelled doesn't cancel the shared load
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The caller that owned the load was cancelled; load it ourselves
+                return await self.get_or_load(key, loader)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            self.load_errors += 1
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log "exception never retrieved"
+            future.exception()
+            raise
+        else:
+            self.put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def stats(self):
+        lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "load_errors": self.load_errors,
+            "hit_rate": (self.hits + self.negative_hits + self.coalesced) / lookups if lookups else 0.0,
+        }
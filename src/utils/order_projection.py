@@ -0,0 +1,188 @@
+import json
+import threading
+from collections import OrderedDict
+from src.utils.logger import logger
+from config.settings import ORDER_PROJECTION_FIELDS, ORDER_HISTORY_EVENTS
+
+# ============================================
+# ORDER PROJECTION FOR THE MODEL
+# ============================================
+# Tool results are read by the realtime model on every turn, so every token
+# adds latency and cost. The model only needs what it talks about: status,
+# ETA, delay reason, items, payment status and the latest few history
+# events. Tracking URLs, addresses, seller contact and JSON indentation are
+# dropped, and the serialized summary is cached per order record.
+
+_PROJECTION_CACHE_SIZE = 4096
+
+# Projection that keeps the whole order record ("full"); distinct from None,
+# which OrderProjector reads as "use ORDER_PROJECTION_FIELDS"
+FULL_ORDER = "full"
+
+
+def _short_time(value):
+    """'2025-10-28T18:00:00+05:30' -> '2025-10-28 18:00' (all times are IST)"""
+    if not isinstance(value, str):
+        return value
+    return value[:16].replace("T", " ")
+
+
+def _section(order, name):
+    section = order.get(name)
+    return section if isinstance(section, dict) else {}
+
+
+def _items(order):
+    items = []
+    for item in order.get("items") or []:
+        quantity = item.get("quantity", 1)
+        items.append(item.get("name") if quantity == 1 else f"{item.get('name')} x{quantity}")
+    return items
+
+
+def _amount_paid(order):
+    payment = _section(order, "payment")
+    amount = payment.get("amountPaid")
+    if amount is None:
+        return None
+    try:
+        # Stored as a number or as a string such as "1499.00"
+        amount = f"{float(amount):g}"
+    except (TypeError, ValueError):
+        pass
+    return f"{payment.get('currency', '')} {amount}".strip()
+
+
+def _history(order, events):
+    history = order.get("history") or []
+    return [
+        f"{_short_time(event.get('timestamp'))} {event.get('status')}: {event.get('note')}"
+        if event.get("note") else f"{_short_time(event.get('timestamp'))} {event.get('status')}"
+        for event in history[-events:]
+    ] if events > 0 else []
+
+
+# Projection field name -> extractor(order, history_events)
+PROJECTION_FIELDS = {
+    "order_number": lambda order, _: order.get("orderNumber"),
+    "order_date": lambda order, _: _short_time(order.get("orderDate")),
+    "customer_name": lambda order, _: _section(order, "customer").get("name"),
+    "status": lambda order, _: _section(order, "shipping").get("status"),
+    "location": lambda order, _: _section(order, "shipping").get("currentLocation"),
+    "eta": lambda order, _: _short_time(_section(order, "shipping").get("estimatedDelivery")),
+    "delay_reason": lambda order, _: _section(order, "shipping").get("delayReason"),
+    "carrier": lambda order, _: _section(order, "shipping").get("carrier"),
+    "tracking_number": lambda order, _: _section(order, "shipping").get("trackingNumber"),
+    "items": lambda order, _: _items(order),
+    "payment_status": lambda order, _: _section(order, "payment").get("status"),
+    "payment_method": lambda order, _: _section(order, "payment").get("method"),
+    "amount_paid": lambda order, _: _amount_paid(order),
+    "history": _history,
+    "refund_policy": lambda order, _: _section(order, "support").get("refundPolicySummary"),
+}
+
+
+def parse_projection_fields(value):
+    """
+    Parse a comma-separated field list ('full' keeps the whole order).
+
+    Returns:
+        Tuple of field names, or FULL_ORDER
+    """
+    if value.strip().lower() == FULL_ORDER:
+        return FULL_ORDER
+    fields = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in fields if name not in PROJECTION_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown order projection field(s): {', '.join(unknown)} "
+            f"(expected 'full' or any of: {', '.join(PROJECTION_FIELDS)})"
+        )
+    return fields
+
+
+def project_order(order_data, fields, history_events=ORDER_HISTORY_EVENTS):
+    """
+    Pick the fields the model needs out of a full order record.
+
+    Args:
+        order_data: Order data dictionary
+        fields: Field names from PROJECTION_FIELDS, or FULL_ORDER
+        history_events: Number of most recent history events to keep
+
+    Returns:
+        Dictionary with empty fields left out
+    """
+    if fields == FULL_ORDER:
+        return order_data
+    projection = {}
+    for name in fields:
+        value = PROJECTION_FIELDS[name](order_data, history_events)
+        if value not in (None, "", []):
+            projection[name] = value
+    return projection
+
+
+class OrderProjector:
+    """
+    Serializes orders for the model with a fixed projection, caching the
+    result per order record.
+
+    Order records are treated as immutable (reloads and Firestore fetches
+    produce new dicts), so the cache is keyed by record identity. Each entry
+    holds a reference to its record, which keeps the id from being reused.
+    """
+
+    def __init__(self, fields=None, history_events=ORDER_HISTORY_EVENTS, cache_size=_PROJECTION_CACHE_SIZE):
+        self.fields = parse_projection_fields(ORDER_PROJECTION_FIELDS) if fields is None else fields
+        self.history_events = history_events
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # id(order) -> (order, serialized)
+        self._lock = threading.Lock()
+
+    def serialize(self, order_data):
+        """Compact JSON summary of order_data for a tool result"""
+        key = id(order_data)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] is order_data:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        serialized = json.dumps(
+            project_order(order_data, self.fields, self.history_events),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self._cache[key] = (order_data, serialized)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return serialized
+
+
+_PROJECTOR = None
+
+
+def get_order_projector():
+    """Process-wide projector configured by ORDER_PROJECTION_FIELDS / ORDER_HISTORY_EVENTS"""
+    global _PROJECTOR
+    if _PROJECTOR is None:
+        _PROJECTOR = OrderProjector()
+        described = "full order" if _PROJECTOR.fields == FULL_ORDER else ", ".join(_PROJECTOR.fields)
+        logger.info(f"✅ Order projection for the model: {described}")
+    return _PROJECTOR
+
+
+def serialize_order_for_model(order_data):
+    """
+    Compact, cached summary of an order to return from a tool.
+
+    Args:
+        order_data: Order data dictionary
+
+    Returns:
+        JSON string
+    """
+    return get_order_projector().serialize(order_data)
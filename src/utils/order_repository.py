@@ -0,0 +1,231 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.logger import logger
+from src.utils.order_cache import ReadThroughCache
+from config.settings import (
+    ORDERS_BACKEND,
+    ORDER_LOOKUP_TIMEOUT,
+    ORDER_LOOKUP_WORKERS,
+    FIRESTORE_CACHE_SIZE,
+    FIRESTORE_CACHE_TTL,
+    FIRESTORE_NEGATIVE_CACHE_TTL,
+)
+
+# ============================================
+# ORDER REPOSITORY
+# ============================================
+# Async front for order lookups. Every backend here blocks (file parsing,
+# SQLite, Firestore network calls), so lookups run on a small shared thread
+# pool and the agent's event loop keeps handling audio while they run.
+
+# Bounded so a slow backend can't pile up threads; excess lookups queue
+_LOOKUP_EXECUTOR = ThreadPoolExecutor(max_workers=ORDER_LOOKUP_WORKERS, thread_name_prefix="order-lookup")
+
+_REPOSITORY = None
+
+
+class OrderLookupError(Exception):
+    """Lookup failed or timed out (as opposed to the order not existing)"""
+
+
+class OrderRepository(ABC):
+    """
+    Async order lookup interface.
+
+    Subclasses implement the blocking _search(); find_order() runs it on the
+    lookup thread pool with a per-lookup timeout.
+    """
+
+    name = "base"
+
+    def __init__(self, timeout=ORDER_LOOKUP_TIMEOUT):
+        self.timeout = timeout
+
+    @abstractmethod
+    def _search(self, order_number=None, phone=None):
+        """Blocking lookup by order number or phone number; order data dictionary or None"""
+
+    async def find_order(self, order_number: str = None, phone: str = None):
+        """
+        Find an order by order number or phone number.
+
+        Args:
+            order_number: Order number to search for
+            phone: Phone number to search for
+
+        Returns:
+            Order data dictionary if found, None otherwise
+
+        Raises:
+            OrderLookupError: If the backend failed or took longer than the timeout
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(_LOOKUP_EXECUTOR, self._search, order_number, phone),
+                timeout=self.timeout,
+            )
+        except asyncio.TimeoutError as e:
+            logger.error(f"⏱️ {self.name} order lookup timed out after {self.timeout}s")
+            raise OrderLookupError(f"{self.name} lookup timed out") from e
+        except Exception as e:
+            logger.error(f"{self.name} order lookup failed: {e}")
+            raise OrderLookupError(str(e)) from e
+
+    def _candidates(self, order_number, phone, limit):
+        return []
+
+    async def find_candidates(self, order_number: str, phone: str, limit: int = 3):
+        """
+        Find order numbers close to a misheard one (dropped dashes, swapped digits).
+
+        Only orders placed with the caller's phone number are candidates, so a
+        near miss never reveals another customer's order.
+
+        Args:
+            order_number: Order number as transcribed
+            phone: Caller's phone number (no candidates without one)
+            limit: Maximum number of candidates
+
+        Returns:
+            List of (order number, edit distance) tuples, closest first.
+            Lookup failures are logged and return an empty list.
+        """
+        if not phone:
+            return []
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(_LOOKUP_EXECUTOR, self._candidates, order_number, phone, limit),
+                timeout=self.timeout,
+            )
+        except Exception as e:
+            logger.error(f"{self.name} fuzzy order lookup failed: {e!r}")
+            return []
+
+    def prepare(self):
+        """Load indexes / open connections ahead of the first call (blocking)"""
+
+    async def warm_up(self):
+        """prepare() on the lookup thread pool"""
+        await asyncio.get_running_loop().run_in_executor(_LOOKUP_EXECUTOR, self.prepare)
+
+
+class JsonOrderRepository(OrderRepository):
+    """orders.json held in memory (see order_search)"""
+
+    name = "json"
+
+    def _search(self, order_number=None, phone=None):
+        from src.utils.order_search import search_order_json
+        return search_order_json(order_number=order_number, phone=phone)
+
+    def _candidates(self, order_number, phone, limit):
+        from src.utils.order_search import find_order_candidates_json
+        return find_order_candidates_json(order_number, phone, limit=limit)
+
+    def prepare(self):
+        from src.utils.order_search import get_orders_snapshot
+        get_orders_snapshot()
+
+
+class SqliteOrderRepository(OrderRepository):
+    """Indexed SQLite database built by `python -m src.utils.order_store import`"""
+
+    name = "sqlite"
+
+    def __init__(self, db_path=None, timeout=ORDER_LOOKUP_TIMEOUT):
+        super().__init__(timeout=timeout)
+        self.db_path = db_path
+
+    def _search(self, order_number=None, phone=None):
+        from src.utils.order_store import get_order_store
+        return get_order_store(self.db_path).search(order_number=order_number, phone=phone)
+
+    def _candidates(self, order_number, phone, limit):
+        from src.utils.order_store import get_order_store
+        return get_order_store(self.db_path).find_candidates(order_number, phone, limit=limit)
+
+    def prepare(self):
+        from src.utils.order_store import get_order_store
+        get_order_store(self.db_path)
+
+
+class FirestoreOrderRepository(OrderRepository):
+    """
+    Firestore `orders` collection behind a read-through cache.
+
+    An uncached lookup costs up to four sequential round-trips, and popular
+    orders are re-fetched by many callers (e.g. during a regional delay), so
+    results are cached by order number and by normalized phone, misses are
+    cached briefly, and concurrent identical lookups share one fetch.
+    """
+
+    name = "firestore"
+
+    def __init__(self, client=None, timeout=ORDER_LOOKUP_TIMEOUT, cache=None):
+        super().__init__(timeout=timeout)
+        self.client = client
+        self.cache = cache or ReadThroughCache(
+            maxsize=FIRESTORE_CACHE_SIZE, ttl=FIRESTORE_CACHE_TTL, negative_ttl=FIRESTORE_NEGATIVE_CACHE_TTL
+        )
+
+    def _search(self, order_number=None, phone=None):
+        from src.utils.firebase import search_order_in_firestore
+        return search_order_in_firestore(order_number=order_number, phone=phone, client=self.client)
+
+    def prepare(self):
+        # Importing initializes the Firebase app and client
+        import src.utils.firebase  # noqa: F401
+
+    async def find_order(self, order_number: str = None, phone: str = None):
+        from src.utils.order_search import normalize_phone
+        fetch = super().find_order
+
+        if order_number:
+            order_number_clean = order_number.strip().upper()
+            order_data = await self.cache.get_or_load(
+                ("order", order_number_clean), lambda: fetch(order_number=order_number_clean)
+            )
+            if order_data:
+                return order_data
+
+        if phone:
+            phone_clean = normalize_phone(phone)
+            order_data = await self.cache.get_or_load(("phone", phone_clean), lambda: fetch(phone=phone_clean))
+            if order_data:
+                # Later lookups of this order by number are free too
+                found_number = str(order_data.get("orderNumber", "")).strip().upper()
+                if found_number:
+                    self.cache.put(("order", found_number), order_data)
+                return order_data
+
+        return None
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+
+_BACKENDS = {
+    "json": JsonOrderRepository,
+    "sqlite": SqliteOrderRepository,
+    "firestore": FirestoreOrderRepository,
+}
+
+
+def get_order_repository():
+    """
+    Get the process-wide repository for the backend selected by ORDERS_BACKEND.
+
+    Returns:
+        OrderRepository
+    """
+    global _REPOSITORY
+    if _REPOSITORY is None:
+        backend = _BACKENDS.get(ORDERS_BACKEND)
+        if backend is None:
+            raise ValueError(f"Unknown ORDERS_BACKEND '{ORDERS_BACKEND}' (expected one of: {', '.join(_BACKENDS)})")
+        _REPOSITORY = backend()
+        logger.info(f"✅ Order repository: {backend.name}")
+    return _REPOSITORY
@@ -1,14 +1,140 @@
 import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 from src.utils.logger import logger
+from src.utils.lazy_orders import LazyOrders
+from src.utils.fuzzy_match import closest_order_numbers
+from config.settings import (
+    ORDERS_BACKEND,
+    ORDERS_FILE,
+    ORDERS_HOT_RELOAD,
+    ORDERS_RELOAD_CHECK_INTERVAL,
+    ORDERS_LAZY_LOAD_MIN_MB,
+    ORDERS_LAZY_CACHE_SIZE,
+    ORDER_FUZZY_MAX_DISTANCE,
+)
 
-# Cache for orders database
-_ORDERS_CACHE = None
-_ORDERS_CACHE_PATH = None
+# Current orders snapshot. Replaced wholesale on reload (a single reference
+# assignment), so readers holding the old snapshot are never disturbed.
+_ORDERS_SNAPSHOT = None
+
+# A replaced lazily-loaded snapshot keeps its orders file open this many
+# seconds for lookups that picked it up just before the swap, then closes it
+_RETIRED_SNAPSHOT_GRACE = 60.0
+
+# First load: concurrent callers (prewarm's background step, a lookup) share one parse
+_LOAD_LOCK = threading.Lock()
+
+# Hot reload bookkeeping
+_RELOAD_LOCK = threading.Lock()
+_RELOAD_THREAD = None
+_LAST_CHANGE_CHECK = 0.0
+_RELOAD_STATS = {
+    "reloads": 0,
+    "reload_errors": 0,
+    "last_reload_at": None,
+    "last_reload_seconds": None,
+    "last_error": None,
+}
+
+
+class OrdersSnapshot:
+    """Immutable view of one parse of the orders file and its indexes"""
+
+    def __init__(self, orders, phone_index, path, signature, load_seconds):
+        self.orders = orders
+        self.phone_index = phone_index
+        self.path = path
+        self.signature = signature
+        self.load_seconds = load_seconds
+        self.loaded_at = datetime.now().isoformat()
+
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(phone):
+    """
+    Normalize a phone number to its bare 10-digit national form.
+
+    Strips spaces, dashes, brackets and a leading +91 / 91 country code so
+    "+91-98765 43210", "(987) 654-3210" and "9876543210" all compare equal.
+
+    Args:
+        phone: Raw phone number as spoken, typed or stored
+
+    Returns:
+        Normalized phone string ("" if phone is empty)
+    """
+    if not phone:
+        return ""
+    phone = str(phone)
+    digits = phone if phone.isdecimal() else _NON_DIGITS.sub("", phone)
+    if len(digits) == 12 and digits.startswith("91"):
+        digits = digits[2:]
+    return digits
+
+
+def parse_order_date(value):
+    """orderDate string as a POSIX timestamp for sorting; unparseable dates sort oldest"""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return float("-inf")
+
+
+def order_timestamp(order_data):
+    """An order's date as a POSIX timestamp for sorting"""
+    return parse_order_date(order_data.get("orderDate"))
+
+
+def index_phones(entries):
+    """
+    Build the phone lookup index from (order number, raw phone, raw orderDate) entries.
+
+    Returns:
+        Dictionary of normalized phone -> list of order numbers, newest first
+    """
+    index = {}
+    order_dates = {}
+    for order_num, phone, order_date in entries:
+        phone = normalize_phone(phone)
+        if phone:
+            index.setdefault(phone, []).append(order_num)
+            order_dates[order_num] = order_date
+
+    # Dates are only parsed for customers with more than one order
+    for order_nums in index.values():
+        if len(order_nums) > 1:
+            order_nums.sort(key=lambda num: parse_order_date(order_dates[num]), reverse=True)
+    return index
+
+
+def build_phone_index(orders):
+    """
+    Build the phone lookup index for an orders dictionary.
+
+    Args:
+        orders: Dictionary of order number -> order data
+
+    Returns:
+        Dictionary of normalized phone -> list of order numbers, newest first
+    """
+    return index_phones(
+        (order_num, order_data.get("customer", {}).get("phone", ""), order_data.get("orderDate"))
+        for order_num, order_data in orders.items()
+    )
 
 
 def get_orders_file_path():
     """Get the path to the orders.json file"""
+    if ORDERS_FILE:
+        return Path(ORDERS_FILE)
+    
     # Get the project root directory (parent of src/)
     current_file = Path(__file__).resolve()
     project_root = current_file.parent.parent.parent
@@ -21,39 +147,36 @@ def get_orders_file_path():
     return orders_path
 
 
-def load_orders_database(force_reload=False):
-    """
-    Load orders from JSON file with caching.
-    
-    Args:
-        force_reload: If True, reload from file even if cached
-    
-    Returns:
-        Dictionary of orders
-    """
-    global _ORDERS_CACHE, _ORDERS_CACHE_PATH
-    
-    orders_path = get_orders_file_path()
-    
-    # Return cached data if available and file hasn't changed
-    if not force_reload and _ORDERS_CACHE is not None:
-        if _ORDERS_CACHE_PATH == str(orders_path):
-            return _ORDERS_CACHE
-    
+def _file_signature(orders_path):
+    """Cheap change detector for the orders file: (mtime_ns, size, inode)"""
+    try:
+        st = os.stat(orders_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _build_snapshot(orders_path):
+    """Parse the orders file and build its indexes into a new snapshot"""
     if not orders_path.exists():
         error_msg = f"Orders file not found at: {orders_path}"
         logger.error(error_msg)
         raise FileNotFoundError(error_msg)
     
+    start = time.perf_counter()
+    # Take the signature before reading so a write racing with the parse is
+    # picked up by the next change check rather than missed
+    signature = _file_signature(orders_path)
     try:
-        with open(orders_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # Cache the data
-            _ORDERS_CACHE = data
-            _ORDERS_CACHE_PATH = str(orders_path)
-            logger.info(f"✅ Orders database loaded from: {orders_path}")
-            logger.info(f"✅ Loaded {len(data)} orders")
-            return data
+        if signature and signature[1] >= ORDERS_LAZY_LOAD_MIN_MB * 1024 * 1024:
+            data = LazyOrders(orders_path, cache_size=ORDERS_LAZY_CACHE_SIZE)
+            phone_index = index_phones(data.key_fields)
+            # Only needed to build the index
+            data.key_fields = None
+        else:
+            with open(orders_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            phone_index = build_phone_index(data)
     except json.JSONDecodeError as e:
         error_msg = f"Error parsing JSON file {orders_path}: {e}"
         logger.error(error_msg)
@@ -62,12 +185,181 @@ def load_orders_database(force_reload=False):
         error_msg = f"Error loading orders database from {orders_path}: {e}"
         logger.error(error_msg)
         raise
+    
+    return OrdersSnapshot(data, phone_index, str(orders_path), signature, time.perf_counter() - start)
+
+
+def _install_snapshot(snapshot):
+    global _ORDERS_SNAPSHOT
+    previous, _ORDERS_SNAPSHOT = _ORDERS_SNAPSHOT, snapshot
+    if previous is not None and isinstance(previous.orders, LazyOrders):
+        closer = threading.Timer(_RETIRED_SNAPSHOT_GRACE, previous.orders.close)
+        closer.daemon = True
+        closer.start()
+    logger.info(f"✅ Orders database loaded from: {snapshot.path}")
+    logger.info(
+        f"✅ Loaded {len(snapshot.orders)} orders ({len(snapshot.phone_index)} phone numbers indexed) "
+        f"in {snapshot.load_seconds * 1000:.0f} ms"
+    )
+
+
+def _background_reload(orders_path):
+    """Rebuild the snapshot off the event loop and swap it in when complete"""
+    global _RELOAD_THREAD
+    try:
+        snapshot = _build_snapshot(orders_path)
+        _install_snapshot(snapshot)
+        _RELOAD_STATS["reloads"] += 1
+        _RELOAD_STATS["last_reload_at"] = snapshot.loaded_at
+        _RELOAD_STATS["last_reload_seconds"] = snapshot.load_seconds
+        _RELOAD_STATS["last_error"] = None
+    except Exception as e:
+        # Keep serving the previous snapshot
+        _RELOAD_STATS["reload_errors"] += 1
+        _RELOAD_STATS["last_error"] = str(e)
+        logger.error(f"Orders hot reload failed, keeping previous data: {e}")
+    finally:
+        with _RELOAD_LOCK:
+            _RELOAD_THREAD = None
+    logger.info(f"📊 Orders cache after reload: {json.dumps(get_orders_cache_stats())}")
+
+
+def check_orders_file_changed(snapshot=None):
+    """
+    Start a background reload if the orders file changed since it was loaded.
+    
+    Only a stat() runs on the caller's thread; parsing and indexing happen on
+    a worker thread and the new snapshot is swapped in atomically.
+    
+    Args:
+        snapshot: Snapshot to compare against (defaults to the current one)
+    
+    Returns:
+        True if a reload was started or is already running, False otherwise
+    """
+    global _RELOAD_THREAD
+    snapshot = snapshot or _ORDERS_SNAPSHOT
+    if snapshot is None:
+        return False
+    
+    orders_path = get_orders_file_path()
+    signature = _file_signature(orders_path)
+    if signature is None or (str(orders_path) == snapshot.path and signature == snapshot.signature):
+        return False
+    
+    with _RELOAD_LOCK:
+        if _RELOAD_THREAD is None:
+            logger.info(f"🔄 Orders file changed, reloading in background: {orders_path}")
+            _RELOAD_THREAD = threading.Thread(
+                target=_background_reload, args=(orders_path,), name="orders-reload", daemon=True
+            )
+            _RELOAD_THREAD.start()
+    return True
+
+
+def get_orders_snapshot(force_reload=False):
+    """
+    Get the current orders snapshot, loading it on first use.
+    
+    With ORDERS_HOT_RELOAD enabled, the file is stat()ed at most once every
+    ORDERS_RELOAD_CHECK_INTERVAL seconds and changes are reloaded in the
+    background; callers keep getting the previous snapshot until the new one
+    is ready.
+    
+    Args:
+        force_reload: If True, reload synchronously from file
+    
+    Returns:
+        OrdersSnapshot
+    """
+    global _LAST_CHANGE_CHECK
+    snapshot = _ORDERS_SNAPSHOT
+    
+    if not force_reload and snapshot is not None:
+        if ORDERS_HOT_RELOAD:
+            now = time.monotonic()
+            if now - _LAST_CHANGE_CHECK >= ORDERS_RELOAD_CHECK_INTERVAL:
+                _LAST_CHANGE_CHECK = now
+                check_orders_file_changed(snapshot)
+        return snapshot
+    
+    with _LOAD_LOCK:
+        if not force_reload and _ORDERS_SNAPSHOT is not None:
+            return _ORDERS_SNAPSHOT
+        snapshot = _build_snapshot(get_orders_file_path())
+        _install_snapshot(snapshot)
+        _LAST_CHANGE_CHECK = time.monotonic()
+    return snapshot
+
+
+def load_orders_database(force_reload=False):
+    """
+    Load orders from JSON file with caching.
+    
+    Args:
+        force_reload: If True, reload from file even if cached
+    
+    Returns:
+        Dictionary of orders
+    """
+    return get_orders_snapshot(force_reload=force_reload).orders
+
+
+def get_orders_cache_stats():
+    """
+    Orders cache statistics for monitoring.
+    
+    Returns:
+        Dictionary with the loaded snapshot's size and timing plus hot reload counters
+    """
+    snapshot = _ORDERS_SNAPSHOT
+    stats = dict(_RELOAD_STATS)
+    stats["reload_in_progress"] = _RELOAD_THREAD is not None
+    if snapshot is None:
+        stats.update({"loaded": False, "orders": 0, "phones": 0})
+    else:
+        stats.update({
+            "loaded": True,
+            "path": snapshot.path,
+            "orders": len(snapshot.orders),
+            "phones": len(snapshot.phone_index),
+            "loaded_at": snapshot.loaded_at,
+            "load_seconds": snapshot.load_seconds,
+        })
+    return stats
 
 
 def search_order(order_number: str = None, phone: str = None):
     """
     Search for an order by order number or phone number.
     
+    Uses the backend selected by ORDERS_BACKEND: "json" (orders.json held in
+    memory) or "sqlite" (the indexed database built by
+    `python -m src.utils.order_store import`).
+    
+    Args:
+        order_number: Order number to search for
+        phone: Phone number to search for
+    
+    Returns:
+        Order data dictionary if found, None otherwise
+    """
+    if ORDERS_BACKEND == "sqlite":
+        from src.utils.order_store import get_order_store
+        try:
+            store = get_order_store()
+        except FileNotFoundError as e:
+            logger.error(f"Failed to open orders database: {e}")
+            return None
+        return store.search(order_number=order_number, phone=phone)
+    
+    return search_order_json(order_number=order_number, phone=phone)
+
+
+def search_order_json(order_number: str = None, phone: str = None):
+    """
+    Search the in-memory orders.json snapshot by order number or phone number.
+    
     Args:
         order_number: Order number to search for
         phone: Phone number to search for
@@ -76,10 +368,11 @@ def search_order(order_number: str = None, phone: str = None):
         Order data dictionary if found, None otherwise
     """
     try:
-        ORDERS_DATABASE = load_orders_database()
+        snapshot = get_orders_snapshot()
     except (FileNotFoundError, ValueError) as e:
         logger.error(f"Failed to load orders database: {e}")
         return None
+    ORDERS_DATABASE = snapshot.orders
    
     # Search by order number
     if order_number:
@@ -90,23 +383,38 @@ def search_order(order_number: str = None, phone: str = None):
         else:
             logger.warning(f"✗ Order number not found: {order_number_clean}")
     
-    # Search by phone number
+    # Search by phone number (newest order for that phone)
     if phone:
-        # Normalize phone number (remove +91, +, -, spaces)
-        phone_clean = phone.replace("+91", "").replace("+", "").replace("-", "").replace(" ", "").strip()
-        
-        # Search through all orders for matching phone
-        for order_num, order_data in ORDERS_DATABASE.items():
-            customer_phone = order_data.get("customer", {}).get("phone", "")
-            # Normalize customer phone the same way
-            customer_phone_clean = customer_phone.replace("+91", "").replace("+", "").replace("-", "").replace(" ", "").strip()
-            
-            if phone_clean == customer_phone_clean:
-                logger.info(f"✓ Order found by phone: {phone_clean} -> {order_num}")
-                return order_data
+        phone_clean = normalize_phone(phone)
+        order_nums = snapshot.phone_index.get(phone_clean)
+        if order_nums:
+            order_num = order_nums[0]
+            logger.info(f"✓ Order found by phone: {phone_clean} -> {order_num}")
+            return ORDERS_DATABASE[order_num]
         
         logger.warning(f"✗ Order not found for phone: {phone_clean}")
     
     logger.warning("✗ Order not found - no order number or phone provided")
     return None
 
+
+def find_order_candidates_json(order_number: str, phone: str, limit: int = 3):
+    """
+    Find order numbers in the orders.json snapshot close to a misheard one.
+    
+    Args:
+        order_number: Order number as transcribed
+        phone: Caller's phone number; only orders placed with it are returned
+        limit: Maximum number of candidates
+    
+    Returns:
+        List of (order number, edit distance) tuples, closest first
+    """
+    try:
+        snapshot = get_orders_snapshot()
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(f"Failed to load orders database: {e}")
+        return []
+    
+    own_orders = snapshot.phone_index.get(normalize_phone(phone), ())
+    return closest_order_numbers(order_number, own_orders, ORDER_FUZZY_MAX_DISTANCE, limit=limit)
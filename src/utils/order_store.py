@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from src.utils.logger import logger
+from src.utils.order_search import get_orders_file_path, normalize_phone, order_timestamp
+from src.utils.fuzzy_match import closest_order_numbers
+from config.settings import ORDERS_DB, ORDERS_RELOAD_CHECK_INTERVAL, ORDER_FUZZY_MAX_DISTANCE
+
+# ============================================
+# SQLITE ORDER STORE
+# ============================================
+# orders.json compiled into an indexed SQLite file. Each worker process opens
+# read-only connections and only pages in the rows it looks up, so resident
+# memory and startup time no longer grow with the order history.
+#
+# A database file is never replaced while readers have it open (swapping a
+# WAL database under its readers can corrupt what they see). Each import
+# writes a new versioned file next to the database path, then atomically
+# repoints the path, a symlink, at it; get_order_store() notices the new
+# target and opens it, and the previous version is kept for lookups that are
+# still running against it.
+
+_SCHEMA = """
+CREATE TABLE orders (
+    order_number TEXT PRIMARY KEY,
+    phone TEXT,
+    order_ts REAL,
+    body TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX idx_orders_phone ON orders (phone, order_ts DESC);
+"""
+
+# One store per database path per process
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+# Imported versions kept on disk (the current one and the one before it)
+_KEEP_VERSIONS = 2
+
+
+def get_orders_db_path():
+    """Get the path to the compiled orders database (data/orders.db by default)"""
+    if ORDERS_DB:
+        return Path(ORDERS_DB)
+    return get_orders_file_path().with_suffix(".db")
+
+
+class SqliteOrderStore:
+    """Read-only order lookups against a database built by import_orders_json()"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            error_msg = f"Orders database not found at: {self.db_path} (run: python -m src.utils.order_store import)"
+            logger.error(error_msg)
+            raise FileNotFoundError(error_msg)
+        self._local = threading.local()
+        # When get_order_store() next checks whether the database path was repointed
+        self.recheck_at = 0.0
+
+    def _connection(self):
+        """Per-thread read-only connection (sqlite3 connections aren't shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+        return conn
+
+    def get_by_order_number(self, order_number):
+        row = self._connection().execute(
+            "SELECT body FROM orders WHERE order_number = ?", (order_number,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_by_phone(self, phone, limit=1):
+        """Orders for a normalized phone number, newest first"""
+        rows = self._connection().execute(
+            "SELECT body FROM orders WHERE phone = ? ORDER BY order_ts DESC LIMIT ?", (phone, limit)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def search(self, order_number: str = None, phone: str = None):
+        """
+        Search for an order by order number or phone number.
+
+        Args:
+            order_number: Order number to search for
+            phone: Phone number to search for
+
+        Returns:
+            Order data dictionary if found, None otherwise
+        """
+        if order_number:
+            order_number_clean = order_number.strip().upper()
+            order_data = self.get_by_order_number(order_number_clean)
+            if order_data:
+                logger.info(f"✓ Order found: {order_number_clean}")
+                return order_data
+            logger.warning(f"✗ Order number not found: {order_number_clean}")
+
+        if phone:
+            phone_clean = normalize_phone(phone)
+            orders = self.get_by_phone(phone_clean)
+            if orders:
+                logger.info(f"✓ Order found by phone: {phone_clean} -> {orders[0].get('orderNumber')}")
+                return orders[0]
+            logger.warning(f"✗ Order not found for phone: {phone_clean}")
+
+        logger.warning("✗ Order not found - no order number or phone provided")
+        return None
+
+    def find_candidates(self, order_number: str, phone: str, limit: int = 3):
+        """
+        Find order numbers close to a misheard one, among the orders placed
+        with the caller's phone number.
+
+        Returns:
+            List of (order number, edit distance) tuples, closest first
+        """
+        own_orders = [
+            row[0] for row in self._connection().execute(
+                "SELECT order_number FROM orders WHERE phone = ?", (normalize_phone(phone),)
+            )
+        ]
+        return closest_order_numbers(order_number, own_orders, ORDER_FUZZY_MAX_DISTANCE, limit=limit)
+
+
+def get_order_store(db_path=None):
+    """
+    Get the process-wide store for a database, opening it on first use.
+
+    At most every ORDERS_RELOAD_CHECK_INTERVAL seconds the database path is
+    resolved again, and a store for the newly imported version replaces the
+    old one (lookups already holding the old store finish against it).
+
+    Args:
+        db_path: Database path (defaults to get_orders_db_path())
+
+    Returns:
+        SqliteOrderStore
+    """
+    db_path = str(db_path or get_orders_db_path())
+    store = _STORES.get(db_path)
+    if store is not None and time.monotonic() < store.recheck_at:
+        return store
+    with _STORES_LOCK:
+        store = _STORES.get(db_path)
+        if store is None or time.monotonic() >= store.recheck_at:
+            target = Path(os.path.realpath(db_path))
+            if store is None or store.db_path != target:
+                reopened = store is not None
+                store = SqliteOrderStore(target)
+                _STORES[db_path] = store
+                logger.info(f"✅ Orders database {'reopened' if reopened else 'opened'}: {target}")
+            store.recheck_at = time.monotonic() + ORDERS_RELOAD_CHECK_INTERVAL
+    return store
+
+
+def _versions(db_path):
+    """Imported versions of a database, oldest first"""
+    prefix = f"{db_path.name}.v"
+    versions = [
+        path for path in db_path.parent.glob(f"{db_path.name}.v*")
+        if path.name[len(prefix):].isdigit()
+    ]
+    return sorted(versions, key=lambda path: int(path.name[len(prefix):]))
+
+
+def import_orders_json(json_path, db_path):
+    """
+    Compile an orders.json file into an indexed SQLite database.
+
+    The database is written to a new versioned file (db_path.v<n>) and
+    db_path is then atomically repointed at it, so workers with the old
+    version open keep reading it undisturbed until they switch over.
+
+    Args:
+        json_path: Source orders.json
+        db_path: Destination database (a symlink to the current version)
+
+    Returns:
+        Number of orders imported
+    """
+    json_path, db_path = Path(json_path), Path(db_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        orders = json.load(f)
+
+    version_path = db_path.with_name(f"{db_path.name}.v{time.time_ns()}")
+    conn = sqlite3.connect(version_path)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.executemany(
+            "INSERT INTO orders (order_number, phone, order_ts, body) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    order_num,
+                    normalize_phone(order_data.get("customer", {}).get("phone", "")) or None,
+                    order_timestamp(order_data),
+                    json.dumps(order_data, separators=(",", ":")),
+                )
+                for order_num, order_data in orders.items()
+            ),
+        )
+        conn.commit()
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("ANALYZE")
+    except BaseException:
+        conn.close()
+        version_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    # Build the new link beside the old one, then swap it in with a rename
+    link_tmp = db_path.with_name(f"{db_path.name}.{os.getpid()}.link")
+    link_tmp.unlink(missing_ok=True)
+    os.symlink(version_path.name, link_tmp)
+    os.replace(link_tmp, db_path)
+    logger.info(f"✅ Imported {len(orders)} orders from {json_path} into {version_path}")
+
+    for old in _versions(db_path)[:-_KEEP_VERSIONS]:
+        for path in (old, old.with_name(old.name + "-wal"), old.with_name(old.name + "-shm")):
+            path.unlink(missing_ok=True)
+    return len(orders)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Orders database tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    import_cmd = subcommands.add_parser("import", help="Compile orders.json into the SQLite orders database")
+    import_cmd.add_argument("--json", dest="json_path", default=None, help="Source orders.json")
+    import_cmd.add_argument("--db", dest="db_path", default=None, help="Destination database")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        import_orders_json(args.json_path or get_orders_file_path(), args.db_path or get_orders_db_path())
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import signal
+import time
+import aiohttp
+from src.utils.logger import logger
+
+# ============================================
+# PROCESS SUPERVISOR
+# ============================================
+# Runs services (backend, agent worker) as child processes, each in its own
+# process group so a Ctrl-C reaches the supervisor only and shutdown happens
+# in order. A service counts as started once its readiness URL answers 200;
+# after that its liveness URL is probed periodically. A service that exits
+# or fails several probes in a row is restarted, with exponential backoff
+# that resets once it has stayed up for a while.
+
+_PROBE_TIMEOUT = aiohttp.ClientTimeout(total=2)
+
+
+class SupervisedProcess:
+    """
+    One supervised child process.
+
+    Args:
+        name: Service name for logs
+        args: Command line
+        ready_url: URL that answers 200 once the service can take work
+        live_url: URL probed after startup (defaults to ready_url)
+        env: Extra environment variables
+        startup_timeout: Seconds to become ready before the start counts as failed
+        probe_interval: Seconds between liveness probes
+        failure_threshold: Consecutive failed probes before a restart
+        backoff_initial / backoff_max: Restart delay bounds (seconds)
+        stable_after: Seconds of uptime after which the backoff resets
+        stop_timeout: Seconds to exit after SIGTERM before SIGKILL
+    """
+
+    def __init__(self, name, args, ready_url, live_url=None, env=None, startup_timeout=60.0,
+                 probe_interval=5.0, failure_threshold=3, backoff_initial=1.0, backoff_max=30.0,
+                 stable_after=60.0, stop_timeout=10.0):
+        self.name = name
+        self.args = args
+        self.ready_url = ready_url
+        self.live_url = live_url or ready_url
+        self.env = env or {}
+        self.startup_timeout = startup_timeout
+        self.probe_interval = probe_interval
+        self.failure_threshold = failure_threshold
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+        self.stop_timeout = stop_timeout
+        self.process = None
+        self.ready = asyncio.Event()
+        self.restarts = 0
+        self._stopping = False
+        self._task = None
+
+    def start(self, session):
+        """Start the process and keep it running until stop()"""
+        self._task = asyncio.create_task(self._supervise(session), name=f"supervise-{self.name}")
+
+    async def _spawn(self):
+        self.process = await asyncio.create_subprocess_exec(
+            *self.args, env={**os.environ, **self.env}, start_new_session=True,
+        )
+        logger.info(f"▶️ {self.name} started (pid {self.process.pid})")
+
+    async def _probe(self, session, url):
+        try:
+            async with session.get(url, timeout=_PROBE_TIMEOUT) as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def _wait_ready(self, session):
+        """True once ready_url answers 200; False if the process exits or startup times out"""
+        started = time.monotonic()
+        delay = 0.05
+        while time.monotonic() - started < self.startup_timeout:
+            if self.process.returncode is not None:
+                return False
+            if await self._probe(session, self.ready_url):
+                logger.info(f"✅ {self.name} ready in {time.monotonic() - started:.2f}s")
+                return True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        logger.error(f"{self.name} not ready after {self.startup_timeout:.0f}s")
+        return False
+
+    async def _watch(self, session):
+        """Return when the process exits or fails failure_threshold probes in a row"""
+        failures = 0
+        exited = asyncio.create_task(self.process.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait({exited}, timeout=self.probe_interval)
+                if done:
+                    logger.error(f"{self.name} exited with code {self.process.returncode}")
+                    return
+                if await self._probe(session, self.live_url):
+                    failures = 0
+                    continue
+                failures += 1
+                logger.warning(f"{self.name} failed health probe ({failures}/{self.failure_threshold})")
+                if failures >= self.failure_threshold:
+                    logger.error(f"{self.name} is unresponsive; restarting it")
+                    return
+        finally:
+            exited.cancel()
+
+    async def _supervise(self, session):
+        backoff = self.backoff_initial
+        while not self._stopping:
+            await self._spawn()
+            started = time.monotonic()
+            if await self._wait_ready(session):
+                self.ready.set()
+                await self._watch(session)
+            self.ready.clear()
+            await self._terminate()
+            if self._stopping:
+                return
+
+            if time.monotonic() - started >= self.stable_after:
+                backoff = self.backoff_initial
+            self.restarts += 1
+            logger.info(f"🔁 Restarting {self.name} in {backoff:.1f}s (restart #{self.restarts})")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+
+    async def _terminate(self):
+        process = self.process
+        if process is None or process.returncode is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(process.wait(), timeout=self.stop_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name} did not exit within {self.stop_timeout:.0f}s; killing it")
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    async def stop(self):
+        """Stop supervising and shut the process down (SIGTERM, then SIGKILL)"""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self._terminate()
+        logger.info(f"⏹️ {self.name} stopped")
+
+
+class Supervisor:
+    """
+    Starts services together, reports when all are ready, and shuts them
+    down in reverse order on SIGINT / SIGTERM.
+
+    Args:
+        services: SupervisedProcess list, in start order
+    """
+
+    def __init__(self, services):
+        self.services = services
+
+    async def _all_ready(self):
+        for service in self.services:
+            await service.ready.wait()
+
+    async def run(self):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        started = time.monotonic()
+        async with aiohttp.ClientSession() as session:
+            for service in self.services:
+                service.start(session)
+
+            ready = asyncio.create_task(self._all_ready())
+            stopping = asyncio.create_task(stop.wait())
+            await asyncio.wait({ready, stopping}, return_when=asyncio.FIRST_COMPLETED)
+            if ready.done():
+                names = ", ".join(service.name for service in self.services)
+                logger.info(f"🚀 All services ready in {time.monotonic() - started:.2f}s ({names})")
+
+            await stopping
+            ready.cancel()
+            logger.info("🛑 Shutting down...")
+            for service in reversed(self.services):
+                await service.stop()
@@ -0,0 +1,199 @@
+import functools
+import json
+import os
+import time
+from collections import OrderedDict
+from livekit.agents import RunContext
+from src.utils.latency import LatencyWindow
+from src.utils.logger import logger
+from config.settings import TOOL_STATS_FILE
+
+# ============================================
+# FUNCTION TOOL INSTRUMENTATION
+# ============================================
+# Function tools run on the conversation's critical path: the model waits
+# for their result before it can answer. instrument_tool records, for every
+# call:
+#
+#   wall      call start -> result, including time spent awaiting I/O
+#   blocking  time the tool's own code held the event loop (the sum of its
+#             synchronous steps between awaits); audio and every other call
+#             in the process wait for this
+#   size      result size in bytes (UTF-8), what goes back to the model
+#   errors    calls that raised
+#
+# into per-process per-tool windows (get_tool_stats) and per-session totals
+# (pop_session_tool_stats, read by the entrypoint when a call ends).
+#
+# Job processes can't be scraped, so when a call ends the entrypoint also
+# calls export_tool_stats(): the process summary is logged and appended as a
+# JSON line to TOOL_STATS_FILE (if set; job processes share the file).
+
+# Sessions whose totals are kept until the entrypoint collects them
+_MAX_SESSIONS = 256
+
+
+class _SizeWindow(LatencyWindow):
+    """LatencyWindow over byte counts: summaries in bytes rather than ms"""
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "p50_bytes": self.percentile(50),
+            "p99_bytes": self.percentile(99),
+            "max_bytes": self.percentile(100),
+        }
+
+
+class ToolStats:
+    """Per-process figures for one tool"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.wall = LatencyWindow(maxlen=1000)
+        self.blocking = LatencyWindow(maxlen=1000)
+        self.result_size = _SizeWindow(maxlen=1000)
+
+    def summary(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall": self.wall.summary(),
+            "blocking": self.blocking.summary(),
+            "result_size": self.result_size.summary(),
+        }
+
+
+# tool name -> ToolStats
+_TOOLS = {}
+# session_id -> {tool name: totals}, oldest first
+_SESSIONS = OrderedDict()
+
+
+class _SteppedCoroutine:
+    """Awaits a coroutine one step at a time, adding up how long each step runs"""
+
+    def __init__(self, coro):
+        self._coro = coro
+        self.blocking = 0.0
+
+    def __await__(self):
+        coro = self._coro
+        value, error = None, None
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(value)
+            except StopIteration as stop:
+                self.blocking += time.perf_counter() - start
+                return stop.value
+            except BaseException:
+                self.blocking += time.perf_counter() - start
+                raise
+            self.blocking += time.perf_counter() - start
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+def _result_size(result):
+    if result is None:
+        return 0
+    if not isinstance(result, str):
+        result = json.dumps(result, default=str)
+    return len(result.encode("utf-8"))
+
+
+def _session_id(args, kwargs):
+    for arg in (*args, *kwargs.values()):
+        if isinstance(arg, RunContext):
+            return getattr(arg.userdata, "session_id", None)
+    return None
+
+
+def _record(name, session_id, wall, blocking, size, failed):
+    stats = _TOOLS.get(name)
+    if stats is None:
+        stats = _TOOLS[name] = ToolStats()
+    stats.calls += 1
+    stats.wall.record(wall)
+    stats.blocking.record(blocking)
+    if failed:
+        stats.errors += 1
+    else:
+        stats.result_size.record(size)
+
+    if session_id is None:
+        return
+    tools = _SESSIONS.get(session_id)
+    if tools is None:
+        tools = _SESSIONS[session_id] = {}
+        if len(_SESSIONS) > _MAX_SESSIONS:
+            _SESSIONS.popitem(last=False)
+    totals = tools.setdefault(name, {"calls": 0, "errors": 0, "wall_ms": 0.0, "blocking_ms": 0.0, "result_bytes": 0})
+    totals["calls"] += 1
+    totals["errors"] += failed
+    totals["wall_ms"] += wall * 1000
+    totals["blocking_ms"] += blocking * 1000
+    totals["result_bytes"] += size
+
+
+def instrument_tool(tool):
+    """
+    Record wall time, event loop blocking, result size and errors for an
+    async function tool. Apply under @function_tool:
+
+        @function_tool
+        @instrument_tool
+        async def get_order_info(self, ctx: RunContext, ...): ...
+    """
+    name = tool.__name__
+
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        stepped = _SteppedCoroutine(tool(*args, **kwargs))
+        start = time.perf_counter()
+        result, failed = None, True
+        try:
+            result = await stepped
+            failed = False
+            return result
+        finally:
+            try:
+                _record(name, _session_id(args, kwargs), time.perf_counter() - start,
+                        stepped.blocking, _result_size(result), failed)
+            except Exception as e:
+                logger.error(f"Could not record tool metrics for {name}: {e}")
+
+    return wrapper
+
+
+def get_tool_stats():
+    """Per-tool calls, errors and wall / blocking / result size percentiles for this process"""
+    return {name: stats.summary() for name, stats in _TOOLS.items()}
+
+
+def export_tool_stats():
+    """Log this process's get_tool_stats() and append it to TOOL_STATS_FILE (if set)"""
+    stats = get_tool_stats()
+    if not stats:
+        return
+    logger.info(f"🧰 Tool stats for process {os.getpid()}: {json.dumps(stats)}")
+    if TOOL_STATS_FILE:
+        record = {"pid": os.getpid(), "at": time.time(), "tools": stats}
+        try:
+            # One write per record, so appends from several job processes don't interleave
+            with open(TOOL_STATS_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.error(f"Could not write tool stats to {TOOL_STATS_FILE}: {e}")
+
+
+def pop_session_tool_stats(session_id):
+    """Per-tool totals for one session (removed once read), or an empty dict"""
+    return _SESSIONS.pop(session_id, {})
@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from src.utils.latency import LatencyWindow
+from src.utils.logger import logger
+from config.settings import CALL_TRACE_FILE
+
+# ============================================
+# CALL SETUP TRACING
+# ============================================
+# Span timings for the steps between a job being dispatched and the AI's
+# first words, one record per call tagged with its session_id. A finished
+# record is logged, appended as a JSON line to CALL_TRACE_FILE (if set; job
+# processes share the file) and added to per-process per-stage windows, which
+# the entrypoint logs when a call ends (export_trace_stats).
+#
+# Aggregate a trace file into p50 / p99 per stage with:
+#   python -m src.utils.tracing data/call_traces.jsonl
+
+# Stage -> LatencyWindow, for calls handled by this process
+_STAGES = {}
+
+
+class CallTrace:
+    """
+    Setup spans for one call.
+
+    Args:
+        session_id: Call session ID the record is tagged with
+        room_name: LiveKit room
+    """
+
+    def __init__(self, session_id, room_name):
+        self.session_id = session_id
+        self.room_name = room_name
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        # stage -> seconds, in the order recorded
+        self.spans = {}
+        self.finished = False
+
+    def record(self, stage, seconds):
+        self.spans[stage] = seconds
+
+    @contextmanager
+    def span(self, stage):
+        """Time the body of a with block as stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    async def timed(self, stage, awaitable):
+        """Await awaitable, timed as stage"""
+        with self.span(stage):
+            return await awaitable
+
+    def mark(self, stage):
+        """Record the time since the trace started as stage"""
+        self.record(stage, time.perf_counter() - self.started)
+
+    def finish(self, **fields):
+        """Export the record (once); fields are added to it"""
+        if self.finished:
+            return
+        self.finished = True
+        record = {
+            "session_id": self.session_id,
+            "room_name": self.room_name,
+            "started_at": self.started_at,
+            "spans_ms": {stage: round(seconds * 1000, 3) for stage, seconds in self.spans.items()},
+            **fields,
+        }
+        for stage, seconds in self.spans.items():
+            _STAGES.setdefault(stage, LatencyWindow(maxlen=1000)).record(seconds)
+        logger.info(f"⏱️ Call setup {self.session_id}: " + ", ".join(
+            f"{stage} {ms:.0f}ms" for stage, ms in record["spans_ms"].items()
+        ))
+        if CALL_TRACE_FILE:
+            try:
+                # One write per record, so appends from several job processes don't interleave
+                with open(CALL_TRACE_FILE, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                logger.error(f"Could not write call trace to {CALL_TRACE_FILE}: {e}")
+
+
+def get_trace_stats():
+    """Per-stage count / p50 / p99 / max (ms) for calls traced by this process"""
+    return {stage: window.summary() for stage, window in _STAGES.items()}
+
+
+def export_trace_stats():
+    """Log this process's get_trace_stats() (job processes can't be scraped)"""
+    stats = get_trace_stats()
+    if not stats:
+        return
+    logger.info(f"⏱️ Call setup for process {os.getpid()} (p50 / p99 ms): " + ", ".join(
+        f"{stage} {summary['p50_ms']:.0f}/{summary['p99_ms']:.0f} (n={summary['count']})"
+        for stage, summary in stats.items()
+    ))
+
+
+def summarize_traces(lines):
+    """
+    Aggregate JSON-line call trace records.
+
+    Returns:
+        Dictionary of stage -> count / p50 / p99 / max (ms), in first-seen stage order
+    """
+    stages = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        for stage, ms in json.loads(line).get("spans_ms", {}).items():
+            stages.setdefault(stage, LatencyWindow(maxlen=None)).record(ms / 1000)
+    return {stage: window.summary() for stage, window in stages.items()}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.utils.tracing <call trace file>")
+        sys.exit(1)
+    with open(sys.argv[1], encoding="utf-8") as f:
+        summary = summarize_traces(f)
+    print(f"{'stage':>18} {'count':>7} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    for stage, stats in summary.items():
+        print(f"{stage:>18} {stats['count']:>7} {stats['p50_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}")